@@ -0,0 +1,44 @@
+"""Compare the PETSc performance summaries (-log_view) of several runs.
+
+Example:
+
+    python misc/compare_logview.py \
+        runs/oscillatingcylinderRe100/algo{1,2,3}/view.log
+
+"""
+
+import argparse
+import pathlib
+
+import rodney
+
+
+def parse_command_line():
+    """Parse the command-line options."""
+    formatter_class = argparse.ArgumentDefaultsHelpFormatter
+    descr = 'Compare PETSc performance summaries (-log_view) of runs.'
+    parser = argparse.ArgumentParser(description=descr,
+                                     formatter_class=formatter_class)
+    parser.add_argument('filepaths', nargs='+', type=pathlib.Path,
+                        help='Paths of the log files')
+    parser.add_argument('--labels', nargs='+', default=None,
+                        help='Labels of the runs')
+    parser.add_argument('--work', nargs='+', type=float, default=None,
+                        help='Amount of work of each run (e.g., '
+                             'number of cells) for weak scaling')
+    parser.add_argument('--reference', type=int, default=0,
+                        help='Index of the reference run')
+    parser.add_argument('--events', nargs='+', default=None,
+                        help='Names of the events to compare')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Number of hotspots to compare')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Relative slow-down reported as a regression')
+    return parser.parse_args()
+
+
+args = parse_command_line()
+logs = [rodney.read_log_view(filepath) for filepath in args.filepaths]
+print(rodney.compare_logs(logs, labels=args.labels, work=args.work,
+                          reference=args.reference, events=args.events,
+                          top=args.top, threshold=args.threshold))
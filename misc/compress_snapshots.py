@@ -0,0 +1,35 @@
+"""Rewrite the HDF5 snapshots of simulations with chunked, compressed data.
+
+The storage options are read from the block `parameters.output` of the
+configuration file; snapshots at restart time steps stay lossless. The
+solver applies the same options (gzip only) to the snapshots it writes.
+
+Example:
+
+    python misc/compress_snapshots.py runs/oscillatingsphere
+
+"""
+
+import argparse
+import pathlib
+
+import rodney
+
+
+def parse_command_line():
+    """Parse the command-line options."""
+    formatter_class = argparse.ArgumentDefaultsHelpFormatter
+    descr = 'Compress the HDF5 snapshots of simulations.'
+    parser = argparse.ArgumentParser(description=descr,
+                                     formatter_class=formatter_class)
+    parser.add_argument('simudirs', nargs='+', type=pathlib.Path,
+                        help='Directories of the simulations')
+    parser.add_argument('--folder', default='solution',
+                        help='Name of the folder with the snapshots')
+    return parser.parse_args()
+
+
+args = parse_command_line()
+for simudir in args.simudirs:
+    for filepath in rodney.compress_snapshots(simudir, folder=args.folder):
+        print(filepath)
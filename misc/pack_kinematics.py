@@ -0,0 +1,39 @@
+"""Pack the per-step ASCII kinematics of a body into one HDF5 file.
+
+Example:
+
+    python misc/pack_kinematics.py \
+        <simudir>/kinematics/wing_left --dt 0.0002
+
+"""
+
+import argparse
+import pathlib
+
+import rodney
+
+
+def parse_command_line():
+    """Parse the command-line options."""
+    formatter_class = argparse.ArgumentDefaultsHelpFormatter
+    descr = 'Pack per-step ASCII kinematics into one HDF5 file.'
+    parser = argparse.ArgumentParser(description=descr,
+                                     formatter_class=formatter_class)
+    parser.add_argument('folders', nargs='+', type=pathlib.Path,
+                        help='Folders with the ASCII files of the frames')
+    parser.add_argument('--nt-cycle', dest='nt_cycle', type=int,
+                        default=None,
+                        help='Number of frames in a cycle '
+                             '(default: number of position files)')
+    parser.add_argument('--dt', type=float, default=None,
+                        help='Time-step size at which the frames are sampled')
+    parser.add_argument('--level', type=int, default=4,
+                        help='Level of the gzip compression')
+    return parser.parse_args()
+
+
+args = parse_command_line()
+for folder in args.folders:
+    filepath = rodney.pack_kinematics(folder, nt_cycle=args.nt_cycle,
+                                      dt=args.dt, compression_opts=args.level)
+    print(f'{folder} -> {filepath}')
@@ -18,7 +18,7 @@ args = rodney.parse_command_line()
 simudir = pathlib.Path(__file__).absolute().parents[1]
 datadir = simudir / 'output'
 filepath = datadir / 'forces-0.txt'
-t, fx, fy = petibmpy.read_forces(filepath)
+t, fx, fy = rodney.read_forces(filepath)
 
 # Convert forces to force coefficients.
 rho, U_inf, D = 1.0, 1.0, 1.0
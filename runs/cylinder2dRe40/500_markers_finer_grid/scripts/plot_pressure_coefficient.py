@@ -37,10 +37,7 @@ xc, yc = 0.0, 0.0
 xb_ext, yb_ext = xc + R * numpy.cos(theta), yc + R * numpy.sin(theta)
 
 # Interpolate the field on extended boundary.
-pb = numpy.empty_like(xb_ext)
-for i, (xbi, ybi) in enumerate(zip(xb_ext, yb_ext)):
-    pi = petibmpy.linear_interpolation(p, y, ybi)
-    pb[i] = petibmpy.linear_interpolation(pi, x, xbi)
+pb = rodney.interpolate(p, (x, y), (xb_ext, yb_ext))
 
 # Compute the pressure coefficient.
 rho = 1.0  # fluid density
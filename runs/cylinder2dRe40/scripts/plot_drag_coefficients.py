@@ -15,7 +15,7 @@ def get_drag_coefficient(simudir):
     # Load forces from file.
     datadir = simudir / 'output'
     filepath = datadir / 'forces-0.txt'
-    t, fx, _ = petibmpy.read_forces(filepath)
+    t, fx, _ = rodney.read_forces(filepath)
     # Convert forces to force coefficients.
     rho, U_inf, D = 1.0, 1.0, 1.0
     coeff = 1 / (0.5 * rho * U_inf**2 * D)
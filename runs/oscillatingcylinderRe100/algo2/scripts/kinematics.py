@@ -1,22 +1,29 @@
 """Kinematic parameters for the oscillating 2D cylinder."""
 
-import math
+import pathlib
 
+import rodney
+
+
+# Load the parameters from the configuration file of the simulation.
+simudir = pathlib.Path(__file__).absolute().parents[1]
+case = rodney.load_case(simudir)
+body = case.bodies[0]
 
 # Set parameters.
-Re = 100.0  # Reynolds number
-KC = 5.0  # Keulegan-Carpenter number
-D = 1.0  # cylinder diameter
-Um = 1.0  # maximum translational velocity
+KC = body.KC  # Keulegan-Carpenter number
+D = body.D  # cylinder diameter
+Um = body.Um  # maximum translational velocity
 
 # Set fluid properties.
-nu = Um * D / Re  # kinematic viscosity
+nu = case.nu  # kinematic viscosity
+Re = case.Re()  # Reynolds number
 rho = 1.0  # density
 
 # Set kinematic parameters.
-f = Um / D / KC  # oscillation frequency
-w = 2 * math.pi * f  # angular frequency
-Am = Um / w  # oscillation amplitude
+f = body.f  # oscillation frequency
+w = body.w  # angular frequency
+Am = body.Am  # oscillation amplitude
 
 
 if __name__ == '__main__':
@@ -5,7 +5,7 @@ import numpy
 import pathlib
 from scipy import signal
 
-import petibmpy
+import rodney
 
 from kinematics import Am, D, f, rho, Um, w
 
@@ -15,7 +15,7 @@ show_figure = True  # if True, display the figure(s)
 # Load drag force from file.
 simudir = pathlib.Path(__file__).absolute().parents[1]
 filepath = simudir / 'forces-0.txt'
-t, fx, _ = petibmpy.read_forces(filepath)
+t, fx, _ = rodney.read_forces(filepath)
 
 # Convert drag to drag coefficient.
 V = numpy.pi * D**2 / 4  # body volume
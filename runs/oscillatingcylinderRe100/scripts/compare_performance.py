@@ -0,0 +1,20 @@
+"""Compare the performance summaries (-log_view) of the simulations."""
+
+import pathlib
+
+import rodney
+
+
+rootdir = pathlib.Path(__file__).absolute().parents[1]
+
+# Compare the decoupling algorithms on the same grid.
+names = ['algo1', 'algo2', 'algo3']
+logs = [rodney.read_log_view(rootdir / name / 'view.log') for name in names]
+print(rodney.compare_logs(logs, labels=names))
+print()
+
+# Compare the grid sizes; the work is the number of cells.
+sizes = [64, 128, 256, 1024]
+names = [f'algo1-{n}x{n}' for n in sizes]
+logs = [rodney.read_log_view(rootdir / name / 'view.log') for name in names]
+print(rodney.compare_logs(logs, labels=names, work=[n**2 for n in sizes]))
@@ -5,22 +5,21 @@ from mpl_toolkits.axes_grid1.inset_locator import mark_inset, zoomed_inset_axes
 import numpy
 import pathlib
 
-import petibmpy
+import rodney
 
 
 rootdir = pathlib.Path(__file__).parents[1]
 show_figure = True  # if True, display the figure(s).
 
-# Set parameters.
-Re = 100.0  # Reynolds number
-KC = 5.0  # Keulegan-Carpenter number
-D = 1.0  # cylinder diameter
-Um = 1.0  # maximum translational velocity
-nu = Um * D / Re  # kinematic viscosity
+# Set parameters from the configuration of the reference simulation.
+case = rodney.load_case(rootdir / 'algo1')
+body = case.bodies[0]
+D = body.D  # cylinder diameter
+Um = body.Um  # maximum translational velocity
 rho = 1.0  # density
-f = Um / D / KC  # oscillation frequency
-w = 2 * numpy.pi * f  # angular frequency
-Am = Um / w  # oscillation amplitude
+f = body.f  # oscillation frequency
+w = body.w  # angular frequency
+Am = body.Am  # oscillation amplitude
 
 
 def get_drag_coefficient(filepath):
@@ -40,37 +39,27 @@ def get_drag_coefficient(filepath):
 
     """
     # Load drag force from file.
-    t, fx, _ = petibmpy.read_forces(filepath)
+    t, fx, _ = rodney.read_forces(filepath)
     # Convert drag to drag coefficient.
     V = numpy.pi * D**2 / 4  # body volume
-    ax = w**2 * Am * numpy.sin(w * t)
+    ax = rodney.oscillating_cylinder_kinematics(t, body).acceleration[0]
     fx += rho * V * ax
     cd = fx / (0.5 * rho * Um**2 * D)
     return t, cd
 
 
+# Get drag coefficients obtained with different time-step sizes.
+cases = [('$0.001 D / U_m$', 'algo1-dt=0.001',
+          dict(color='black', zorder=1)),
+         ('$0.002 D / U_m$', 'algo1',
+          dict(color='black', linestyle='--', zorder=2)),
+         ('$0.005 D / U_m$', 'algo1-dt=0.005',
+          dict(color='black', linestyle=':', zorder=3))]
+filepaths = [rootdir / folder / 'forces-0.txt' for _, folder, _ in cases]
+results = rodney.batch_map(get_drag_coefficient, filepaths)
 simus = {}
-
-# Get drag coefficient obtained with dt=0.001.
-label = '$0.001 D / U_m$'
-filepath = rootdir / 'algo1-dt=0.001' / 'forces-0.txt'
-t, cd = get_drag_coefficient(filepath)
-simus[label] = dict(t=f * t, cd=cd,
-                    kwargs=dict(color='black', zorder=1))
-
-# Get drag coefficient obtained with dt=0.002.
-label = '$0.002 D / U_m$'
-filepath = rootdir / 'algo1' / 'forces-0.txt'
-t, cd = get_drag_coefficient(filepath)
-simus[label] = dict(t=f * t, cd=cd,
-                    kwargs=dict(color='black', linestyle='--', zorder=2))
-
-# Get drag coefficient obtained with dt=0.002.
-label = '$0.005 D / U_m$'
-filepath = rootdir / 'algo1-dt=0.005' / 'forces-0.txt'
-t, cd = get_drag_coefficient(filepath)
-simus[label] = dict(t=f * t, cd=cd,
-                    kwargs=dict(color='black', linestyle=':', zorder=3))
+for (label, _, kwargs), (t, cd) in zip(cases, results):
+    simus[label] = dict(t=f * t, cd=cd, kwargs=kwargs)
 
 # Plot the history of the force coefficients.
 pyplot.rc('font', family='serif', size=16)
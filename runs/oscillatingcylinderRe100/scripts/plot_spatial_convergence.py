@@ -7,6 +7,8 @@ from scipy import interpolate
 
 import petibmpy
 
+import rodney
+
 
 rootdir = pathlib.Path(__file__).absolute().parents[1]
 
@@ -17,7 +19,6 @@ t = 2.8 * T  # time value to monitor
 dt = 0.002
 timestep = int(t / dt)
 
-u = []
 folders = ['algo1-64x64', 'algo1-128x128', 'algo1-256x256',
            'algo1', 'algo1-1024x1024']
 dx = 8.0 / numpy.array([64, 128, 256, 512, 1024])
@@ -29,7 +30,10 @@ x_ref, y_ref = petibmpy.read_grid_hdf5(filepath, name)
 grid = numpy.array(numpy.meshgrid(y_ref, x_ref, indexing='ij'))
 grid = numpy.rollaxis(grid, 0, 3).reshape(x_ref.size * y_ref.size, 2)
 
-for d, folder in zip(dx, folders):
+
+def get_velocity_on_reference_grid(folder):
+    """Load the x-velocity and interpolate it on the coarsest grid."""
+    grid = rodney.get_shared_data()
     simudir = rootdir / folder
     # Load the grid from file.
     filepath = simudir / 'grid.h5'
@@ -39,8 +43,11 @@ for d, folder in zip(dx, folders):
     u_tmp = petibmpy.read_field_hdf5(filepath, name)
     u_int = interpolate.interpn((y, x), u_tmp, grid,
                                 method='linear')
-    u_int = u_int.reshape((y_ref.size, x_ref.size))
-    u.append(u_int)
+    return u_int.reshape((y_ref.size, x_ref.size))
+
+
+# Process the simulations in parallel.
+u = rodney.batch_map(get_velocity_on_reference_grid, folders, shared=grid)
 
 l2_errors, linf_errors = [], []
 for i in range(len(u) - 1):
@@ -1,27 +1,34 @@
 """Fluid properties, geometric and kinematic parameters."""
 
-import numpy
+import pathlib
 
+import rodney
+
+
+# Load the parameters from the configuration file of the simulation.
+simudir = pathlib.Path(__file__).absolute().parents[1]
+case = rodney.load_case(simudir)
+body = case.bodies[0]
 
 # Parameters.
-D = 1.0  # sphere diameter
+D = body.D  # sphere diameter
 
 # Kinematic parameters.
-Am = 0.125 * D  # oscillation amplitude
-Um = 1.0  # maximum translation velocity
+Am = body.Am  # oscillation amplitude
+Um = body.Um  # maximum translation velocity
 
 # Fluid properties.
-Re = 78.54  # Reynolds number
-nu = Um * D / Re  # kinematic viscosity
+nu = case.nu  # kinematic viscosity
+Re = case.Re()  # Reynolds number
 rho = 1.0  # density
 
 # Temporal parameters.
-St = 1.2732  # Strouhal number
-f = St * Um / D  # oscillation frequency
-T = 1 / f  # time period
+f = body.f  # oscillation frequency
+St = f * D / Um  # Strouhal number
+T = body.T  # time period
 
 # Simulation parameters.
-dt = 0.00157 * D / Um  # time-step size
+dt = case.dt  # time-step size
 n_periods = 5  # number of periods
 tf = n_periods * T  # final time
 nt_period = 500  # number of time steps per period
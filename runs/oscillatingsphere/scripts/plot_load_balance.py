@@ -0,0 +1,26 @@
+"""Plot the load imbalance of the Lagrangian markers over time.
+
+The report is written by the solver when run with `-load_balance`.
+"""
+
+from matplotlib import pyplot
+import pathlib
+
+import rodney
+
+
+simudir = pathlib.Path(__file__).absolute().parents[1]
+
+# Plot the history of the load imbalance.
+pyplot.rc('font', family='serif', size=14)
+fig, ax = pyplot.subplots(figsize=(6.0, 4.0))
+rodney.plot_load_balance(simudir / 'loadbalance.bin', ax=ax)
+fig.tight_layout()
+
+# Save the figure.
+figdir = simudir / 'figures'
+figdir.mkdir(parents=True, exist_ok=True)
+filepath = figdir / 'load_balance.png'
+fig.savefig(filepath, dpi=300, bbox_inches='tight')
+
+pyplot.show()
@@ -6,6 +6,8 @@ import pathlib
 
 import petibmpy
 
+import rodney
+
 from kinematics import D, Am, Um, rho, f, dt
 
 
@@ -28,10 +30,10 @@ levels = numpy.linspace(-2 / rho / Um**2, 2 / rho / Um**2, num=30)
 for i, (label, timestep) in enumerate(zip(labels, timesteps)):
     # Load the pressure field from file.
     filepath = simudir / 'solution' / '{:0>7}.h5'.format(timestep)
-    p = petibmpy.read_field_hdf5(filepath, name)
-    p -= p.mean()  # set the mean value to 0.
-    # Interpolate the field along the z-direction at z=0.
-    p = petibmpy.linear_interpolation(p, z, 0.0)
+    with rodney.LazyField(filepath, name, gridlines=(x, y, z)) as field:
+        # Interpolate the field along the z-direction at z=0
+        # and set the mean value to 0.
+        p = field.plane('z', 0.0) - field.mean()
     # Load the boundary coordinates from file.
     filepath = simudir / 'solution' / 'sphere_{:0>7}.3D'.format(timestep)
     xb, yb, zb = petibmpy.read_body(filepath)
@@ -5,9 +5,9 @@ from matplotlib import pyplot
 import numpy
 import pathlib
 
-import petibmpy
+import rodney
 
-from kinematics import dt, Am, f, D, nt_period, rho
+from kinematics import body, dt, f, D, rho
 
 
 def create_sphere(delta, R=0.5, center=(0.0, 0.0, 0.0)):
@@ -44,24 +44,23 @@ times = dt * numpy.arange(nstart, nend + 1, 10)
 
 dx = 4.0 / 256
 dA = dx**2
+# Generate a sphere outside the support region of the delta function;
+# the sphere is centered at the origin and rigidly translated over time.
+xb, yb, zb = create_sphere(dx, R=(D / 2 + 2 * dx))
+nx = xb / numpy.sqrt(xb**2 + yb**2 + zb**2)  # x-component of the normal
 cpd = numpy.zeros_like(times)
-for index, time in enumerate(times):
-    print(time)
-    # Load data from last record of the probe.
-    filepath = datadir / 'probe-p.h5'
-    (x, y, z), p = petibmpy.read_probe_volume_hdf5(filepath, name, time)
-    # Generate a sphere outside the support region of the delta function.
-    xc, yc, zc = Am * numpy.sin(2 * numpy.pi * f * time), 0.0, 0.0
-    xb, yb, zb = create_sphere(dx, R=(D / 2 + 2 * dx), center=(xc, yc, zc))
-    pb = numpy.empty_like(xb)
-    for i, (xbi, ybi, zbi) in enumerate(zip(xb, yb, zb)):
-        pi = petibmpy.linear_interpolation(p, z, zbi)
-        pi = petibmpy.linear_interpolation(pi, y, ybi)
-        pb[i] = petibmpy.linear_interpolation(pi, x, xbi)
-        d = numpy.sqrt((xbi - xc)**2 + (ybi - yc)**2 + (zbi - zc)**2)
-        n = numpy.array([xbi - xc, ybi - yc, zbi - zc]) / d
-        cpd[index] -= pb[i] * n[0]
-    cpd[index] *= dA / (0.5 * rho * D**3 * f**2)
+centers = rodney.oscillating_sphere_kinematics(times, body).position
+filepath = datadir / 'probe-p.h5'
+with rodney.ProbeStream(filepath, name) as probe:
+    for index, time in enumerate(times):
+        print(time)
+        # Load data from the probe record.
+        (x, y, z), p = probe.read(time)
+        # Interpolate the pressure on the sphere at its current location.
+        stencil = rodney.get_stencil((x, y, z), (xb, yb, zb),
+                                     displacement=centers[:, index])
+        pb = stencil(p)
+        cpd[index] = -numpy.sum(pb * nx) * dA / (0.5 * rho * D**3 * f**2)
 
 # Plot the history of the pressure drag coefficient.
 pyplot.rc('font', family='serif', size=16)
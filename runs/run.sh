@@ -35,3 +35,4 @@ do
     cd $subdir
     ./run.sh -m $mpidir -s $simg > stdout.txt 2> stderr.txt
 done
+
@@ -1,11 +1,8 @@
 """Compute and plot the recirculation length over time."""
 
 from matplotlib import pyplot
-import numpy
 import pathlib
 
-import petibmpy
-
 import rodney
 
 
@@ -13,34 +10,12 @@ args = rodney.parse_command_line()
 
 # Set directories and parameters.
 simudir = pathlib.Path(__file__).absolute().parents[1]
-datadir = simudir / 'output'
-name = 'u'  # name of the fiedl variable to read
-
-R = 0.5  # radius of cylinder
-U = 1.0  # translational speed of cylinder
 dt = 0.0005  # time-step size
-tstart, tend = 0.5, 3.5  # starting and final time values to consider
-times = numpy.arange(tstart, tend + dt / 2, dt)
-filepath = datadir / f'probe-{name}.h5'
+time_limits = (0.5, 3.5)  # starting and final time values to consider
 
 # Compute the history of the recirculation length.
-lengths = numpy.empty_like(times)
-for i, time in enumerate(times):
-    # Update center of the circle.
-    xc, yc = -U * time, 0.0  # center of the circle
-    # Load data of the volume probe.
-    probe = petibmpy.ProbeVolume(name, name)
-    (x, y), u = probe.read_hdf5(filepath, time)
-    # Interpolate volume along horizontal line at y=yc.
-    u_yc = petibmpy.linear_interpolation(u, y, yc)
-    # Compute the coordinates of the end of the recirculation zone.
-    buffer = 0.01
-    idx = numpy.where((u_yc + U <= 0.0) & (x > xc + R + buffer))[0][-1]
-    # x-coordinate computed as where the x-velocity becomes positive.
-    xp = petibmpy.linear_interpolation(x[idx: idx + 2],
-                                       u_yc[idx: idx + 2] + U, 0.0)
-    # Compute the recirculation legnth.
-    lengths[i] = abs(xp - (xc + R))
+times, lengths = rodney.get_recirculation_length_history(
+    simudir, time_limits=time_limits)
 
 # Plot the history of the recirculation length.
 pyplot.rc('font', family='serif', size=14)
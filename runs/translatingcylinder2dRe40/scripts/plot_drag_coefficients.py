@@ -4,8 +4,6 @@ from matplotlib import pyplot
 import numpy
 import pathlib
 
-import petibmpy
-
 import rodney
 
 
@@ -37,7 +35,7 @@ def get_drag_coefficient(filepath):
 
     """
     # Load drag force from file.
-    t, fx, _ = petibmpy.read_forces(filepath)
+    t, fx, _ = rodney.read_forces(filepath)
     # Convert drag to drag coefficient.
     cd = fx / (0.5 * rho * U0**2 * D)
     return t, cd
@@ -1,43 +1,12 @@
 """Compute and plot the recirculation length over time."""
 
+import functools
 from matplotlib import pyplot
-import numpy
 import pathlib
 
-import petibmpy
-
 import rodney
 
 
-def get_recirculation_length_history(simudir, dt, time_limits=(0.5, 3.5)):
-    datadir = simudir / 'output'
-    name = 'u'  # name of the field variable to read
-    R = 0.5  # radius of cylinder
-    U = 1.0  # translational speed of cylinder
-    tstart, tend = time_limits  # starting and final time values to consider
-    times = numpy.arange(tstart, tend + dt / 2, dt)
-    filepath = datadir / f'probe-{name}.h5'
-    # Compute the history of the recirculation length.
-    lengths = numpy.empty_like(times)
-    for i, time in enumerate(times):
-        # Update center of the circle.
-        xc, yc = -U * time, 0.0  # center of the circle
-        # Load data of the volume probe.
-        probe = petibmpy.ProbeVolume(name, name)
-        (x, y), u = probe.read_hdf5(filepath, time)
-        # Interpolate volume along horizontal line at y=yc.
-        u_yc = petibmpy.linear_interpolation(u, y, yc)
-        # Compute the coordinates of the end of the recirculation zone.
-        buffer = 0.01
-        idx = numpy.where((u_yc + U <= 0.0) & (x > xc + R + buffer))[0][-1]
-        # x-coordinate computed as where the x-velocity becomes positive.
-        xp = petibmpy.linear_interpolation(x[idx: idx + 2],
-                                           u_yc[idx: idx + 2] + U, 0.0)
-        # Compute the recirculation legnth.
-        lengths[i] = abs(xp - (xc + R))
-    return times, lengths
-
-
 args = rodney.parse_command_line()
 maindir = pathlib.Path(__file__).absolute().parents[1]
 
@@ -45,10 +14,13 @@ maindir = pathlib.Path(__file__).absolute().parents[1]
 simus = {}
 dt_values = [0.0005, 0.001, 0.002, 0.005]
 linestyles = ['-', '--', '-.', ':']
+simudirs = [maindir / f'dt={dt}' for dt in dt_values]
+func = functools.partial(rodney.get_recirculation_length_history,
+                         time_limits=(0.5, 3.5))
+results = rodney.batch_map(func, simudirs)
 for i, (dt, linestyle) in enumerate(zip(dt_values, linestyles)):
     label = r'$\Delta t = {}$'.format(dt)
-    simudir = maindir / f'dt={dt}'
-    t, lw = get_recirculation_length_history(simudir, dt)
+    t, lw = results[i]
     simus[label] = dict(t=t, lw=lw,
                         plot_kwargs=dict(color='black',
                                          linestyle=linestyle,
@@ -5,9 +5,7 @@
  * \license BSD 3-Clause License.
  */
 
-#include <iomanip>
-
-#include <petibm/io.h>
+#include <limits>
 
 #include "dragonfly.h"
 
@@ -49,8 +47,46 @@ PetscErrorCode DragonflySolver::init(const MPI_Comm &world,
     {
         const YAML::Node &config_body = config_bodies[i]["kinematics"];
         params[i].nt_cycle = config_body["nt_cycle"].as<PetscInt>();
+        params[i].format = config_body["format"].as<std::string>("ascii");
+        // kinematics packed in one HDF5 file or stored in a folder of files
+        std::string key = (params[i].format == "hdf5") ? "file" : "folder";
         params[i].folder = simudir + "/" +
-                           config_body["folder"].as<std::string>();
+                           config_body[key].as<std::string>();
+        params[i].window = config_body["window"].as<PetscInt>(0);
+        // frames sampled at any rate are interpolated in time
+        params[i].dt = config_body["dt"].as<PetscReal>(0.0);
+        params[i].interpolation =
+            config_body["interpolation"].as<std::string>("none");
+        if (params[i].interpolation != "none" && params[i].window > 0)
+            SETERRQ(comm, PETSC_ERR_ARG_WRONG,
+                    "Interpolation in time of the kinematics requires the "
+                    "whole cycle in memory (window: 0)");
+    }
+
+    // load the kinematics (on process 0) and broadcast them
+    loaders.resize(nBodies);
+    cachedTimes.assign(nBodies, std::numeric_limits<PetscReal>::quiet_NaN());
+    positionBuffers.resize(nBodies);
+    velocityBuffers.resize(nBodies);
+    for (std::size_t i = 0; i < nBodies; ++i)
+    {
+        petibm::type::SingleBody &body = bodies->bodies[i];
+        loaders[i] = std::make_shared<KinematicsLoader>();
+        ierr = loaders[i]->init(comm, params[i].folder, params[i].format,
+                                params[i].nt_cycle, body->nPts, body->dim,
+                                params[i].window); CHKERRQ(ierr);
+        // sampling time-step size: given, stored in the HDF5 file, or the
+        // time-step size of the solver
+        if (params[i].dt <= 0.0)
+            params[i].dt = loaders[i]->getTimeStep();
+        if (params[i].dt <= 0.0)
+            params[i].dt = dt;
+        if (params[i].interpolation == "none" &&
+            PetscAbsReal(params[i].dt - dt) > 1.0E-12 * dt)
+            SETERRQ(comm, PETSC_ERR_ARG_WRONG,
+                    "The kinematics are not sampled at the time-step size "
+                    "of the solver; set the interpolation method to "
+                    "'linear' or 'cubic'");
     }
 
     ierr = PetscLogStagePop(); CHKERRQ(ierr);
@@ -58,23 +94,42 @@ PetscErrorCode DragonflySolver::init(const MPI_Comm &world,
     PetscFunctionReturn(0);
 }  // DragonflySolver::init
 
+PetscErrorCode DragonflySolver::destroy()
+{
+    PetscErrorCode ierr;
+
+    PetscFunctionBeginUser;
+
+    // release the frames shared by the processes of each node
+    for (std::shared_ptr<KinematicsLoader> &loader : loaders)
+    {
+        ierr = loader->destroy(); CHKERRQ(ierr);
+    }
+    loaders.clear();
+
+    ierr = LietAl2016Solver::destroy(); CHKERRQ(ierr);
+
+    PetscFunctionReturn(0);
+}  // DragonflySolver::destroy
+
 PetscErrorCode DragonflySolver::setCoordinatesBodies(const PetscReal &ti)
 {
     PetscErrorCode ierr;
+    const PetscReal *position, *velocity;
 
     PetscFunctionBeginUser;
 
-    // load body coordinates from file
+    // copy the body coordinates from the frames in memory
     for (size_t i = 0; i < bodies->nBodies; ++i)
     {
-        PetscInt n = ite % params[i].nt_cycle;
-        std::stringstream ss;
-        ss << std::setfill('0') << std::setw(7) << n;
         petibm::type::SingleBody &body = bodies->bodies[i];
-        std::string filepath;
-        filepath = params[i].folder + "/position_" + ss.str() + ".txt";
-        PetscInt numPts;
-        ierr = petibm::io::readLagrangianPoints(filepath, numPts, body->coords);
+        ierr = getKinematics(i, ti, position, velocity); CHKERRQ(ierr);
+        // update the locally owned points only
+        for (PetscInt k = body->bgPt; k < body->edPt; ++k)
+        {
+            for (PetscInt d = 0; d < body->dim; ++d)
+                body->coords[k][d] = position[k * body->dim + d];
+        }
     }
 
     PetscFunctionReturn(0);
@@ -86,6 +141,7 @@ PetscErrorCode DragonflySolver::setVelocityBodies(const PetscReal &ti)
     PetscInt nBodies = bodies->nBodies;
     std::vector<Vec> unPacked(nBodies);
     PetscReal **UB_arr;
+    const PetscReal *position, *velocity;
 
     PetscFunctionBeginUser;
 
@@ -96,21 +152,14 @@ PetscErrorCode DragonflySolver::setVelocityBodies(const PetscReal &ti)
     for (size_t i = 0; i < nBodies; ++i)
     {
         petibm::type::SingleBody &body = bodies->bodies[i];
-        // load velocity data from file
-        PetscInt n = ite % params[i].nt_cycle;
-        std::stringstream ss;
-        ss << std::setfill('0') << std::setw(7) << n;
-        std::string filepath;
-        filepath = params[i].folder + "/velocity_" + ss.str() + ".txt";
-        petibm::type::RealVec2D UB_vec;
-        PetscInt numPts;
-        ierr = petibm::io::readLagrangianPoints(filepath, numPts, UB_vec);
+        // copy the velocity from the frames in memory
+        ierr = getKinematics(i, ti, position, velocity); CHKERRQ(ierr);
         ierr = DMDAVecGetArrayDOF(
             body->da, unPacked[i], &UB_arr); CHKERRQ(ierr);
         for (PetscInt k = body->bgPt; k < body->edPt; ++k)
         {
             for (PetscInt d = 0; d < body->dim; d++)
-                UB_arr[k][d] = UB_vec[k][d];
+                UB_arr[k][d] = velocity[k * body->dim + d];
         }
         ierr = DMDAVecRestoreArrayDOF(
             body->da, unPacked[i], &UB_arr); CHKERRQ(ierr);
@@ -121,3 +170,38 @@ PetscErrorCode DragonflySolver::setVelocityBodies(const PetscReal &ti)
 
     PetscFunctionReturn(0);
 } // DragonflySolver::setVelocityBodies
+
+PetscErrorCode DragonflySolver::getKinematics(const PetscInt &i,
+                                              const PetscReal &ti,
+                                              const PetscReal *&position,
+                                              const PetscReal *&velocity)
+{
+    PetscErrorCode ierr;
+
+    PetscFunctionBeginUser;
+
+    if (params[i].interpolation == "none")
+    {
+        // frames sampled at the time-step size of the solver
+        PetscInt n = ite % params[i].nt_cycle;
+        ierr = loaders[i]->getFrame(n, position, velocity); CHKERRQ(ierr);
+    }
+    else
+    {
+        // interpolate the locally owned points only, once per time value
+        // (the coordinates and the velocity are set at the same time)
+        if (ti != cachedTimes[i])
+        {
+            petibm::type::SingleBody &body = bodies->bodies[i];
+            ierr = loaders[i]->interpolate(
+                ti / params[i].dt, params[i].interpolation, body->bgPt,
+                body->edPt, positionBuffers[i], velocityBuffers[i]);
+            CHKERRQ(ierr);
+            cachedTimes[i] = ti;
+        }
+        position = positionBuffers[i].data();
+        velocity = velocityBuffers[i].data();
+    }
+
+    PetscFunctionReturn(0);
+}  // DragonflySolver::getKinematics
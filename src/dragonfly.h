@@ -7,12 +7,18 @@
 
 #pragma once
 
+#include "kinematicsloader.h"
 #include "lietal2016.h"
 
 struct BodyParameters
 {
     PetscInt nt_cycle;
-    std::string folder;
+    std::string folder;  // folder of the frames (or path of the HDF5 file)
+    std::string format;  // format of the files ("ascii", "binary", "hdf5")
+    PetscInt window;  // number of frames kept in memory (0: whole cycle)
+    PetscReal dt;  // time-step size at which the frames are sampled
+    std::string interpolation;  // interpolation in time ("none", "linear",
+                                // or "cubic")
 };  // BodyParameters
 
 class DragonflySolver : public LietAl2016Solver
@@ -21,18 +27,27 @@ public:
     DragonflySolver() = default;
     DragonflySolver(const MPI_Comm &world, const YAML::Node &node);
     ~DragonflySolver();
-    using LietAl2016Solver::destroy;
     using LietAl2016Solver::advance;
     using LietAl2016Solver::write;
     using LietAl2016Solver::ioInitialData;
     using LietAl2016Solver::finished;
     PetscErrorCode init(const MPI_Comm &world, const YAML::Node &node);
+    PetscErrorCode destroy();
 
 protected:
     std::vector<BodyParameters> params;
+    std::vector<std::shared_ptr<KinematicsLoader>> loaders;
+    // kinematics of each body interpolated at the time cached, shared by
+    // the coordinates and the velocity of a time step
+    std::vector<PetscReal> cachedTimes;
+    std::vector<std::vector<PetscReal>> positionBuffers;
+    std::vector<std::vector<PetscReal>> velocityBuffers;
     std::string datadir;
     PetscInt nt_cycle;
     PetscErrorCode setCoordinatesBodies(const PetscReal &ti);
     PetscErrorCode setVelocityBodies(const PetscReal &ti);
+    PetscErrorCode getKinematics(const PetscInt &i, const PetscReal &ti,
+                                 const PetscReal *&position,
+                                 const PetscReal *&velocity);
 
 };  // DragonflySolver
\ No newline at end of file
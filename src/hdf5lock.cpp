@@ -0,0 +1,32 @@
+/**
+ * \file hdf5lock.cpp
+ * \brief Implementation of the class HDF5Lock.
+ * \copyright Copyright (c) 2019-2020, Olivier Mesnard. All rights reserved.
+ * \license BSD 3-Clause License.
+ */
+
+#include <hdf5.h>
+
+#include "hdf5lock.h"
+
+HDF5Lock::HDF5Lock(const bool &active) : lock(mutex(), std::defer_lock)
+{
+    if (active && !threadSafe())
+        lock.lock();
+}  // HDF5Lock::HDF5Lock
+
+bool HDF5Lock::threadSafe()
+{
+    static const bool safe = []
+    {
+        hbool_t threadsafe = false;
+        return H5is_library_threadsafe(&threadsafe) >= 0 && threadsafe;
+    }();
+    return safe;
+}  // HDF5Lock::threadSafe
+
+std::mutex &HDF5Lock::mutex()
+{
+    static std::mutex m;
+    return m;
+}  // HDF5Lock::mutex
@@ -0,0 +1,29 @@
+/**
+ * \file hdf5lock.h
+ * \brief Definition of the class HDF5Lock.
+ * \copyright Copyright (c) 2019-2020, Olivier Mesnard. All rights reserved.
+ * \license BSD 3-Clause License.
+ */
+
+#pragma once
+
+#include <mutex>
+
+/**
+ * \brief Scoped lock of the HDF5 library.
+ *
+ * The snapshot writer calls the HDF5 library from a background thread.
+ * Unless the library is thread-safe, a thread holds this lock (shared by
+ * all the threads of the process) while it calls the library.
+ */
+class HDF5Lock
+{
+public:
+    explicit HDF5Lock(const bool &active = true);
+    static bool threadSafe();
+
+protected:
+    std::unique_lock<std::mutex> lock;
+    static std::mutex &mutex();
+
+};  // HDF5Lock
@@ -0,0 +1,441 @@
+/**
+ * \file kinematicsloader.cpp
+ * \brief Implementation of the class KinematicsLoader.
+ * \copyright Copyright (c) 2019-2020, Olivier Mesnard. All rights reserved.
+ * \license BSD 3-Clause License.
+ */
+
+#include <algorithm>
+#include <cmath>
+#include <fstream>
+#include <iomanip>
+#include <sstream>
+
+#include "hdf5lock.h"
+#include "kinematicsloader.h"
+
+KinematicsLoader::~KinematicsLoader()
+{
+    PetscMPIInt finalized;
+
+    // wait for a pending read before releasing the buffers
+    if (prefetched.valid())
+        prefetched.wait();
+
+    // the shared memory can only be released while MPI is running
+    MPI_Finalized(&finalized);
+    if (!finalized)
+        destroy();
+}  // KinematicsLoader::~KinematicsLoader
+
+PetscErrorCode KinematicsLoader::init(
+    const MPI_Comm &world, const std::string &source,
+    const std::string &format, const PetscInt &nt_cycle,
+    const PetscInt &nPts, const PetscInt &dim, const PetscInt &window)
+{
+    PetscErrorCode ierr;
+    PetscMPIInt nodeRank;
+    MPI_Aint segment;
+    PetscMPIInt unit;
+
+    PetscFunctionBeginUser;
+
+    ierr = destroy(); CHKERRQ(ierr);
+
+    comm = world;
+    ierr = MPI_Comm_rank(comm, &commRank); CHKERRQ(ierr);
+
+    if (format != "ascii" && format != "binary" && format != "hdf5")
+        SETERRQ(comm, PETSC_ERR_ARG_WRONG,
+                "Accepted values for the format of the kinematics are: "
+                "'ascii', 'binary', and 'hdf5'.");
+
+    this->source = source;
+    this->format = format;
+    this->nt_cycle = nt_cycle;
+    this->nPts = nPts;
+    this->dim = dim;
+    // keep the whole cycle in memory if no (or a too large) window is given
+    this->window = (window <= 0 || window > nt_cycle) ? nt_cycle : window;
+
+    // the processes of a node share one copy of the frames, allocated by
+    // the first process of the node (process 0 is the first one of its
+    // node and of the group of the first processes)
+    ierr = MPI_Comm_split_type(comm, MPI_COMM_TYPE_SHARED, commRank,
+                               MPI_INFO_NULL, &nodeComm); CHKERRQ(ierr);
+    ierr = MPI_Comm_rank(nodeComm, &nodeRank); CHKERRQ(ierr);
+    ierr = MPI_Comm_split(comm, (nodeRank == 0) ? 0 : MPI_UNDEFINED,
+                          commRank, &leaderComm); CHKERRQ(ierr);
+    PetscInt size = this->window * nPts * dim;
+    MPI_Aint bytes = (nodeRank == 0) ? 2 * size * sizeof(PetscReal) : 0;
+    ierr = MPI_Win_allocate_shared(bytes, sizeof(PetscReal), MPI_INFO_NULL,
+                                   nodeComm, &positions, &win);
+    CHKERRQ(ierr);
+    ierr = MPI_Win_shared_query(win, 0, &segment, &unit, &positions);
+    CHKERRQ(ierr);
+    velocities = positions + size;
+    ierr = MPI_Win_lock_all(MPI_MODE_NOCHECK, win); CHKERRQ(ierr);
+
+    ierr = loadWindow(0); CHKERRQ(ierr);
+
+    // sampling time-step size of the frames (if stored in the HDF5 file)
+    if (format == "hdf5")
+    {
+        if (commRank == 0)
+            dt = readTimeStepHDF5();
+        ierr = MPI_Bcast(&dt, 1, MPIU_REAL, 0, comm); CHKERRQ(ierr);
+    }
+
+    PetscFunctionReturn(0);
+}  // KinematicsLoader::init
+
+PetscErrorCode KinematicsLoader::destroy()
+{
+    PetscErrorCode ierr;
+
+    PetscFunctionBeginUser;
+
+    if (prefetched.valid())
+        prefetched.wait();
+    prefetched = std::future<bool>();
+
+    // collective on the processes of the node
+    if (win != MPI_WIN_NULL)
+    {
+        ierr = MPI_Win_unlock_all(win); CHKERRQ(ierr);
+        ierr = MPI_Win_free(&win); CHKERRQ(ierr);
+    }
+    if (leaderComm != MPI_COMM_NULL)
+    {
+        ierr = MPI_Comm_free(&leaderComm); CHKERRQ(ierr);
+    }
+    if (nodeComm != MPI_COMM_NULL)
+    {
+        ierr = MPI_Comm_free(&nodeComm); CHKERRQ(ierr);
+    }
+    positions = velocities = nullptr;
+    first = last = nextFirst = -1;
+
+    PetscFunctionReturn(0);
+}  // KinematicsLoader::destroy
+
+PetscErrorCode KinematicsLoader::getFrame(const PetscInt &n,
+                                          const PetscReal *&position,
+                                          const PetscReal *&velocity)
+{
+    PetscErrorCode ierr;
+
+    PetscFunctionBeginUser;
+
+    if (n < first || n >= last)
+    {
+        ierr = loadWindow((n / window) * window); CHKERRQ(ierr);
+    }
+
+    PetscInt offset = (n - first) * nPts * dim;
+    position = positions + offset;
+    velocity = velocities + offset;
+
+    PetscFunctionReturn(0);
+}  // KinematicsLoader::getFrame
+
+PetscErrorCode KinematicsLoader::interpolate(const PetscReal &phase,
+                                             const std::string &method,
+                                             const PetscInt &bgPt,
+                                             const PetscInt &edPt,
+                                             std::vector<PetscReal> &position,
+                                             std::vector<PetscReal> &velocity)
+{
+    PetscInt size = nPts * dim;
+    PetscInt n[4];
+    PetscReal w[4];
+    PetscInt nw;
+
+    PetscFunctionBeginUser;
+
+    if (window < nt_cycle)
+        SETERRQ(comm, PETSC_ERR_ARG_WRONG,
+                "Interpolation in time requires the whole cycle in memory");
+
+    // periodic phase in [0, nt_cycle)
+    PetscReal s = std::fmod(phase, (PetscReal)nt_cycle);
+    if (s < 0.0)
+        s += nt_cycle;
+    PetscInt n1 = std::min((PetscInt)std::floor(s), nt_cycle - 1);
+    PetscReal a = s - n1;
+
+    if (method == "linear")
+    {
+        nw = 2;
+        n[0] = n1;
+        n[1] = (n1 + 1) % nt_cycle;
+        w[0] = 1.0 - a;
+        w[1] = a;
+    }
+    else if (method == "cubic")
+    {
+        // Catmull-Rom spline through frames n1 - 1, n1, n1 + 1, and n1 + 2
+        nw = 4;
+        for (PetscInt k = 0; k < 4; ++k)
+            n[k] = (n1 - 1 + k + nt_cycle) % nt_cycle;
+        w[0] = 0.5 * a * (-1.0 + a * (2.0 - a));
+        w[1] = 0.5 * (2.0 + a * a * (-5.0 + 3.0 * a));
+        w[2] = 0.5 * a * (1.0 + a * (4.0 - 3.0 * a));
+        w[3] = 0.5 * a * a * (-1.0 + a);
+    }
+    else
+        SETERRQ1(comm, PETSC_ERR_ARG_WRONG,
+                 "Unknown interpolation method %s; accepted values are: "
+                 "'linear' and 'cubic'.", method.c_str());
+
+    // interpolate the points [bgPt, edPt) only
+    position.resize(size);
+    velocity.resize(size);
+    std::fill(position.begin() + bgPt * dim, position.begin() + edPt * dim,
+              0.0);
+    std::fill(velocity.begin() + bgPt * dim, velocity.begin() + edPt * dim,
+              0.0);
+    for (PetscInt k = 0; k < nw; ++k)
+    {
+        const PetscReal *p = positions + n[k] * size,
+                        *v = velocities + n[k] * size;
+        for (PetscInt j = bgPt * dim; j < edPt * dim; ++j)
+        {
+            position[j] += w[k] * p[j];
+            velocity[j] += w[k] * v[j];
+        }
+    }
+
+    PetscFunctionReturn(0);
+}  // KinematicsLoader::interpolate
+
+PetscReal KinematicsLoader::getTimeStep() const
+{
+    return dt;
+}  // KinematicsLoader::getTimeStep
+
+PetscErrorCode KinematicsLoader::loadWindow(const PetscInt &start)
+{
+    PetscErrorCode ierr;
+    PetscInt count = std::min(window, nt_cycle - start);
+    PetscMPIInt size = count * nPts * dim;  // values of the frames read
+    int success = 1;
+
+    PetscFunctionBeginUser;
+
+    // the frames in memory are shared by the processes of a node: wait
+    // until all of them are done with the current window
+    ierr = MPI_Barrier(nodeComm); CHKERRQ(ierr);
+
+    // process 0 reads the frames (or picks up the prefetched ones)
+    if (commRank == 0)
+    {
+        if (prefetched.valid() && nextFirst == start)
+        {
+            success = prefetched.get();
+            std::copy(nextPositions.begin(), nextPositions.begin() + size,
+                      positions);
+            std::copy(nextVelocities.begin(), nextVelocities.begin() + size,
+                      velocities);
+        }
+        else
+        {
+            if (prefetched.valid())
+                prefetched.wait();
+            success = readFrames(start, positions, velocities);
+        }
+    }
+    ierr = MPI_Bcast(&success, 1, MPI_INT, 0, comm); CHKERRQ(ierr);
+    if (!success)
+        SETERRQ1(comm, PETSC_ERR_FILE_READ,
+                 "Could not read the kinematics from %s",
+                 source.c_str());
+
+    // broadcast the frames (contiguous in memory) to the other nodes
+    if (leaderComm != MPI_COMM_NULL)
+    {
+        ierr = MPI_Bcast(positions, size, MPIU_REAL, 0, leaderComm);
+        CHKERRQ(ierr);
+        ierr = MPI_Bcast(velocities, size, MPIU_REAL, 0, leaderComm);
+        CHKERRQ(ierr);
+    }
+
+    // make the new frames visible to all the processes of the node
+    ierr = MPI_Win_sync(win); CHKERRQ(ierr);
+    ierr = MPI_Barrier(nodeComm); CHKERRQ(ierr);
+    ierr = MPI_Win_sync(win); CHKERRQ(ierr);
+    first = start;
+    last = start + count;
+
+    // process 0 reads the next window in the background
+    if (window < nt_cycle && commRank == 0 && prefetch())
+    {
+        nextFirst = last % nt_cycle;
+        nextPositions.resize(window * nPts * dim);
+        nextVelocities.resize(window * nPts * dim);
+        prefetched = std::async(std::launch::async,
+                                &KinematicsLoader::readFrames, this,
+                                nextFirst, nextPositions.data(),
+                                nextVelocities.data());
+    }
+
+    PetscFunctionReturn(0);
+}  // KinematicsLoader::loadWindow
+
+bool KinematicsLoader::prefetch() const
+{
+    // HDF5 files are read on another thread only if the library allows it
+    if (format == "hdf5")
+        return HDF5Lock::threadSafe();
+
+    return true;
+}  // KinematicsLoader::prefetch
+
+bool KinematicsLoader::readFrames(const PetscInt &start,
+                                  PetscReal *positionsRead,
+                                  PetscReal *velocitiesRead) const
+{
+    PetscInt count = std::min(window, nt_cycle - start);
+    PetscInt size = nPts * dim;
+    std::string ext = (format == "binary") ? ".bin" : ".txt";
+
+    if (format == "hdf5")
+        return readFramesHDF5(start, positionsRead, velocitiesRead);
+
+    // no PETSc or MPI calls here: this may run on a background thread
+    for (PetscInt k = 0; k < count; ++k)
+    {
+        std::stringstream ss;
+        ss << std::setfill('0') << std::setw(7) << start + k << ext;
+        if (!readFrame(source + "/position_" + ss.str(),
+                       positionsRead + k * size))
+            return false;
+        if (!readFrame(source + "/velocity_" + ss.str(),
+                       velocitiesRead + k * size))
+            return false;
+    }
+
+    return true;
+}  // KinematicsLoader::readFrames
+
+bool KinematicsLoader::readFrame(const std::string &filepath,
+                                 PetscReal *data) const
+{
+    PetscInt size = nPts * dim;
+
+    if (format == "binary")
+    {
+        // raw array of nPts x dim double-precision values
+        std::ifstream infile(filepath, std::ios::binary);
+        if (!infile.good())
+            return false;
+        std::vector<double> buffer(size);
+        infile.read(reinterpret_cast<char *>(buffer.data()),
+                    size * sizeof(double));
+        if (!infile)
+            return false;
+        std::copy(buffer.begin(), buffer.end(), data);
+    }
+    else
+    {
+        // number of points on the first line, then the values of each point
+        std::ifstream infile(filepath);
+        if (!infile.good())
+            return false;
+        PetscInt n;
+        if (!(infile >> n) || n != nPts)
+            return false;
+        for (PetscInt i = 0; i < size; ++i)
+        {
+            if (!(infile >> data[i]))
+                return false;
+        }
+    }
+
+    return true;
+}  // KinematicsLoader::readFrame
+
+bool KinematicsLoader::readFramesHDF5(const PetscInt &start,
+                                      PetscReal *positionsRead,
+                                      PetscReal *velocitiesRead) const
+{
+    PetscInt count = std::min(window, nt_cycle - start);
+    bool success;
+
+    // the snapshot writer may use the HDF5 library at the same time
+    HDF5Lock lock;
+    hid_t file = H5Fopen(source.c_str(), H5F_ACC_RDONLY, H5P_DEFAULT);
+    if (file < 0)
+        return false;
+    success = (readDatasetHDF5(file, "position", start, count,
+                               positionsRead) &&
+               readDatasetHDF5(file, "velocity", start, count,
+                               velocitiesRead));
+    H5Fclose(file);
+
+    return success;
+}  // KinematicsLoader::readFramesHDF5
+
+PetscReal KinematicsLoader::readTimeStepHDF5() const
+{
+    double value = 0.0;
+
+    HDF5Lock lock;
+    hid_t file = H5Fopen(source.c_str(), H5F_ACC_RDONLY, H5P_DEFAULT);
+    if (file < 0)
+        return 0.0;
+    if (H5Aexists(file, "dt") > 0)
+    {
+        hid_t attr = H5Aopen(file, "dt", H5P_DEFAULT);
+        if (H5Aread(attr, H5T_NATIVE_DOUBLE, &value) < 0)
+            value = 0.0;
+        H5Aclose(attr);
+    }
+    H5Fclose(file);
+
+    return value;
+}  // KinematicsLoader::readTimeStepHDF5
+
+bool KinematicsLoader::readDatasetHDF5(
+    const hid_t &file, const std::string &name, const PetscInt &start,
+    const PetscInt &count, PetscReal *data) const
+{
+    hsize_t dims[3];
+    herr_t status;
+
+    hid_t dset = H5Dopen2(file, name.c_str(), H5P_DEFAULT);
+    if (dset < 0)
+        return false;
+    hid_t fspace = H5Dget_space(dset);
+
+    // check the shape (nt_cycle, nPts, dim) of the dataset
+    bool success = (H5Sget_simple_extent_ndims(fspace) == 3);
+    if (success)
+    {
+        H5Sget_simple_extent_dims(fspace, dims, nullptr);
+        success = (dims[0] == (hsize_t)nt_cycle &&
+                   dims[1] == (hsize_t)nPts && dims[2] == (hsize_t)dim);
+    }
+
+    // read the contiguous block of frames [start, start + count)
+    if (success)
+    {
+        hsize_t offset[3] = {(hsize_t)start, 0, 0};
+        hsize_t extent[3] = {(hsize_t)count, (hsize_t)nPts, (hsize_t)dim};
+        std::vector<double> buffer(count * nPts * dim);
+        H5Sselect_hyperslab(fspace, H5S_SELECT_SET, offset, nullptr,
+                            extent, nullptr);
+        hid_t mspace = H5Screate_simple(3, extent, nullptr);
+        status = H5Dread(dset, H5T_NATIVE_DOUBLE, mspace, fspace,
+                         H5P_DEFAULT, buffer.data());
+        H5Sclose(mspace);
+        success = (status >= 0);
+        if (success)
+            std::copy(buffer.begin(), buffer.end(), data);
+    }
+
+    H5Sclose(fspace);
+    H5Dclose(dset);
+
+    return success;
+}  // KinematicsLoader::readDatasetHDF5
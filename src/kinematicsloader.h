@@ -0,0 +1,89 @@
+/**
+ * \file kinematicsloader.h
+ * \brief Definition of the class KinematicsLoader.
+ * \copyright Copyright (c) 2019-2020, Olivier Mesnard. All rights reserved.
+ * \license BSD 3-Clause License.
+ */
+
+#pragma once
+
+#include <future>
+#include <string>
+#include <vector>
+
+#include <hdf5.h>
+#include <petscsys.h>
+
+/**
+ * \brief Loader of the prescribed kinematics of a body over a cycle.
+ *
+ * The positions and velocities of the Lagrangian points are read by
+ * process 0 only and broadcast to one process per node; the processes of a
+ * node share a single copy of the frames (MPI-3 shared-memory window).
+ * Frames are read from one file per frame and per quantity (ASCII or raw
+ * binary), or from an HDF5 file packed with `rodney.pack_kinematics`
+ * (datasets `position` and `velocity` of shape (nt_cycle, nPts, dim)).
+ * Frames are kept in memory, either for the whole cycle (read once)
+ * or for a rolling window of frames; in the latter case, process 0 reads
+ * the next window on a background thread while the current one is used
+ * (for HDF5 files, only if the HDF5 library is thread-safe; otherwise, the
+ * windows are read when needed). The background thread does no PETSc or
+ * MPI calls.
+ * When the whole cycle is in memory, the kinematics can be interpolated
+ * (linearly or with a cubic Catmull-Rom spline) at any phase of the cycle.
+ */
+class KinematicsLoader
+{
+public:
+    KinematicsLoader() = default;
+    ~KinematicsLoader();
+    PetscErrorCode init(const MPI_Comm &world, const std::string &source,
+                        const std::string &format, const PetscInt &nt_cycle,
+                        const PetscInt &nPts, const PetscInt &dim,
+                        const PetscInt &window);
+    PetscErrorCode destroy();
+    PetscErrorCode getFrame(const PetscInt &n,
+                            const PetscReal *&position,
+                            const PetscReal *&velocity);
+    PetscErrorCode interpolate(const PetscReal &phase,
+                               const std::string &method,
+                               const PetscInt &bgPt, const PetscInt &edPt,
+                               std::vector<PetscReal> &position,
+                               std::vector<PetscReal> &velocity);
+    PetscReal getTimeStep() const;
+
+protected:
+    MPI_Comm comm;
+    PetscMPIInt commRank;
+    MPI_Comm nodeComm = MPI_COMM_NULL;  // processes sharing the memory
+    MPI_Comm leaderComm = MPI_COMM_NULL;  // first process of each node
+    MPI_Win win = MPI_WIN_NULL;  // shared-memory window of the frames
+    std::string source;  // folder with the files of the frames
+                         // (or path of the HDF5 file)
+    std::string format;  // format of the files ("ascii", "binary", "hdf5")
+    PetscInt nt_cycle;  // number of frames in a cycle
+    PetscInt nPts;  // number of Lagrangian points
+    PetscInt dim;  // number of dimensions
+    PetscInt window;  // number of frames kept in memory
+    PetscReal dt = 0.0;  // sampling time-step size stored in the HDF5 file
+    PetscInt first = -1;  // index of the first frame in memory
+    PetscInt last = -1;  // index of the last frame in memory (excluded)
+    PetscReal *positions = nullptr;  // positions of the frames in memory
+    PetscReal *velocities = nullptr;  // velocities of the frames in memory
+    PetscInt nextFirst = -1;  // index of the first frame prefetched
+    std::vector<PetscReal> nextPositions;
+    std::vector<PetscReal> nextVelocities;
+    std::future<bool> prefetched;
+    PetscErrorCode loadWindow(const PetscInt &start);
+    bool prefetch() const;
+    bool readFrames(const PetscInt &start, PetscReal *positionsRead,
+                    PetscReal *velocitiesRead) const;
+    bool readFrame(const std::string &filepath, PetscReal *data) const;
+    bool readFramesHDF5(const PetscInt &start, PetscReal *positionsRead,
+                        PetscReal *velocitiesRead) const;
+    PetscReal readTimeStepHDF5() const;
+    bool readDatasetHDF5(const hid_t &file, const std::string &name,
+                         const PetscInt &start, const PetscInt &count,
+                         PetscReal *data) const;
+
+};  // KinematicsLoader
@@ -5,6 +5,16 @@
  * \license BSD 3-Clause License.
  */
 
+#include <algorithm>
+#include <cmath>
+#include <cstdint>
+#include <cstdio>
+#include <iomanip>
+#include <limits>
+#include <sstream>
+#include <string>
+
+#include "hdf5lock.h"
 #include "lietal2016.h"
 
 LietAl2016Solver::LietAl2016Solver(const MPI_Comm &world,
@@ -33,7 +43,20 @@ PetscErrorCode LietAl2016Solver::init(const MPI_Comm &world,
 
     PetscFunctionBeginUser;
 
-    ierr = RigidKinematicsSolver::init(world, node); CHKERRQ(ierr);
+    // volume probes attached to a body are handled by this solver (and
+    // hidden from the probes of the parent solver)
+    YAML::Node config = YAML::Clone(node);
+    if (node["probes"])
+    {
+        config["probes"] = YAML::Node(YAML::NodeType::Sequence);
+        for (const YAML::Node &probe : node["probes"])
+            if (!probe["body"])
+                config["probes"].push_back(YAML::Clone(probe));
+        if (config["probes"].size() == 0)
+            config.remove("probes");
+    }
+
+    ierr = RigidKinematicsSolver::init(world, config); CHKERRQ(ierr);
 
     ierr = PetscLogStagePush(stageInitialize); CHKERRQ(ierr);
 
@@ -48,6 +71,8 @@ PetscErrorCode LietAl2016Solver::init(const MPI_Comm &world,
 
     if (node["bodies"][0]["kinematics"])
         move = PETSC_TRUE;
+    saveInterval = node["parameters"]["nsave"].as<PetscInt>();
+    restartInterval = node["parameters"]["nrestart"].as<PetscInt>(0);
     
     dV = 1.0;
     petibm::type::SingleBody &body = bodies->bodies[0];
@@ -55,25 +80,1173 @@ PetscErrorCode LietAl2016Solver::init(const MPI_Comm &world,
     for (PetscInt d = 0; d < mesh->dim; ++d)
         dV *= mesh->dL[3][d][idx[d]];
 
+    ierr = registerLogging(node); CHKERRQ(ierr);
+    ierr = initLoadBalance(node); CHKERRQ(ierr);
+    ierr = initForcesBinary(node); CHKERRQ(ierr);
+    ierr = initSnapshotStorage(node); CHKERRQ(ierr);
+    ierr = initAsyncOutput(node); CHKERRQ(ierr);
+    ierr = initOutputRegions(node); CHKERRQ(ierr);
+    ierr = initAttachedProbes(node); CHKERRQ(ierr);
+
+    ierr = createWorkVectors(); CHKERRQ(ierr);
+
     ierr = PetscLogStagePop(); CHKERRQ(ierr);
 
     PetscFunctionReturn(0);
 }  // init
 
+PetscErrorCode LietAl2016Solver::registerLogging(const YAML::Node &node)
+{
+    PetscErrorCode ierr;
+    PetscClassId classId;
+    const char *subStepNames[NSUBSTEPS] = {
+        "DIBPMMove", "DIBPMScheme", "DIBPMVelocity", "DIBPMForces",
+        "DIBPMNoSlip", "DIBPMPoisson", "DIBPMProjection", "DIBPMUpdate"};
+    char path[PETSC_MAX_PATH_LEN] = "";
+    std::stringstream ss;
+
+    PetscFunctionBeginUser;
+
+    ierr = PetscClassIdRegister("LietAl2016Solver", &classId); CHKERRQ(ierr);
+    ierr = PetscLogEventRegister(
+        "DIBPMPredictor", classId, &eventPredictor); CHKERRQ(ierr);
+    ierr = PetscLogEventRegister(
+        "DIBPMIntegForces", classId, &eventIntegrateForces); CHKERRQ(ierr);
+    subStepEvents.resize(NSUBSTEPS);
+    for (PetscInt s = 0; s < NSUBSTEPS; ++s)
+    {
+        ierr = PetscLogEventRegister(
+            subStepNames[s], classId, &subStepEvents[s]); CHKERRQ(ierr);
+    }
+
+    // dedicated stages for the scheme and the algorithm used
+    ss << "Scheme " << scheme;
+    ierr = PetscLogStageRegister(ss.str().c_str(), &stageScheme);
+    CHKERRQ(ierr);
+    ss.str("");
+    ss << "Algorithm " << algo;
+    ierr = PetscLogStageRegister(ss.str().c_str(), &stageAlgorithm);
+    CHKERRQ(ierr);
+
+    // optional per-step timing trace (CSV file written by process 0);
+    // enabled with the command-line option `-timing_trace [<filepath>]`
+    subStepTics.assign(NSUBSTEPS, 0.0);
+    subStepTimes.assign(NSUBSTEPS, 0.0);
+    ierr = PetscOptionsGetString(nullptr, nullptr, "-timing_trace",
+                                 path, sizeof(path), &timing); CHKERRQ(ierr);
+    if (timing)
+    {
+        std::string filepath = path;
+        if (filepath.empty())
+            filepath = node["directory"].as<std::string>() + "/timing.csv";
+        ierr = PetscFOpen(comm, filepath.c_str(), "w", &timingFile);
+        CHKERRQ(ierr);
+        ierr = PetscFPrintf(comm, timingFile,
+                            "ite,t,move,scheme,velocity,forces,noslip,"
+                            "poisson,projection,update,total\n");
+        CHKERRQ(ierr);
+    }
+
+    PetscFunctionReturn(0);
+}  // registerLogging
+
+PetscErrorCode LietAl2016Solver::beginSubStep(const SubStep &s)
+{
+    PetscErrorCode ierr;
+
+    PetscFunctionBeginUser;
+
+    ierr = PetscLogEventBegin(subStepEvents[s], 0, 0, 0, 0); CHKERRQ(ierr);
+    if (timing)
+    {
+        ierr = PetscTime(&subStepTics[s]); CHKERRQ(ierr);
+    }
+
+    PetscFunctionReturn(0);
+}  // beginSubStep
+
+PetscErrorCode LietAl2016Solver::endSubStep(const SubStep &s)
+{
+    PetscErrorCode ierr;
+
+    PetscFunctionBeginUser;
+
+    if (timing)
+    {
+        PetscLogDouble toc;
+        ierr = PetscTime(&toc); CHKERRQ(ierr);
+        subStepTimes[s] += toc - subStepTics[s];
+    }
+    ierr = PetscLogEventEnd(subStepEvents[s], 0, 0, 0, 0); CHKERRQ(ierr);
+
+    PetscFunctionReturn(0);
+}  // endSubStep
+
+PetscErrorCode LietAl2016Solver::writeTimingTrace()
+{
+    PetscErrorCode ierr;
+    PetscLogDouble toc;
+    std::vector<PetscLogDouble> times(subStepTimes);
+    std::stringstream ss;
+
+    PetscFunctionBeginUser;
+
+    ierr = PetscTime(&toc); CHKERRQ(ierr);
+    times.push_back(toc - stepTic);
+
+    // record the slowest process for each sub-step
+    std::vector<PetscLogDouble> maxTimes(times.size(), 0.0);
+    ierr = MPI_Reduce(times.data(), maxTimes.data(), times.size(),
+                      MPIU_PETSCLOGDOUBLE, MPI_MAX, 0, comm); CHKERRQ(ierr);
+
+    ss << ite << "," << std::scientific << std::setprecision(8) << t;
+    ss << std::setprecision(4);
+    for (std::size_t i = 0; i < maxTimes.size(); ++i)
+        ss << "," << maxTimes[i];
+    ierr = PetscFPrintf(comm, timingFile, "%s\n", ss.str().c_str());
+    CHKERRQ(ierr);
+
+    PetscFunctionReturn(0);
+}  // writeTimingTrace
+
+PetscErrorCode LietAl2016Solver::initLoadBalance(const YAML::Node &node)
+{
+    PetscErrorCode ierr;
+    char path[PETSC_MAX_PATH_LEN] = "";
+    PetscMPIInt size;
+
+    PetscFunctionBeginUser;
+
+    // optional report of the load balance of the Lagrangian markers
+    // (binary file written by process 0 every nsave time steps);
+    // enabled with the command-line option `-load_balance [<filepath>]`
+    ierr = PetscOptionsGetString(nullptr, nullptr, "-load_balance",
+                                 path, sizeof(path), &loadBalance);
+    CHKERRQ(ierr);
+    if (!loadBalance)
+        PetscFunctionReturn(0);
+
+    loadBalanceInterval = node["parameters"]["nsave"].as<PetscInt>();
+    std::string filepath = path;
+    if (filepath.empty())
+        filepath = node["directory"].as<std::string>() + "/loadbalance.bin";
+    ierr = PetscFOpen(comm, filepath.c_str(), "wb", &loadBalanceFile);
+    CHKERRQ(ierr);
+
+    // header: number of processes and number of counts per process
+    ierr = MPI_Comm_size(comm, &size); CHKERRQ(ierr);
+    int64_t header[2] = {size, 4};
+    if (loadBalanceFile)
+        std::fwrite(header, sizeof(int64_t), 2, loadBalanceFile);
+
+    PetscFunctionReturn(0);
+}  // initLoadBalance
+
+PetscErrorCode LietAl2016Solver::writeLoadBalance()
+{
+    PetscErrorCode ierr;
+    PetscMPIInt size;
+    MatInfo info;
+    PetscInt nMarkers = 0, nSupport = 0, nLocal, rStart, rEnd, nCols;
+
+    PetscFunctionBeginUser;
+
+    // number of Lagrangian markers owned
+    for (PetscInt i = 0; i < bodies->nBodies; ++i)
+    {
+        const petibm::type::SingleBody &body = bodies->bodies[i];
+        nMarkers += body->edPt - body->bgPt;
+    }
+
+    // number of interpolation weights (non-zeros of the local rows of E)
+    ierr = MatGetInfo(E, MAT_LOCAL, &info); CHKERRQ(ierr);
+
+    // number of Eulerian points owned in the support of the markers
+    // (non-empty local rows of H)
+    ierr = MatGetOwnershipRange(H, &rStart, &rEnd); CHKERRQ(ierr);
+    for (PetscInt row = rStart; row < rEnd; ++row)
+    {
+        ierr = MatGetRow(H, row, &nCols, nullptr, nullptr); CHKERRQ(ierr);
+        if (nCols > 0) nSupport++;
+        ierr = MatRestoreRow(H, row, &nCols, nullptr, nullptr); CHKERRQ(ierr);
+    }
+
+    // number of Eulerian velocity points owned
+    ierr = VecGetLocalSize(solution->UGlobal, &nLocal); CHKERRQ(ierr);
+
+    int64_t counts[4] = {nMarkers, (int64_t)info.nz_used, nSupport, nLocal};
+    ierr = MPI_Comm_size(comm, &size); CHKERRQ(ierr);
+    std::vector<int64_t> allCounts(4 * size, 0);
+    ierr = MPI_Gather(counts, 4, MPI_INT64_T, allCounts.data(), 4,
+                      MPI_INT64_T, 0, comm); CHKERRQ(ierr);
+
+    // record: time (float64), time step (int64), counts (int64)
+    if (loadBalanceFile)
+    {
+        double time = t;
+        int64_t step = ite;
+        std::fwrite(&time, sizeof(double), 1, loadBalanceFile);
+        std::fwrite(&step, sizeof(int64_t), 1, loadBalanceFile);
+        std::fwrite(allCounts.data(), sizeof(int64_t), allCounts.size(),
+                    loadBalanceFile);
+        std::fflush(loadBalanceFile);
+    }
+
+    PetscFunctionReturn(0);
+}  // writeLoadBalance
+
+PetscErrorCode LietAl2016Solver::write()
+{
+    PetscErrorCode ierr;
+
+    PetscFunctionBeginUser;
+
+    // gather the coordinates of the Lagrangian points before output
+    if (move && (ite % saveInterval == 0 ||
+                 (restartInterval > 0 && ite % restartInterval == 0)))
+    {
+        ierr = gatherCoordinatesBodies(); CHKERRQ(ierr);
+    }
+
+    // the snapshots in the queue are written before the restart files
+    bool restart = (restartInterval > 0 && ite % restartInterval == 0);
+    if (asyncOutput && restart && !snapshotWriter.flush())
+        SETERRQ(PETSC_COMM_SELF, PETSC_ERR_FILE_WRITE,
+                "Could not write a snapshot");
+
+    // HDF5 probes of the parent solver and the snapshot writer may not use
+    // the HDF5 library at the same time
+    bool probing = false;
+    for (const PetscInt &nMonitor : probeIntervals)
+        probing = probing || (ite % nMonitor == 0);
+    {
+        HDF5Lock lock(asyncOutput && probing);
+        ierr = RigidKinematicsSolver::write(); CHKERRQ(ierr);
+    }
+
+    if (!outputRegions.empty())
+    {
+        ierr = writeOutputRegions(); CHKERRQ(ierr);
+    }
+
+    if (!attachedProbes.empty())
+    {
+        ierr = writeAttachedProbes(); CHKERRQ(ierr);
+    }
+
+    PetscFunctionReturn(0);
+}  // write
+
+PetscErrorCode LietAl2016Solver::gatherCoordinatesBodies()
+{
+    PetscErrorCode ierr;
+    PetscMPIInt size;
+
+    PetscFunctionBeginUser;
+
+    ierr = MPI_Comm_size(comm, &size); CHKERRQ(ierr);
+    std::vector<PetscMPIInt> counts(size), offsets(size, 0);
+    for (PetscInt i = 0; i < bodies->nBodies; ++i)
+    {
+        petibm::type::SingleBody &body = bodies->bodies[i];
+        PetscInt dim = body->dim;
+
+        // points are distributed by contiguous blocks in rank order
+        PetscMPIInt nLocal = (body->edPt - body->bgPt) * dim;
+        ierr = MPI_Allgather(&nLocal, 1, MPI_INT, counts.data(), 1, MPI_INT,
+                             comm); CHKERRQ(ierr);
+        for (PetscMPIInt r = 1; r < size; ++r)
+            offsets[r] = offsets[r - 1] + counts[r - 1];
+
+        std::vector<PetscReal> local(nLocal), global(body->nPts * dim);
+        for (PetscInt k = body->bgPt; k < body->edPt; ++k)
+        {
+            for (PetscInt d = 0; d < dim; ++d)
+                local[(k - body->bgPt) * dim + d] = body->coords[k][d];
+        }
+        ierr = MPI_Allgatherv(local.data(), nLocal, MPIU_REAL,
+                              global.data(), counts.data(), offsets.data(),
+                              MPIU_REAL, comm); CHKERRQ(ierr);
+        for (PetscInt k = 0; k < body->nPts; ++k)
+        {
+            for (PetscInt d = 0; d < dim; ++d)
+                body->coords[k][d] = global[k * dim + d];
+        }
+    }
+
+    PetscFunctionReturn(0);
+}  // gatherCoordinatesBodies
+
+PetscErrorCode LietAl2016Solver::initForcesBinary(const YAML::Node &node)
+{
+    PetscErrorCode ierr;
+    char format[PETSC_MAX_PATH_LEN] = "ascii";
+
+    PetscFunctionBeginUser;
+
+    // format of the forces file, set with the command-line option
+    // `-forces_format <ascii|binary>`; in binary mode, the records are
+    // buffered over `-forces_buffer <n>` time steps (default: nsave) and
+    // written at least at every save and restart step
+    ierr = PetscOptionsGetString(nullptr, nullptr, "-forces_format",
+                                 format, sizeof(format), nullptr);
+    CHKERRQ(ierr);
+    if (std::string(format) == "ascii")
+        PetscFunctionReturn(0);
+    if (std::string(format) != "binary")
+        SETERRQ(comm, PETSC_ERR_ARG_WRONG,
+                "Accepted values for -forces_format are: "
+                "'ascii' and 'binary'.");
+
+    forcesBinary = PETSC_TRUE;
+    forcesBufferSize = saveInterval;
+    ierr = PetscOptionsGetInt(nullptr, nullptr, "-forces_buffer",
+                              &forcesBufferSize, nullptr); CHKERRQ(ierr);
+    forcesBufferSize = std::max(forcesBufferSize, (PetscInt)1);
+
+    std::string outdir = node["output"].as<std::string>(
+        node["directory"].as<std::string>() + "/output");
+    std::string filepath = outdir + "/forces-" + std::to_string(ite) + ".bin";
+    ierr = PetscFOpen(comm, filepath.c_str(), "wb", &forcesFile);
+    CHKERRQ(ierr);
+
+    // header: number of columns (time value and force components)
+    int64_t ncols = 1 + mesh->dim;
+    if (forcesFile)
+    {
+        if (std::fwrite(&ncols, sizeof(int64_t), 1, forcesFile) != 1)
+            SETERRQ1(PETSC_COMM_SELF, PETSC_ERR_FILE_WRITE,
+                     "Could not write the header of %s", filepath.c_str());
+        forcesBuffer.reserve(forcesBufferSize * ncols);
+
+        // the ASCII file opened by the parent solver stays empty: remove it
+        // (unless it holds records, e.g., from a previous run)
+        std::string asciipath = outdir + "/forces-" + std::to_string(ite) +
+                                ".txt";
+        FILE *asciiFile = std::fopen(asciipath.c_str(), "r");
+        if (asciiFile)
+        {
+            bool empty = (std::fgetc(asciiFile) == EOF);
+            std::fclose(asciiFile);
+            if (empty)
+                std::remove(asciipath.c_str());
+        }
+    }
+
+    PetscFunctionReturn(0);
+}  // initForcesBinary
+
+PetscErrorCode LietAl2016Solver::flushForcesBinary()
+{
+    PetscFunctionBeginUser;
+
+    // records: time value and force components (float64)
+    if (forcesFile && !forcesBuffer.empty())
+    {
+        std::size_t count = std::fwrite(forcesBuffer.data(), sizeof(double),
+                                        forcesBuffer.size(), forcesFile);
+        if (count != forcesBuffer.size() || std::fflush(forcesFile) != 0)
+            SETERRQ(PETSC_COMM_SELF, PETSC_ERR_FILE_WRITE,
+                    "Could not write the records of the forces file");
+        forcesBuffer.clear();
+    }
+
+    PetscFunctionReturn(0);
+}  // flushForcesBinary
+
+PetscErrorCode LietAl2016Solver::initAsyncOutput(const YAML::Node &node)
+{
+    PetscErrorCode ierr;
+    PetscMPIInt rank;
+
+    PetscFunctionBeginUser;
+
+    // asynchronous output of the snapshots, enabled with the command-line
+    // option `-async_output`; at most `-async_output_depth <n>` snapshots
+    // (default: 2) are held in memory by process 0 at any time
+    ierr = PetscOptionsGetBool(nullptr, nullptr, "-async_output",
+                               &asyncOutput, nullptr); CHKERRQ(ierr);
+    ierr = PetscOptionsGetInt(nullptr, nullptr, "-async_output_depth",
+                              &outputDepth, nullptr); CHKERRQ(ierr);
+    outputDepth = std::max(outputDepth, (PetscInt)1);
+    if (!asyncOutput)
+        PetscFunctionReturn(0);
+
+    // output frequency of the HDF5 probes of the parent solver (written on
+    // the main thread)
+    if (node["probes"])
+        for (const YAML::Node &probe : node["probes"])
+            if (!probe["body"] &&
+                probe["viewer"].as<std::string>("hdf5") == "hdf5")
+                probeIntervals.push_back(probe["n_monitor"].as<PetscInt>(1));
+
+    // only process 0 writes the snapshots
+    ierr = MPI_Comm_rank(comm, &rank); CHKERRQ(ierr);
+    if (rank == 0)
+        snapshotWriter.start(outputDepth);
+
+    PetscFunctionReturn(0);
+}  // initAsyncOutput
+
+PetscErrorCode LietAl2016Solver::initSnapshotStorage(const YAML::Node &node)
+{
+    std::string error;
+
+    PetscFunctionBeginUser;
+
+    // optional block `parameters.output` (e.g., `fields: {p: {dtype:
+    // float32}}`); restart files stay uncompressed float64
+    const YAML::Node output = node["parameters"]["output"];
+    if (!snapshotStorage.parse(output, error))
+        SETERRQ1(comm, PETSC_ERR_ARG_WRONG, "%s", error.c_str());
+    snapshotWriter.setStorage(snapshotStorage);
+
+    PetscFunctionReturn(0);
+}  // initSnapshotStorage
+
+PetscErrorCode LietAl2016Solver::initOutputRegions(const YAML::Node &node)
+{
+    PetscErrorCode ierr;
+    PetscMPIInt rank;
+    const char *names[4] = {"u", "v", "w", "p"};
+
+    PetscFunctionBeginUser;
+
+    // optional list `parameters.output.regions`
+    const YAML::Node output = node["parameters"]["output"];
+    if (!output || !output["regions"] || output["regions"].size() == 0)
+        PetscFunctionReturn(0);
+    const YAML::Node config_regions = output["regions"];
+
+    ierr = MPI_Comm_rank(comm, &rank); CHKERRQ(ierr);
+    std::string outdir = node["output"].as<std::string>(
+        node["directory"].as<std::string>() + "/output");
+    outputRegions.resize(config_regions.size());
+    for (std::size_t r = 0; r < config_regions.size(); ++r)
+    {
+        const YAML::Node &config = config_regions[r];
+        OutputRegion &region = outputRegions[r];
+        region.name = config["name"].as<std::string>();
+        if (!config["box"] || config["box"].size() < (std::size_t)mesh->dim)
+            SETERRQ1(comm, PETSC_ERR_ARG_WRONG,
+                     "Output region %s requires the limits of its box in "
+                     "each direction", region.name.c_str());
+        region.directory = outdir + "/regions/" + region.name;
+        region.nsave = config["nsave"].as<PetscInt>(saveInterval);
+        for (PetscInt d = 0; d < 3; ++d)
+        {
+            const YAML::Node &stride = config["stride"];
+            region.stride[d] = 1;
+            if (stride && stride.IsSequence())
+                region.stride[d] = stride[d].as<PetscInt>(1);
+            else if (stride)
+                region.stride[d] = stride.as<PetscInt>();
+            if (d >= mesh->dim)
+                region.stride[d] = 1;
+            if (region.stride[d] < 1)
+                SETERRQ(comm, PETSC_ERR_ARG_OUTOFRANGE,
+                        "The stride of an output region must be positive");
+        }
+        if (config["fields"])
+            region.fields = config["fields"].as<std::vector<std::string>>();
+        else
+            for (PetscInt f = 0; f < 4; ++f)
+                if (f < mesh->dim || f == 3)
+                    region.fields.push_back(names[f]);
+
+        // indices of the first and number of points inside the box
+        for (const std::string &name : region.fields)
+        {
+            PetscInt f = std::find(names, names + 4, name) - names;
+            if (f == 4 || (f >= mesh->dim && f != 3))
+                SETERRQ1(comm, PETSC_ERR_ARG_WRONG,
+                         "Unknown field %s for an output region",
+                         name.c_str());
+            region.start[name].assign(3, 0);
+            region.count[name].assign(3, 1);
+            for (PetscInt d = 0; d < mesh->dim; ++d)
+            {
+                PetscReal xmin = config["box"][d][0].as<PetscReal>(),
+                          xmax = config["box"][d][1].as<PetscReal>();
+                PetscInt n = mesh->n[f][d], i0 = 0, i1;
+                while (i0 < n && mesh->coord[f][d][i0] < xmin)
+                    i0++;
+                i1 = i0 - 1;
+                while (i1 + 1 < n && mesh->coord[f][d][i1 + 1] <= xmax)
+                    i1++;
+                region.start[name][d] = i0;
+                region.count[name][d] = (i1 >= i0) ?
+                    (i1 - i0) / region.stride[d] + 1 : 0;
+                if (region.count[name][d] == 0)
+                    SETERRQ2(comm, PETSC_ERR_ARG_OUTOFRANGE,
+                             "The box of the output region %s holds no "
+                             "point of the field %s", region.name.c_str(),
+                             name.c_str());
+            }
+        }
+
+        // folder of the region and description of the subsampled grid
+        if (rank == 0)
+        {
+            ierr = PetscMkdir((outdir + "/regions").c_str()); CHKERRQ(ierr);
+            ierr = PetscMkdir(region.directory.c_str()); CHKERRQ(ierr);
+        }
+        FILE *infoFile;
+        std::string filepath = region.directory + "/region.yaml";
+        ierr = PetscFOpen(comm, filepath.c_str(), "w", &infoFile);
+        CHKERRQ(ierr);
+        ierr = PetscFPrintf(comm, infoFile, "name: %s\ndim: %D\n"
+                            "nsave: %D\nstride: [%D, %D, %D]\nfields:\n",
+                            region.name.c_str(), mesh->dim, region.nsave,
+                            region.stride[0], region.stride[1],
+                            region.stride[2]); CHKERRQ(ierr);
+        for (const std::string &name : region.fields)
+        {
+            const std::vector<PetscInt> &i0 = region.start[name],
+                                        &n = region.count[name];
+            ierr = PetscFPrintf(comm, infoFile,
+                                "  %s: {start: [%D, %D, %D], "
+                                "count: [%D, %D, %D]}\n", name.c_str(),
+                                i0[0], i0[1], i0[2], n[0], n[1], n[2]);
+            CHKERRQ(ierr);
+        }
+        ierr = PetscFClose(comm, infoFile); CHKERRQ(ierr);
+    }
+
+    PetscFunctionReturn(0);
+}  // initOutputRegions
+
+PetscErrorCode LietAl2016Solver::writeOutputRegions()
+{
+    PetscErrorCode ierr;
+    PetscMPIInt rank;
+    const char *names[3] = {"u", "v", "w"};
+    std::vector<Vec> unPacked(mesh->dim);
+
+    PetscFunctionBeginUser;
+
+    ierr = MPI_Comm_rank(comm, &rank); CHKERRQ(ierr);
+    for (const OutputRegion &region : outputRegions)
+    {
+        if (ite % region.nsave != 0)
+            continue;
+
+        Snapshot snapshot;
+        std::stringstream ss;
+        ss << region.directory << "/" << std::setfill('0') << std::setw(7)
+           << ite << ".h5";
+        snapshot.filepath = ss.str();
+        snapshot.t = t;
+
+        ierr = DMCompositeGetAccessArray(mesh->UPack, solution->UGlobal,
+                                         mesh->dim, nullptr, unPacked.data());
+        CHKERRQ(ierr);
+        for (PetscInt f = 0; f < mesh->dim; ++f)
+        {
+            ierr = stageRegionField(region, f, unPacked[f], names[f],
+                                    snapshot); CHKERRQ(ierr);
+        }
+        ierr = DMCompositeRestoreAccessArray(mesh->UPack, solution->UGlobal,
+                                             mesh->dim, nullptr,
+                                             unPacked.data()); CHKERRQ(ierr);
+        ierr = stageRegionField(region, 3, solution->pGlobal, "p", snapshot);
+        CHKERRQ(ierr);
+
+        // process 0 writes the region (in the background with
+        // `-async_output`)
+        if (rank == 0)
+        {
+            bool success = asyncOutput ?
+                           snapshotWriter.push(std::move(snapshot)) :
+                           snapshotWriter.write(snapshot);
+            if (!success)
+                SETERRQ1(PETSC_COMM_SELF, PETSC_ERR_FILE_WRITE,
+                         "Could not write the output region %s",
+                         region.name.c_str());
+        }
+    }
+
+    PetscFunctionReturn(0);
+}  // writeOutputRegions
+
+PetscErrorCode LietAl2016Solver::stageRegionField(const OutputRegion &region,
+                                                  const PetscInt &f,
+                                                  const Vec &vec,
+                                                  const std::string &name,
+                                                  Snapshot &snapshot)
+{
+    PetscErrorCode ierr;
+    PetscInt xs[3], xm[3], first[3], n[3];
+    const PetscReal *arr;
+
+    PetscFunctionBeginUser;
+
+    if (std::find(region.fields.begin(), region.fields.end(), name) ==
+        region.fields.end())
+        PetscFunctionReturn(0);
+
+    // local points of the subsampled box
+    ierr = DMDAGetCorners(mesh->da[f], &xs[0], &xs[1], &xs[2],
+                          &xm[0], &xm[1], &xm[2]); CHKERRQ(ierr);
+    const std::vector<PetscInt> &i0 = region.start.at(name),
+                                &count = region.count.at(name);
+    for (PetscInt d = 0; d < 3; ++d)
+    {
+        PetscInt s = region.stride[d];
+        // first subsampled index owned, and number of subsampled indices
+        first[d] = std::max((xs[d] - i0[d] + s - 1) / s, (PetscInt)0);
+        PetscInt last = std::min((xs[d] + xm[d] - 1 - i0[d]) / s,
+                                 count[d] - 1);
+        if (xs[d] + xm[d] - 1 < i0[d])
+            last = -1;
+        n[d] = std::max(last - first[d] + 1, (PetscInt)0);
+    }
+    // processes without points in the box send an empty block
+    if (n[0] * n[1] * n[2] == 0)
+        n[0] = n[1] = n[2] = 0;
+
+    // copy the subsampled values (x varies fastest)
+    std::vector<PetscReal> values(n[0] * n[1] * n[2]);
+    ierr = VecGetArrayRead(vec, &arr); CHKERRQ(ierr);
+    PetscInt m = 0;
+    for (PetscInt k = 0; k < n[2]; ++k)
+    {
+        PetscInt kk = i0[2] + (first[2] + k) * region.stride[2] - xs[2];
+        for (PetscInt j = 0; j < n[1]; ++j)
+        {
+            PetscInt jj = i0[1] + (first[1] + j) * region.stride[1] - xs[1];
+            for (PetscInt i = 0; i < n[0]; ++i, ++m)
+            {
+                PetscInt ii = i0[0] + (first[0] + i) * region.stride[0] -
+                              xs[0];
+                values[m] = arr[(kk * xm[1] + jj) * xm[0] + ii];
+            }
+        }
+    }
+    ierr = VecRestoreArrayRead(vec, &arr); CHKERRQ(ierr);
+
+    PetscInt corners[6] = {first[0], first[1], first[2], n[0], n[1], n[2]};
+    ierr = gatherField(name, count.data(), corners, values, snapshot);
+    CHKERRQ(ierr);
+
+    PetscFunctionReturn(0);
+}  // stageRegionField
+
+PetscErrorCode LietAl2016Solver::initAttachedProbes(const YAML::Node &node)
+{
+    PetscErrorCode ierr;
+    PetscMPIInt rank;
+    const char *names[4] = {"u", "v", "w", "p"};
+    const char *dirs[3] = {"x", "y", "z"};
+
+    PetscFunctionBeginUser;
+
+    if (!node["probes"])
+        PetscFunctionReturn(0);
+
+    ierr = MPI_Comm_rank(comm, &rank); CHKERRQ(ierr);
+    std::string outdir = node["output"].as<std::string>(
+        node["directory"].as<std::string>() + "/output");
+    bool restart = node["parameters"]["startStep"].as<PetscInt>(0) > 0;
+    const YAML::Node &config_bodies = node["bodies"];
+    for (const YAML::Node &config : node["probes"])
+    {
+        if (!config["body"])
+            continue;
+        AttachedProbe probe;
+        probe.name = config["name"].as<std::string>();
+        if (config["type"].as<std::string>("VOLUME") != "VOLUME" ||
+            config["viewer"].as<std::string>("hdf5") != "hdf5")
+            SETERRQ1(comm, PETSC_ERR_ARG_WRONG,
+                     "Probe %s: only HDF5 volume probes can be attached "
+                     "to a body", probe.name.c_str());
+        probe.field = config["field"].as<std::string>();
+        probe.f = std::find(names, names + 4, probe.field) - names;
+        if (probe.f == 4 || (probe.f >= mesh->dim && probe.f != 3))
+            SETERRQ2(comm, PETSC_ERR_ARG_WRONG,
+                     "Probe %s: unknown field %s", probe.name.c_str(),
+                     probe.field.c_str());
+        // body given by its name or its index
+        probe.body = config["body"].as<PetscInt>(-1);
+        for (std::size_t i = 0; i < config_bodies.size(); ++i)
+            if (config_bodies[i]["name"].as<std::string>("") ==
+                config["body"].as<std::string>())
+                probe.body = i;
+        if (probe.body < 0 || probe.body >= bodies->nBodies)
+            SETERRQ1(comm, PETSC_ERR_ARG_WRONG,
+                     "Probe %s: unknown body", probe.name.c_str());
+        probe.nMonitor = config["n_monitor"].as<PetscInt>(1);
+        probe.tStart = config["t_start"].as<PetscReal>(PETSC_MIN_REAL);
+        probe.tEnd = config["t_end"].as<PetscReal>(PETSC_MAX_REAL);
+        probe.filepath = outdir + "/" +
+                         config["path"].as<std::string>(probe.name + ".h5");
+
+        // number of points of the window, either given (`count`) or set
+        // from the smallest grid spacing so that the window covers the box
+        // wherever the body goes
+        if (!config["box"])
+            SETERRQ1(comm, PETSC_ERR_ARG_WRONG,
+                     "Probe %s requires a box", probe.name.c_str());
+        const YAML::Node config_count = config["count"];
+        if (config_count && config_count.size() < (std::size_t)mesh->dim)
+            SETERRQ1(comm, PETSC_ERR_ARG_WRONG,
+                     "Probe %s: count requires a number of points in each "
+                     "direction", probe.name.c_str());
+        for (PetscInt d = 0; d < 3; ++d)
+        {
+            probe.offset[d][0] = probe.offset[d][1] = 0.0;
+            probe.count[d] = 1;
+            if (d >= mesh->dim)
+                continue;
+            probe.offset[d][0] = config["box"][dirs[d]][0].as<PetscReal>();
+            probe.offset[d][1] = config["box"][dirs[d]][1].as<PetscReal>();
+            if (probe.offset[d][1] < probe.offset[d][0])
+                SETERRQ1(comm, PETSC_ERR_ARG_OUTOFRANGE,
+                         "Probe %s: the box has a negative extent",
+                         probe.name.c_str());
+            const PetscReal *x = mesh->coord[probe.f][d];
+            PetscInt n = mesh->n[probe.f][d];
+            if (config_count)
+                probe.count[d] = config_count[d].as<PetscInt>();
+            else if (n > 1)
+            {
+                PetscReal h = PETSC_MAX_REAL;
+                for (PetscInt i = 0; i < n - 1; ++i)
+                    h = std::min(h, x[i + 1] - x[i]);
+                probe.count[d] = (PetscInt)std::ceil(
+                    (probe.offset[d][1] - probe.offset[d][0]) / h) + 1;
+            }
+            probe.count[d] = std::min(std::max(probe.count[d], (PetscInt)1),
+                                      n);
+        }
+
+        // create the file (or append to it when restarting)
+        if (rank == 0)
+        {
+            PetscBool exists;
+            ierr = PetscTestFile(probe.filepath.c_str(), 'r', &exists);
+            CHKERRQ(ierr);
+            HDF5Lock lock;
+            hid_t file = (restart && exists) ?
+                H5Fopen(probe.filepath.c_str(), H5F_ACC_RDWR, H5P_DEFAULT) :
+                H5Fcreate(probe.filepath.c_str(), H5F_ACC_TRUNC,
+                          H5P_DEFAULT, H5P_DEFAULT);
+            if (file < 0)
+                SETERRQ1(PETSC_COMM_SELF, PETSC_ERR_FILE_OPEN,
+                         "Could not open the file %s",
+                         probe.filepath.c_str());
+            if (H5Lexists(file, probe.field.c_str(), H5P_DEFAULT) <= 0)
+            {
+                hid_t group = H5Gcreate2(file, probe.field.c_str(),
+                                         H5P_DEFAULT, H5P_DEFAULT,
+                                         H5P_DEFAULT);
+                H5Gclose(group);
+            }
+            H5Fclose(file);
+        }
+        attachedProbes.push_back(probe);
+    }
+
+    PetscFunctionReturn(0);
+}  // initAttachedProbes
+
+PetscErrorCode LietAl2016Solver::getBodyCenter(const PetscInt &i,
+                                               PetscReal center[3])
+{
+    PetscErrorCode ierr;
+    PetscReal sum[3] = {0.0, 0.0, 0.0};
+
+    PetscFunctionBeginUser;
+
+    // centroid of the Lagrangian points (locally owned coordinates)
+    petibm::type::SingleBody &body = bodies->bodies[i];
+    for (PetscInt k = body->bgPt; k < body->edPt; ++k)
+        for (PetscInt d = 0; d < body->dim; ++d)
+            sum[d] += body->coords[k][d];
+    ierr = MPI_Allreduce(sum, center, 3, MPIU_REAL, MPI_SUM, comm);
+    CHKERRQ(ierr);
+    for (PetscInt d = 0; d < 3; ++d)
+        center[d] /= body->nPts;
+
+    PetscFunctionReturn(0);
+}  // getBodyCenter
+
+PetscErrorCode LietAl2016Solver::writeAttachedProbes()
+{
+    PetscErrorCode ierr;
+    PetscMPIInt rank;
+    PetscInt start[3], xs[3], xm[3], lo[3], hi[3];
+    PetscReal center[3];
+    const PetscReal *arr;
+    Vec vec;
+
+    PetscFunctionBeginUser;
+
+    ierr = MPI_Comm_rank(comm, &rank); CHKERRQ(ierr);
+    for (const AttachedProbe &probe : attachedProbes)
+    {
+        if (ite % probe.nMonitor != 0 || t < probe.tStart || t > probe.tEnd)
+            continue;
+
+        // first point of the window, from the current center of the body
+        ierr = getBodyCenter(probe.body, center); CHKERRQ(ierr);
+        for (PetscInt d = 0; d < 3; ++d)
+        {
+            start[d] = 0;
+            if (d >= mesh->dim)
+                continue;
+            const PetscReal *x = mesh->coord[probe.f][d];
+            PetscInt n = mesh->n[probe.f][d];
+            start[d] = std::lower_bound(
+                x, x + n, center[d] + probe.offset[d][0]) - x;
+            start[d] = std::max(std::min(start[d], n - probe.count[d]),
+                                (PetscInt)0);
+        }
+
+        // copy the values of the window owned by the process
+        if (probe.f == 3)
+            vec = solution->pGlobal;
+        else
+        {
+            ierr = DMCompositeGetAccessArray(mesh->UPack, solution->UGlobal,
+                                             1, &probe.f, &vec);
+            CHKERRQ(ierr);
+        }
+        ierr = DMDAGetCorners(mesh->da[probe.f], &xs[0], &xs[1], &xs[2],
+                              &xm[0], &xm[1], &xm[2]); CHKERRQ(ierr);
+        for (PetscInt d = 0; d < 3; ++d)
+        {
+            lo[d] = std::max(xs[d], start[d]);
+            hi[d] = std::min(xs[d] + xm[d], start[d] + probe.count[d]);
+        }
+        const PetscInt *n = probe.count;
+        std::vector<PetscReal> values(n[0] * n[1] * n[2], 0.0);
+        ierr = VecGetArrayRead(vec, &arr); CHKERRQ(ierr);
+        for (PetscInt k = lo[2]; k < hi[2]; ++k)
+            for (PetscInt j = lo[1]; j < hi[1]; ++j)
+                for (PetscInt i = lo[0]; i < hi[0]; ++i)
+                    values[((k - start[2]) * n[1] + j - start[1]) * n[0] +
+                           i - start[0]] =
+                        arr[((k - xs[2]) * xm[1] + j - xs[1]) * xm[0] +
+                            i - xs[0]];
+        ierr = VecRestoreArrayRead(vec, &arr); CHKERRQ(ierr);
+        if (probe.f != 3)
+        {
+            ierr = DMCompositeRestoreAccessArray(mesh->UPack,
+                                                 solution->UGlobal, 1,
+                                                 &probe.f, &vec);
+            CHKERRQ(ierr);
+        }
+
+        // the window is small: sum the contributions on process 0
+        ierr = MPI_Reduce((rank == 0) ? MPI_IN_PLACE : values.data(),
+                          values.data(), values.size(), MPIU_REAL, MPI_SUM,
+                          0, comm); CHKERRQ(ierr);
+        if (rank == 0 && !writeProbeRecordHDF5(probe, values, start, center))
+            SETERRQ1(PETSC_COMM_SELF, PETSC_ERR_FILE_WRITE,
+                     "Could not write the probe %s", probe.name.c_str());
+    }
+
+    PetscFunctionReturn(0);
+}  // writeAttachedProbes
+
+bool LietAl2016Solver::writeProbeRecordHDF5(
+    const AttachedProbe &probe, const std::vector<PetscReal> &values,
+    const PetscInt start[3], const PetscReal center[3]) const
+{
+    const char *dirs[3] = {"x", "y", "z"};
+    hsize_t dims[3];
+
+    // the snapshot writer may use the HDF5 library at the same time
+    HDF5Lock lock;
+    hid_t file = H5Fopen(probe.filepath.c_str(), H5F_ACC_RDWR, H5P_DEFAULT);
+    if (file < 0)
+        return false;
+
+    // one dataset per record, named after the time value (full precision,
+    // so that records of small time steps do not collide)
+    std::stringstream ss;
+    ss << probe.field << "/"
+       << std::setprecision(std::numeric_limits<PetscReal>::max_digits10)
+       << t;
+    std::string name = ss.str();
+    if (H5Lexists(file, name.c_str(), H5P_DEFAULT) > 0)
+        H5Ldelete(file, name.c_str(), H5P_DEFAULT);
+    for (PetscInt d = 0; d < mesh->dim; ++d)
+        dims[d] = probe.count[mesh->dim - 1 - d];
+    hid_t space = H5Screate_simple(mesh->dim, dims, nullptr);
+    hid_t dset = H5Dcreate2(file, name.c_str(), H5T_NATIVE_DOUBLE, space,
+                            H5P_DEFAULT, H5P_DEFAULT, H5P_DEFAULT);
+    bool success = (dset >= 0 &&
+                    H5Dwrite(dset, H5T_NATIVE_DOUBLE, H5S_ALL, H5S_ALL,
+                             H5P_DEFAULT, values.data()) >= 0);
+
+    // gridlines of the window and center of the body, as attributes
+    auto writeAttribute = [dset](const char *key, const PetscReal *data,
+                                 hsize_t size)
+    {
+        hid_t aspace = H5Screate_simple(1, &size, nullptr);
+        hid_t attr = H5Acreate2(dset, key, H5T_NATIVE_DOUBLE, aspace,
+                                H5P_DEFAULT, H5P_DEFAULT);
+        bool written = (attr >= 0 &&
+                        H5Awrite(attr, H5T_NATIVE_DOUBLE, data) >= 0);
+        if (attr >= 0)
+            H5Aclose(attr);
+        H5Sclose(aspace);
+        return written;
+    };
+    for (PetscInt d = 0; success && d < mesh->dim; ++d)
+        success = writeAttribute(dirs[d], mesh->coord[probe.f][d] + start[d],
+                                 probe.count[d]);
+    if (success)
+        success = writeAttribute("center", center, mesh->dim);
+
+    if (dset >= 0)
+        H5Dclose(dset);
+    H5Sclose(space);
+    H5Fclose(file);
+    return success;
+}  // writeProbeRecordHDF5
+
+PetscErrorCode LietAl2016Solver::writeSolutionHDF5(const std::string &filePath)
+{
+    PetscErrorCode ierr;
+    PetscMPIInt rank;
+    const char *names[3] = {"u", "v", "w"};
+    std::vector<Vec> unPacked(mesh->dim);
+    Snapshot snapshot;
+
+    PetscFunctionBeginUser;
+
+    ierr = MPI_Comm_rank(comm, &rank); CHKERRQ(ierr);
+
+    // PETSc writes the restart files (uncompressed, in parallel) and the
+    // other snapshots when there is nothing to apply
+    bool restart = (restartInterval > 0 && ite % restartInterval == 0);
+    if (restart || (!asyncOutput && !snapshotStorage.enabled()))
+    {
+        if (asyncOutput && !snapshotWriter.flush())
+            SETERRQ(PETSC_COMM_SELF, PETSC_ERR_FILE_WRITE,
+                    "Could not write a snapshot");
+        ierr = RigidKinematicsSolver::writeSolutionHDF5(filePath);
+        CHKERRQ(ierr);
+        PetscFunctionReturn(0);
+    }
+
+    // gather a copy of the velocity and pressure fields on process 0, which
+    // creates the datasets with the storage options (in the background with
+    // `-async_output`)
+    snapshot.filepath = filePath;
+    snapshot.t = t;
+    ierr = DMCompositeGetAccessArray(mesh->UPack, solution->UGlobal,
+                                     mesh->dim, nullptr, unPacked.data());
+    CHKERRQ(ierr);
+    for (PetscInt f = 0; f < mesh->dim; ++f)
+    {
+        ierr = stageField(mesh->da[f], unPacked[f], names[f], snapshot);
+        CHKERRQ(ierr);
+    }
+    ierr = DMCompositeRestoreAccessArray(mesh->UPack, solution->UGlobal,
+                                         mesh->dim, nullptr, unPacked.data());
+    CHKERRQ(ierr);
+    ierr = stageField(mesh->da[3], solution->pGlobal, "p", snapshot);
+    CHKERRQ(ierr);
+
+    if (rank == 0)
+    {
+        // blocks only if the queue is full
+        bool success = asyncOutput ? snapshotWriter.push(std::move(snapshot))
+                                   : snapshotWriter.write(snapshot);
+        if (!success)
+            SETERRQ1(PETSC_COMM_SELF, PETSC_ERR_FILE_WRITE,
+                     "Could not write the snapshot %s", filePath.c_str());
+    }
+
+    PetscFunctionReturn(0);
+}  // writeSolutionHDF5
+
+PetscErrorCode LietAl2016Solver::stageField(const DM &da, const Vec &vec,
+                                            const std::string &name,
+                                            Snapshot &snapshot)
+{
+    PetscErrorCode ierr;
+    PetscInt dims[3], corners[6], n;
+    const PetscReal *arr;
+
+    PetscFunctionBeginUser;
+
+    ierr = DMDAGetInfo(da, nullptr, &dims[0], &dims[1], &dims[2], nullptr,
+                       nullptr, nullptr, nullptr, nullptr, nullptr, nullptr,
+                       nullptr, nullptr); CHKERRQ(ierr);
+    ierr = DMDAGetCorners(da, &corners[0], &corners[1], &corners[2],
+                          &corners[3], &corners[4], &corners[5]);
+    CHKERRQ(ierr);
+
+    // local block of a DMDA vector, in natural order (x varies fastest)
+    ierr = VecGetLocalSize(vec, &n); CHKERRQ(ierr);
+    ierr = VecGetArrayRead(vec, &arr); CHKERRQ(ierr);
+    std::vector<PetscReal> values(arr, arr + n);
+    ierr = VecRestoreArrayRead(vec, &arr); CHKERRQ(ierr);
+
+    ierr = gatherField(name, dims, corners, values, snapshot); CHKERRQ(ierr);
+
+    PetscFunctionReturn(0);
+}  // stageField
+
+PetscErrorCode LietAl2016Solver::gatherField(
+    const std::string &name, const PetscInt dims[3], const PetscInt corners[6],
+    const std::vector<PetscReal> &values, Snapshot &snapshot)
+{
+    PetscErrorCode ierr;
+    PetscMPIInt size, rank;
+    PetscMPIInt count = values.size();
+    std::vector<PetscMPIInt> counts, displs;
+    std::vector<PetscInt> allCorners;
+    std::vector<PetscReal> received;
+
+    PetscFunctionBeginUser;
+
+    ierr = MPI_Comm_size(comm, &size); CHKERRQ(ierr);
+    ierr = MPI_Comm_rank(comm, &rank); CHKERRQ(ierr);
+
+    // local blocks (corners and values) of all processes on process 0
+    if (rank == 0)
+    {
+        counts.resize(size);
+        displs.assign(size, 0);
+        allCorners.resize(6 * size);
+    }
+    ierr = MPI_Gather(&count, 1, MPI_INT, counts.data(), 1, MPI_INT, 0,
+                      comm); CHKERRQ(ierr);
+    ierr = MPI_Gather(corners, 6, MPIU_INT, allCorners.data(), 6, MPIU_INT,
+                      0, comm); CHKERRQ(ierr);
+    if (rank == 0)
+    {
+        PetscInt64 total = 0;
+        for (PetscMPIInt r = 0; r < size; ++r)
+        {
+            displs[r] = total;
+            total += counts[r];
+        }
+        if (total > std::numeric_limits<PetscMPIInt>::max())
+            SETERRQ1(PETSC_COMM_SELF, PETSC_ERR_SUP,
+                     "The field %s is too large to be gathered on process 0",
+                     name.c_str());
+        received.resize(total);
+    }
+    ierr = MPI_Gatherv(values.data(), count, MPIU_REAL, received.data(),
+                       counts.data(), displs.data(), MPIU_REAL, 0, comm);
+    CHKERRQ(ierr);
+    if (rank != 0)
+        PetscFunctionReturn(0);
+
+    // global array with shape (z, y, x) in 3D, (y, x) in 2D
+    SnapshotField field;
+    field.name = name;
+    for (PetscInt d = mesh->dim - 1; d >= 0; --d)
+        field.dims.push_back(dims[d]);
+    field.values.resize(dims[0] * dims[1] * dims[2]);
+    for (PetscMPIInt r = 0; r < size; ++r)
+    {
+        const PetscInt *c = &allCorners[6 * r];
+        const PetscReal *block = received.data() + displs[r];
+        for (PetscInt k = 0; k < c[5]; ++k)
+            for (PetscInt j = 0; j < c[4]; ++j)
+                std::copy(block + (k * c[4] + j) * c[3],
+                          block + (k * c[4] + j + 1) * c[3],
+                          &field.values[((c[2] + k) * dims[1] + c[1] + j) *
+                                        dims[0] + c[0]]);
+    }
+    snapshot.fields.push_back(std::move(field));
+
+    PetscFunctionReturn(0);
+}  // gatherField
+
+PetscErrorCode LietAl2016Solver::createWorkVectors()
+{
+    PetscErrorCode ierr;
+
+    PetscFunctionBeginUser;
+
+    if (scheme == 4)
+    {
+        ierr = VecDuplicate(solution->UGlobal, &uTilde); CHKERRQ(ierr);
+    }
+    ierr = VecDuplicate(solution->UGlobal, &fEuler); CHKERRQ(ierr);
+
+    PetscFunctionReturn(0);
+}  // createWorkVectors
+
+PetscErrorCode LietAl2016Solver::destroy()
+{
+    PetscErrorCode ierr;
+
+    PetscFunctionBeginUser;
+
+    ierr = VecDestroy(&uTilde); CHKERRQ(ierr);
+    ierr = VecDestroy(&fEuler); CHKERRQ(ierr);
+
+    if (timing)
+    {
+        ierr = PetscFClose(comm, timingFile); CHKERRQ(ierr);
+        timingFile = nullptr;
+        timing = PETSC_FALSE;
+    }
+
+    if (loadBalance)
+    {
+        ierr = PetscFClose(comm, loadBalanceFile); CHKERRQ(ierr);
+        loadBalanceFile = nullptr;
+        loadBalance = PETSC_FALSE;
+    }
+
+    // write the snapshots (and output regions) still in the queue
+    if (!snapshotWriter.stop())
+        SETERRQ(PETSC_COMM_SELF, PETSC_ERR_FILE_WRITE,
+                "Could not write a snapshot");
+    asyncOutput = PETSC_FALSE;
+    outputRegions.clear();
+    attachedProbes.clear();
+
+    if (forcesBinary)
+    {
+        ierr = flushForcesBinary(); CHKERRQ(ierr);
+        ierr = PetscFClose(comm, forcesFile); CHKERRQ(ierr);
+        forcesFile = nullptr;
+        forcesBinary = PETSC_FALSE;
+    }
+
+    ierr = RigidKinematicsSolver::destroy(); CHKERRQ(ierr);
+
+    PetscFunctionReturn(0);
+}  // destroy
+
 PetscErrorCode LietAl2016Solver::advance()
 {
     PetscErrorCode ierr;
 
     PetscFunctionBeginUser;
+
+    if (timing)
+    {
+        subStepTimes.assign(NSUBSTEPS, 0.0);
+        ierr = PetscTime(&stepTic); CHKERRQ(ierr);
+    }
     
     t += dt;
     ite++;
 
+    // the parent solver re-assembles the interpolation and spreading
+    // operators (E and H) of the moved bodies
     if (move)
     {
+        ierr = beginSubStep(MOVE); CHKERRQ(ierr);
         ierr = moveBodies(t); CHKERRQ(ierr);
+        ierr = endSubStep(MOVE); CHKERRQ(ierr);
     }
 
+    ierr = PetscLogStagePush(stageScheme); CHKERRQ(ierr);
+    ierr = beginSubStep(SCHEME); CHKERRQ(ierr);
     switch (scheme)
     {
         case 1:
@@ -93,7 +1266,10 @@ PetscErrorCode LietAl2016Solver::advance()
                     "Unknown value for the scheme. "
                     "Accepted values are 1, 2, 3, and 4");
     }
+    ierr = endSubStep(SCHEME); CHKERRQ(ierr);
+    ierr = PetscLogStagePop(); CHKERRQ(ierr);  // end of stageScheme
 
+    ierr = PetscLogStagePush(stageAlgorithm); CHKERRQ(ierr);
     switch (algo)
     {
         case 1:
@@ -110,9 +1286,20 @@ PetscErrorCode LietAl2016Solver::advance()
                     "Unknown value for the algorithm. "
                     "Accepted values are 1, 2, and 3");
     }
+    ierr = PetscLogStagePop(); CHKERRQ(ierr);  // end of stageAlgorithm
 
     ierr = bc->updateGhostValues(solution); CHKERRQ(ierr);
 
+    if (timing)
+    {
+        ierr = writeTimingTrace(); CHKERRQ(ierr);
+    }
+
+    if (loadBalance && ite % loadBalanceInterval == 0)
+    {
+        ierr = writeLoadBalance(); CHKERRQ(ierr);
+    }
+
     PetscFunctionReturn(0);
 }  // advance
 
@@ -161,21 +1348,19 @@ PetscErrorCode LietAl2016Solver::scheme4()
     // solve EBNH f = -E \tilde{u}
     // where \tilde{u} is the solution from an explicit time advancement
     // without momentum forcing
-    Vec uTilde;
-    ierr = VecDuplicate(solution->UGlobal, &uTilde); CHKERRQ(ierr);
+    ierr = PetscLogEventBegin(eventPredictor, 0, 0, 0, 0); CHKERRQ(ierr);
     ierr = MatMult(G, solution->pGlobal, rhs1); CHKERRQ(ierr);
     ierr = VecScale(rhs1, -1.0); CHKERRQ(ierr);
     ierr = VecAXPY(rhs1, convCoeffs->explicitCoeffs[0], conv[0]); CHKERRQ(ierr);
     ierr = VecAXPY(rhs1, diffCoeffs->explicitCoeffs[0], diff[0]); CHKERRQ(ierr);
     ierr = VecWAXPY(uTilde, dt, rhs1, solution->UGlobal); CHKERRQ(ierr);
+    ierr = PetscLogEventEnd(eventPredictor, 0, 0, 0, 0); CHKERRQ(ierr);
 
     ierr = MatMult(E, uTilde, rhsf); CHKERRQ(ierr);
     ierr = VecScale(rhsf, -1.0); CHKERRQ(ierr);
     ierr = VecAYPX(rhsf, 1.0, UB); CHKERRQ(ierr);
     ierr = fSolver->solve(f, rhsf); CHKERRQ(ierr);
 
-    ierr = VecDestroy(&uTilde); CHKERRQ(ierr);
-
     PetscFunctionReturn(0);
 }  // scheme4
 
@@ -185,19 +1370,33 @@ PetscErrorCode LietAl2016Solver::algorithm1()
     
     PetscFunctionBeginUser;
 
+    ierr = beginSubStep(VELOCITY); CHKERRQ(ierr);
     ierr = assembleRHSVelocity(); CHKERRQ(ierr);
     ierr = solveVelocity(); CHKERRQ(ierr);
+    ierr = endSubStep(VELOCITY); CHKERRQ(ierr);
     
+    ierr = beginSubStep(FORCES); CHKERRQ(ierr);
     ierr = assembleRHSForces(); CHKERRQ(ierr);
     ierr = solveForces(); CHKERRQ(ierr);
+    ierr = endSubStep(FORCES); CHKERRQ(ierr);
+
+    ierr = beginSubStep(NOSLIP); CHKERRQ(ierr);
     ierr = applyNoSlip(); CHKERRQ(ierr);
+    ierr = endSubStep(NOSLIP); CHKERRQ(ierr);
 
+    ierr = beginSubStep(POISSON); CHKERRQ(ierr);
     ierr = assembleRHSPoisson(); CHKERRQ(ierr);
     ierr = solvePoisson(); CHKERRQ(ierr);
+    ierr = endSubStep(POISSON); CHKERRQ(ierr);
+
+    ierr = beginSubStep(PROJECTION); CHKERRQ(ierr);
     ierr = applyDivergenceFreeVelocity(); CHKERRQ(ierr);
+    ierr = endSubStep(PROJECTION); CHKERRQ(ierr);
 
+    ierr = beginSubStep(UPDATE); CHKERRQ(ierr);
     ierr = updatePressure(); CHKERRQ(ierr);
     ierr = updateForces(); CHKERRQ(ierr);
+    ierr = endSubStep(UPDATE); CHKERRQ(ierr);
 
     PetscFunctionReturn(0);
 }  // algorithm1
@@ -209,22 +1408,35 @@ PetscErrorCode LietAl2016Solver::algorithm2()
     
     PetscFunctionBeginUser;
 
+    ierr = beginSubStep(VELOCITY); CHKERRQ(ierr);
     ierr = assembleRHSVelocity(); CHKERRQ(ierr);
     ierr = solveVelocity(); CHKERRQ(ierr);
+    ierr = endSubStep(VELOCITY); CHKERRQ(ierr);
     
+    ierr = beginSubStep(FORCES); CHKERRQ(ierr);
     ierr = assembleRHSForces(); CHKERRQ(ierr);
     ierr = solveForces(); CHKERRQ(ierr);
+    ierr = endSubStep(FORCES); CHKERRQ(ierr);
 
+    ierr = beginSubStep(NOSLIP); CHKERRQ(ierr);
     // enforce no-slip condition by solving another system for the velocity
     ierr = MatMultAdd(H, df, rhs1, rhs1); CHKERRQ(ierr);
     ierr = vSolver->solve(solution->UGlobal, rhs1); CHKERRQ(ierr);
+    ierr = endSubStep(NOSLIP); CHKERRQ(ierr);
 
+    ierr = beginSubStep(POISSON); CHKERRQ(ierr);
     ierr = assembleRHSPoisson(); CHKERRQ(ierr);
     ierr = solvePoisson(); CHKERRQ(ierr);
+    ierr = endSubStep(POISSON); CHKERRQ(ierr);
+
+    ierr = beginSubStep(PROJECTION); CHKERRQ(ierr);
     ierr = applyDivergenceFreeVelocity(); CHKERRQ(ierr);
+    ierr = endSubStep(PROJECTION); CHKERRQ(ierr);
 
+    ierr = beginSubStep(UPDATE); CHKERRQ(ierr);
     ierr = updatePressure(); CHKERRQ(ierr);
     ierr = updateForces(); CHKERRQ(ierr);
+    ierr = endSubStep(UPDATE); CHKERRQ(ierr);
 
     PetscFunctionReturn(0);
 }  // algorithm2
@@ -235,50 +1447,87 @@ PetscErrorCode LietAl2016Solver::algorithm3()
     
     PetscFunctionBeginUser;
 
+    ierr = beginSubStep(VELOCITY); CHKERRQ(ierr);
     ierr = assembleRHSVelocity(); CHKERRQ(ierr);
     ierr = solveVelocity(); CHKERRQ(ierr);
+    ierr = endSubStep(VELOCITY); CHKERRQ(ierr);
 
+    ierr = beginSubStep(POISSON); CHKERRQ(ierr);
     ierr = assembleRHSPoisson(); CHKERRQ(ierr);
     ierr = solvePoisson(); CHKERRQ(ierr);
+    ierr = endSubStep(POISSON); CHKERRQ(ierr);
+
+    ierr = beginSubStep(PROJECTION); CHKERRQ(ierr);
     ierr = applyDivergenceFreeVelocity(); CHKERRQ(ierr);
+    ierr = endSubStep(PROJECTION); CHKERRQ(ierr);
 
+    ierr = beginSubStep(FORCES); CHKERRQ(ierr);
     ierr = assembleRHSForces(); CHKERRQ(ierr);
     ierr = solveForces(); CHKERRQ(ierr);
+    ierr = endSubStep(FORCES); CHKERRQ(ierr);
+
+    ierr = beginSubStep(NOSLIP); CHKERRQ(ierr);
     ierr = applyNoSlip(); CHKERRQ(ierr);
+    ierr = endSubStep(NOSLIP); CHKERRQ(ierr);
 
+    ierr = beginSubStep(UPDATE); CHKERRQ(ierr);
     ierr = updatePressure(); CHKERRQ(ierr);
     ierr = updateForces(); CHKERRQ(ierr);
+    ierr = endSubStep(UPDATE); CHKERRQ(ierr);
 
     PetscFunctionReturn(0);
 }  // algorithm3
 
-PetscErrorCode LietAl2016Solver::writeForcesASCII()
+PetscErrorCode LietAl2016Solver::integrateForces(
+    petibm::type::RealVec1D &fAvg)
 {
     PetscErrorCode ierr;
-    petibm::type::RealVec1D fAvg(3, 0.0);
-    Vec fEuler;
-    std::vector<Vec> fEulerUnpacked(mesh->dim);
+    std::vector<Vec> unPacked(mesh->dim);
 
     PetscFunctionBeginUser;
 
-    ierr = PetscLogStagePush(stageIntegrateForces); CHKERRQ(ierr);
+    ierr = PetscLogEventBegin(eventIntegrateForces, 0, 0, 0, 0); CHKERRQ(ierr);
 
-    ierr = VecDuplicate(solution->UGlobal, &fEuler); CHKERRQ(ierr);
+    // spread the Lagrangian forces onto the Eulerian grid
+    // and sum each component
+    fAvg.assign(3, 0.0);
     ierr = MatMult(H, f, fEuler); CHKERRQ(ierr);
-
-    ierr = DMCompositeGetAccessArray(mesh->UPack, fEuler, mesh->dim, nullptr,
-                                     fEulerUnpacked.data()); CHKERRQ(ierr);
+    ierr = DMCompositeGetAccessArray(mesh->UPack, fEuler, mesh->dim,
+                                     nullptr, unPacked.data()); CHKERRQ(ierr);
     for (PetscInt d = 0; d < mesh->dim; ++d)
     {
-        ierr = VecSum(fEulerUnpacked[d], &fAvg[d]); CHKERRQ(ierr);
+        ierr = VecSum(unPacked[d], &fAvg[d]); CHKERRQ(ierr);
         fAvg[d] *= -dV;
     }
-    ierr = DMCompositeRestoreAccessArray(mesh->UPack, fEuler, mesh->dim, nullptr,
-                                         fEulerUnpacked.data()); CHKERRQ(ierr);
-    ierr = VecDestroy(&fEuler); CHKERRQ(ierr);
+    ierr = DMCompositeRestoreAccessArray(mesh->UPack, fEuler, mesh->dim,
+                                         nullptr, unPacked.data());
+    CHKERRQ(ierr);
+
+    ierr = PetscLogEventEnd(eventIntegrateForces, 0, 0, 0, 0); CHKERRQ(ierr);
+
+    PetscFunctionReturn(0);
+}  // integrateForces
+
+PetscErrorCode LietAl2016Solver::writeForcesASCII()
+{
+    PetscErrorCode ierr;
+    petibm::type::RealVec1D fAvg(3, 0.0);
+
+    PetscFunctionBeginUser;
+
+    ierr = PetscLogStagePush(stageIntegrateForces); CHKERRQ(ierr);
+
+    ierr = integrateForces(fAvg); CHKERRQ(ierr);
 
     ierr = PetscLogStagePop(); CHKERRQ(ierr);  // end of stageIntegrateForces
 
+    // the parent solver only calls this function: the format is picked here
+    if (forcesBinary)
+    {
+        ierr = writeForcesBinary(fAvg); CHKERRQ(ierr);
+        PetscFunctionReturn(0);
+    }
+
     ierr = PetscLogStagePush(stageWrite); CHKERRQ(ierr);
 
     // write the time value
@@ -296,3 +1545,32 @@ PetscErrorCode LietAl2016Solver::writeForcesASCII()
 
     PetscFunctionReturn(0);
 }  // writeForcesASCII
+
+PetscErrorCode LietAl2016Solver::writeForcesBinary(
+    const petibm::type::RealVec1D &fAvg)
+{
+    PetscErrorCode ierr;
+
+    PetscFunctionBeginUser;
+
+    ierr = PetscLogStagePush(stageWrite); CHKERRQ(ierr);
+
+    // buffer the record; write the block when full, or at a save or
+    // restart step (so that a crash loses at most nsave records)
+    if (forcesFile)
+    {
+        forcesBuffer.push_back(t);
+        for (PetscInt d = 0; d < mesh->dim; ++d)
+            forcesBuffer.push_back(fAvg[d]);
+    }
+    if ((PetscInt)forcesBuffer.size() >= forcesBufferSize * (1 + mesh->dim) ||
+        ite % saveInterval == 0 ||
+        (restartInterval > 0 && ite % restartInterval == 0))
+    {
+        ierr = flushForcesBinary(); CHKERRQ(ierr);
+    }
+
+    ierr = PetscLogStagePop(); CHKERRQ(ierr);  // end of stageWrite
+
+    PetscFunctionReturn(0);
+}  // writeForcesBinary
@@ -7,8 +7,15 @@
 
 #pragma once
 
+#include <map>
+#include <string>
+
+#include <hdf5.h>
 #include <petibm/rigidkinematics/rigidkinematics.h>
 
+#include "snapshotstorage.h"
+#include "snapshotwriter.h"
+
 class LietAl2016Solver : protected RigidKinematicsSolver
 {
 public:
@@ -17,8 +24,8 @@ public:
     ~LietAl2016Solver();
     PetscErrorCode init(const MPI_Comm &world, const YAML::Node &node);
     PetscErrorCode advance();
-    using RigidKinematicsSolver::destroy;
-    using RigidKinematicsSolver::write;
+    virtual PetscErrorCode destroy();
+    PetscErrorCode write();
     using RigidKinematicsSolver::ioInitialData;
     using RigidKinematicsSolver::finished;
 
@@ -27,6 +34,41 @@ protected:
     PetscInt scheme;
     PetscBool move;
     PetscReal dV;
+    Vec uTilde = PETSC_NULL;  // work vector for the predictor of scheme 4
+    Vec fEuler = PETSC_NULL;  // work vector for the Eulerian forces
+    PetscLogEvent eventPredictor;
+    PetscLogEvent eventIntegrateForces;
+    // sub-steps of a time step, timed with log events
+    // (and recorded in the optional timing trace)
+    enum SubStep
+    {
+        MOVE = 0, SCHEME, VELOCITY, FORCES, NOSLIP, POISSON, PROJECTION,
+        UPDATE, NSUBSTEPS
+    };  // SubStep
+    PetscLogStage stageScheme;
+    PetscLogStage stageAlgorithm;
+    std::vector<PetscLogEvent> subStepEvents;
+    PetscBool timing = PETSC_FALSE;
+    FILE *timingFile = nullptr;
+    PetscLogDouble stepTic;
+    std::vector<PetscLogDouble> subStepTics;
+    std::vector<PetscLogDouble> subStepTimes;
+    PetscErrorCode registerLogging(const YAML::Node &node);
+    PetscErrorCode beginSubStep(const SubStep &s);
+    PetscErrorCode endSubStep(const SubStep &s);
+    PetscErrorCode writeTimingTrace();
+    PetscBool loadBalance = PETSC_FALSE;
+    FILE *loadBalanceFile = nullptr;
+    PetscInt loadBalanceInterval;
+    PetscErrorCode initLoadBalance(const YAML::Node &node);
+    PetscErrorCode writeLoadBalance();
+    // bodies only update the coordinates of their locally owned points;
+    // the coordinates are gathered on all processes when output is written
+    PetscInt saveInterval;
+    PetscInt restartInterval;
+    PetscErrorCode gatherCoordinatesBodies();
+    PetscErrorCode createWorkVectors();
+    PetscErrorCode integrateForces(petibm::type::RealVec1D &fAvg);
     PetscErrorCode scheme1();
     PetscErrorCode scheme2();
     PetscErrorCode scheme3();
@@ -35,5 +77,77 @@ protected:
     PetscErrorCode algorithm2();
     PetscErrorCode algorithm3();
     PetscErrorCode writeForcesASCII();
+    // optional binary forces file (process 0 buffers the records and
+    // writes them in blocks)
+    PetscBool forcesBinary = PETSC_FALSE;
+    FILE *forcesFile = nullptr;
+    PetscInt forcesBufferSize;
+    std::vector<double> forcesBuffer;
+    PetscErrorCode initForcesBinary(const YAML::Node &node);
+    PetscErrorCode writeForcesBinary(const petibm::type::RealVec1D &fAvg);
+    PetscErrorCode flushForcesBinary();
+    // optional asynchronous output of the snapshots (the fields are gathered
+    // on process 0, and written to disk by a background thread)
+    PetscBool asyncOutput = PETSC_FALSE;
+    SnapshotWriter snapshotWriter;
+    PetscInt outputDepth = 2;  // maximum number of snapshots in the queue
+    std::vector<PetscInt> probeIntervals;  // HDF5 probes of the parent
+    // storage options of the snapshots (block `parameters.output`):
+    // chunked, compressed datasets in the requested precision, created by
+    // process 0 when it first writes the snapshot
+    SnapshotStorage snapshotStorage;
+    PetscErrorCode initSnapshotStorage(const YAML::Node &node);
+    PetscErrorCode initAsyncOutput(const YAML::Node &node);
+    PetscErrorCode writeSolutionHDF5(const std::string &filePath);
+    PetscErrorCode stageField(const DM &da, const Vec &vec,
+                              const std::string &name, Snapshot &snapshot);
+    PetscErrorCode gatherField(const std::string &name,
+                               const PetscInt dims[3],
+                               const PetscInt corners[6],
+                               const std::vector<PetscReal> &values,
+                               Snapshot &snapshot);
+    // optional output of subsampled boxes of the fields (block
+    // `parameters.output.regions`), gathered and written by process 0
+    struct OutputRegion
+    {
+        std::string name;
+        std::string directory;
+        PetscInt nsave;  // output frequency
+        PetscInt stride[3];  // subsampling stride in each direction
+        std::vector<std::string> fields;
+        std::map<std::string, std::vector<PetscInt>> start;  // first index
+        std::map<std::string, std::vector<PetscInt>> count;  // nb of points
+    };  // OutputRegion
+    std::vector<OutputRegion> outputRegions;
+    PetscErrorCode initOutputRegions(const YAML::Node &node);
+    PetscErrorCode writeOutputRegions();
+    PetscErrorCode stageRegionField(const OutputRegion &region,
+                                    const PetscInt &f, const Vec &vec,
+                                    const std::string &name,
+                                    Snapshot &snapshot);
+    // volume probes attached to a body (entries of `probes` with a key
+    // `body`): the box is given relative to the center of the body and
+    // only the co-moving window (fixed number of points) is written
+    struct AttachedProbe
+    {
+        std::string name;
+        std::string field;
+        std::string filepath;  // HDF5 file (written by process 0)
+        PetscInt f;  // index of the field (0: u, 1: v, 2: w, 3: p)
+        PetscInt body;  // index of the body
+        PetscReal offset[3][2];  // limits of the box relative to the center
+        PetscInt count[3];  // number of points of the window (fixed)
+        PetscInt nMonitor;  // output frequency
+        PetscReal tStart;
+        PetscReal tEnd;
+    };  // AttachedProbe
+    std::vector<AttachedProbe> attachedProbes;
+    PetscErrorCode initAttachedProbes(const YAML::Node &node);
+    PetscErrorCode getBodyCenter(const PetscInt &i, PetscReal center[3]);
+    PetscErrorCode writeAttachedProbes();
+    bool writeProbeRecordHDF5(const AttachedProbe &probe,
+                              const std::vector<PetscReal> &values,
+                              const PetscInt start[3],
+                              const PetscReal center[3]) const;
 
 };  // LietAl2016Solver
\ No newline at end of file
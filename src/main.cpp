@@ -14,6 +14,7 @@
 #include "oscillatingcylinder.h"
 #include "oscillatingcylinders.h"
 #include "oscillatingsphere.h"
+#include "rigidmotion.h"
 #include "translatingcylinder.h"
 #include "dragonfly.h"
 
@@ -46,12 +47,14 @@ PetscErrorCode createSolver(
         solver = std::make_shared<OscillatingSphereSolver>(comm, config);
     else if (name == "dragonfly")
         solver = std::make_shared<DragonflySolver>(comm, config);
+    else if (name == "rigid_motion")
+        solver = std::make_shared<RigidMotionSolver>(comm, config);
     else
         SETERRQ(comm, PETSC_ERR_ARG_WRONG,
                 "Accepted values for -solver are: "
-                "'li_et_al_2016', 'oscillating_cylinder',"
-                "'translating_cylinder', 'oscillating_sphere', and"
-                "'dragonfly'.");
+                "'li_et_al_2016', 'oscillating_cylinder', "
+                "'oscillating_cylinders', 'translating_cylinder', "
+                "'oscillating_sphere', 'dragonfly', and 'rigid_motion'.");
 
     PetscFunctionReturn(0);
 }  // createSolver
@@ -59,11 +62,22 @@ PetscErrorCode createSolver(
 int main(int argc, char **argv)
 {
     PetscErrorCode ierr;
+    PetscMPIInt provided;
     YAML::Node config;
     Solver solver;
 
+    // background threads (prefetch of the kinematics, output of the
+    // snapshots) do no MPI or PETSc calls: only the main thread calls MPI
+    ierr = MPI_Init_thread(&argc, &argv, MPI_THREAD_FUNNELED, &provided);
+    if (ierr) return ierr;
     ierr = PetscInitialize(&argc, &argv, nullptr, nullptr); CHKERRQ(ierr);
     ierr = PetscLogDefaultBegin(); CHKERRQ(ierr);
+    if (provided < MPI_THREAD_FUNNELED)
+    {
+        ierr = PetscPrintf(PETSC_COMM_WORLD,
+                           "Warning: the MPI library does not support "
+                           "MPI_THREAD_FUNNELED\n"); CHKERRQ(ierr);
+    }
 
     // parse configuration files; store info in YAML node
     ierr = petibm::parser::getSettings(config); CHKERRQ(ierr);
@@ -87,6 +101,8 @@ int main(int argc, char **argv)
     ierr = solver->destroy(); CHKERRQ(ierr);
 
     ierr = PetscFinalize(); CHKERRQ(ierr);
+    // MPI was initialized before PETSc
+    ierr = MPI_Finalize(); if (ierr) return ierr;
 
     return 0;
 }  // main
@@ -67,7 +67,8 @@ PetscErrorCode OscillatingCylinderSolver::setCoordinatesBodies(
     Xd = -Am * PetscSinReal(2*PETSC_PI * f * ti);
     Yd = 0.0;
 
-    for (PetscInt k = 0; k < body->nPts; k++)
+    // update the locally owned points only
+    for (PetscInt k = body->bgPt; k < body->edPt; k++)
     {
         coords[k][0] = coords0[k][0] + Xd;
         coords[k][1] = coords0[k][1] + Yd;
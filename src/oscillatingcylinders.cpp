@@ -63,9 +63,6 @@ PetscErrorCode OscillatingCylindersSolver::setCoordinatesBodies(
 {
     PetscReal Xd,  // displacement in the x-direction
               Yd;  // displacement in the y-direction
-    petibm::type::SingleBody &body = bodies->bodies[0];
-    petibm::type::RealVec2D &coords = body->coords;
-    petibm::type::RealVec2D &coords0 = body->coords0;
 
     PetscFunctionBeginUser;
 
@@ -78,7 +75,8 @@ PetscErrorCode OscillatingCylindersSolver::setCoordinatesBodies(
         petibm::type::RealVec2D &coords = body->coords;
         petibm::type::RealVec2D &coords0 = body->coords0;
 
-        for (PetscInt k = 0; k < body->nPts; k++)
+        // update the locally owned points only
+        for (PetscInt k = body->bgPt; k < body->edPt; k++)
         {
             coords[k][0] = coords0[k][0] + Xd;
             coords[k][1] = coords0[k][1] + Yd;
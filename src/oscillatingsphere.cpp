@@ -69,7 +69,8 @@ PetscErrorCode OscillatingSphereSolver::setCoordinatesBodies(
     Yd = 0.0;
     Zd = 0.0;
 
-    for (PetscInt k = 0; k < body->nPts; k++)
+    // update the locally owned points only
+    for (PetscInt k = body->bgPt; k < body->edPt; k++)
     {
         coords[k][0] = coords0[k][0] + Xd;
         coords[k][1] = coords0[k][1] + Yd;
@@ -1,2 +1,15 @@
+from .balance import *
+from .batch import *
+from .cases import *
+from .dragonfly import *
+from .fields import *
+from .forces import *
+from .interp import *
+from .kinematics import *
 from .lietal2016 import *
 from .misc import *
+from .perf import *
+from .probes import *
+from .snapshots import *
+from .stats import *
+from .stencil import *
@@ -0,0 +1,104 @@
+"""Reader of the load-balance report of the Lagrangian markers."""
+
+import collections
+
+import numpy
+
+
+LOAD_BALANCE_FIELDS = ('markers', 'weights', 'support', 'cells')
+
+LoadBalance = collections.namedtuple('LoadBalance', ['t', 'ite', 'counts'])
+LoadBalance.__doc__ = """Per-process counts recorded every nsave time steps.
+
+`t` and `ite` are 1D arrays with the time values and time-step indices;
+`counts` is a 3D array of integers of shape (number of records, number of
+processes, number of fields), with fields ordered as
+`rodney.LOAD_BALANCE_FIELDS`: Lagrangian markers owned, interpolation
+weights (non-zeros of the local rows of the interpolation operator),
+Eulerian points owned in the support of the markers, and Eulerian
+velocity points owned.
+"""
+
+
+def read_load_balance(filepath):
+    """Read the binary load-balance report written by the solver.
+
+    The report is written with the command-line option `-load_balance`.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path or str
+        Path of the binary file (e.g., `loadbalance.bin`).
+
+    Returns
+    -------
+    rodney.LoadBalance
+        Time values, time-step indices, and per-process counts.
+
+    """
+    with open(filepath, 'rb') as infile:
+        nprocs, nfields = numpy.frombuffer(infile.read(16), dtype='<i8')
+        dtype = numpy.dtype([('t', '<f8'), ('ite', '<i8'),
+                             ('counts', '<i8', (nprocs, nfields))])
+        buffer = infile.read()
+    # ignore an incomplete last record (e.g., run still in progress)
+    nrecords = len(buffer) // dtype.itemsize
+    data = numpy.frombuffer(buffer, dtype=dtype, count=nrecords)
+    return LoadBalance(data['t'], data['ite'], data['counts'])
+
+
+def get_load_imbalance(counts, field='markers'):
+    """Return the load imbalance (maximum over mean) of a field.
+
+    Parameters
+    ----------
+    counts : numpy.ndarray
+        Per-process counts (see `rodney.LoadBalance`).
+    field : str (optional)
+        Name of the field; choices are 'markers', 'weights', 'support', and
+        'cells'; default: 'markers'.
+
+    Returns
+    -------
+    numpy.ndarray
+        Imbalance of each record (1 for a perfect balance), as a 1D array
+        of floats.
+
+    """
+    values = counts[..., LOAD_BALANCE_FIELDS.index(field)]
+    mean = values.mean(axis=-1)
+    return numpy.divide(values.max(axis=-1), mean,
+                        out=numpy.ones_like(mean), where=mean > 0)
+
+
+def plot_load_balance(filepath, fields=('markers', 'weights', 'support'),
+                      ax=None):
+    """Plot the history of the load imbalance.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path or str
+        Path of the binary load-balance report.
+    fields : tuple of str (optional)
+        Names of the fields to plot;
+        default: ('markers', 'weights', 'support').
+    ax : matplotlib.axes.Axes (optional)
+        Axes to use; default: None (create a new figure).
+
+    Returns
+    -------
+    matplotlib.axes.Axes
+        The axes.
+
+    """
+    from matplotlib import pyplot
+    balance = read_load_balance(filepath)
+    if ax is None:
+        _, ax = pyplot.subplots(figsize=(6.0, 4.0))
+    ax.set_xlabel('$t$')
+    ax.set_ylabel('Imbalance (max / mean)')
+    for field in fields:
+        ax.plot(balance.t, get_load_imbalance(balance.counts, field=field),
+                label=field)
+    ax.legend(frameon=False)
+    return ax
@@ -0,0 +1,78 @@
+"""Parallel post-processing of several simulations or time steps."""
+
+from concurrent import futures
+import multiprocessing
+import os
+
+
+_shared_data = None
+
+
+def _init_worker(data):
+    """Store the read-only data shared by all tasks of a worker."""
+    global _shared_data
+    _shared_data = data
+
+
+def get_shared_data():
+    """Return the read-only data shared with the tasks of `batch_map`.
+
+    Returns
+    -------
+    object
+        The `shared` argument passed to `batch_map` (None outside a batch).
+
+    """
+    return _shared_data
+
+
+def batch_map(func, items, max_workers=None, shared=None, chunksize=1):
+    """Apply a function to several items on a pool of processes.
+
+    Results are returned in the order of the items, regardless of the order
+    in which the tasks complete. The pool uses the `fork` start method when
+    available so that functions defined in a plotting script (outside any
+    `if __name__ == '__main__'` block) can be sent to the workers, and so
+    that the shared data are inherited by the workers without being copied.
+
+    Parameters
+    ----------
+    func : callable
+        Function to apply; takes one item as argument.
+    items : iterable
+        Items to process (e.g., simulation directories or time steps).
+    max_workers : int (optional)
+        Number of processes; default: None (number of CPUs).
+        With 1 worker, the items are processed serially in the current
+        process.
+    shared : object (optional)
+        Read-only data (e.g., gridlines) made available to the tasks
+        through `get_shared_data`; default: None.
+    chunksize : int (optional)
+        Number of items sent at once to a worker; default: 1.
+
+    Returns
+    -------
+    list
+        Results of the function for each item.
+
+    """
+    items = list(items)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(items)))
+    if max_workers == 1:
+        global _shared_data
+        previous, _shared_data = _shared_data, shared
+        try:
+            return [func(item) for item in items]
+        finally:
+            _shared_data = previous
+    context = None
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    with futures.ProcessPoolExecutor(max_workers=max_workers,
+                                     mp_context=context,
+                                     initializer=_init_worker,
+                                     initargs=(shared,)) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
@@ -0,0 +1,154 @@
+"""Parameters of a simulation case parsed from its YAML configuration."""
+
+import collections
+import functools
+import math
+import pathlib
+
+import yaml
+
+
+_BodyParameters = collections.namedtuple(
+    '_BodyParameters', ['name', 'D', 'KC', 'f', 'Am', 'Um', 'center',
+                        'U0', 'V0', 'motion'])
+
+
+class BodyParameters(_BodyParameters):
+    """Immutable kinematic parameters of a body.
+
+    Derived quantities follow the solvers: for an oscillating body, the
+    amplitude is `Am = D * KC / (2 * pi)` (unless `Am` is given directly, as
+    for the sphere) and the maximum velocity is `Um = 2 * pi * f * Am`;
+    `U0` and `V0` are the velocity components of a translating body;
+    `motion` maps the degrees of freedom ('x', 'y', 'z', and 'theta') of a
+    body driven by the rigid-motion solver to their Fourier series.
+
+    """
+
+    __slots__ = ()
+
+    @property
+    def w(self):
+        """Return the angular frequency."""
+        return 2 * math.pi * self.f
+
+    @property
+    def T(self):
+        """Return the period of oscillation."""
+        return 1 / self.f if self.f != 0.0 else math.inf
+
+    @property
+    def U(self):
+        """Return the characteristic velocity of the body."""
+        if self.Um != 0.0:
+            return self.Um
+        return math.hypot(self.U0, self.V0)
+
+
+_CaseParameters = collections.namedtuple(
+    '_CaseParameters', ['simudir', 'nu', 'dt', 'nt', 'nsave', 'nrestart',
+                        'output', 'bodies'])
+
+
+class CaseParameters(_CaseParameters):
+    """Immutable parameters of a simulation case.
+
+    `output` is the content of the block `parameters.output` (options of
+    the HDF5 snapshots; see `rodney.get_dataset_options`).
+
+    """
+
+    __slots__ = ()
+
+    def Re(self, index=0):
+        """Return the Reynolds number based on a body.
+
+        Parameters
+        ----------
+        index : int (optional)
+            Index of the body; default: 0.
+
+        Returns
+        -------
+        float
+            The Reynolds number.
+
+        """
+        body = self.bodies[index]
+        return body.U * body.D / self.nu
+
+
+def get_body_parameters(node, name=None):
+    """Return the kinematic parameters from a `kinematics` YAML node.
+
+    Parameters
+    ----------
+    node : dict
+        Content of the node `bodies[i].kinematics`.
+    name : str (optional)
+        Name of the body; default: None.
+
+    Returns
+    -------
+    rodney.BodyParameters
+        The kinematic parameters.
+
+    """
+    node = node or {}
+    D = float(node.get('D', 1.0))
+    KC = float(node.get('KC', 0.0))
+    f = float(node.get('f', 0.0))
+    if 'Am' in node:
+        Am = float(node['Am'])
+    else:
+        Am = D * KC / (2 * math.pi)
+    Um = 2 * math.pi * f * Am
+    center = tuple(float(x) for x in node.get('center', ()))
+    U0 = float(node.get('U0', 0.0))
+    V0 = float(node.get('V0', 0.0))
+    motion = {key: node[key] for key in ('x', 'y', 'z', 'theta')
+              if isinstance(node.get(key), dict)}
+    return BodyParameters(name, D, KC, f, Am, Um, center, U0, V0, motion)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_case(filepath, mtime_ns):
+    """Parse the YAML configuration of a case (cached)."""
+    with open(filepath, 'r') as infile:
+        config = yaml.safe_load(infile)
+    flow = config.get('flow', {})
+    params = config.get('parameters', {})
+    bodies = tuple(get_body_parameters(body.get('kinematics'),
+                                       name=body.get('name'))
+                   for body in config.get('bodies', []))
+    return CaseParameters(pathlib.Path(filepath).parent,
+                          float(flow.get('nu', math.nan)),
+                          float(params.get('dt', math.nan)),
+                          int(params.get('nt', 0)),
+                          int(params.get('nsave', 0)),
+                          int(params.get('nrestart', 0)),
+                          params.get('output') or {},
+                          bodies)
+
+
+def load_case(simudir, filename='config.yaml'):
+    """Load the parameters of a simulation case.
+
+    The configuration file is parsed once; later calls return the same
+    object as long as the file has not been modified.
+
+    Parameters
+    ----------
+    simudir : pathlib.Path or str
+        Directory of the simulation.
+    filename : str (optional)
+        Name of the YAML configuration file; default: 'config.yaml'.
+
+    Returns
+    -------
+    rodney.CaseParameters
+        The parameters of the case.
+
+    """
+    filepath = pathlib.Path(simudir).absolute() / filename
+    return _load_case(str(filepath), filepath.stat().st_mtime_ns)
@@ -0,0 +1,126 @@
+"""Helpers for the prescribed kinematics of the dragonfly solver."""
+
+import pathlib
+
+import h5py
+import numpy
+
+
+def _read_lagrangian_points(filepath):
+    """Read the values at the Lagrangian points from an ASCII file.
+
+    The first line contains the number of points; the following lines
+    contain the values (coordinates or velocity components) of each point.
+
+    """
+    with open(filepath, 'r') as infile:
+        n = int(infile.readline())
+        data = numpy.loadtxt(infile, ndmin=2)
+    if data.shape[0] != n:
+        raise ValueError(f'{filepath}: expected {n} points, '
+                         f'found {data.shape[0]}')
+    return data
+
+
+def pack_kinematics(folder, filepath=None, nt_cycle=None, dt=None,
+                    compression='gzip', compression_opts=4):
+    """Pack the per-step ASCII kinematics of a body into one HDF5 file.
+
+    The files `position_NNNNNNN.txt` and `velocity_NNNNNNN.txt` of the
+    folder are stored in the datasets `position` and `velocity` of shape
+    (nt_cycle, nPts, dim), chunked by frame and compressed. The number of
+    frames, points, and dimensions (and the sampling time step, if given)
+    are stored as attributes of the file.
+
+    The file is read by the dragonfly solver with the body kinematics
+    `format: hdf5` and `file: <filepath>`; the sampling time step, if
+    stored, is used to interpolate the kinematics in time when the solver
+    runs with a different time-step size (`interpolation: linear` or
+    `cubic`).
+
+    Parameters
+    ----------
+    folder : pathlib.Path or str
+        Folder with the ASCII files.
+    filepath : pathlib.Path or str (optional)
+        Path of the HDF5 file to write; default: None
+        (`<folder>.h5` next to the folder).
+    nt_cycle : int (optional)
+        Number of frames in a cycle; default: None (number of position
+        files in the folder).
+    dt : float (optional)
+        Time-step size at which the frames are sampled; default: None
+        (not stored).
+    compression : str (optional)
+        Compression filter; default: 'gzip'.
+    compression_opts : int (optional)
+        Compression level; default: 4.
+
+    Returns
+    -------
+    pathlib.Path
+        Path of the HDF5 file.
+
+    """
+    folder = pathlib.Path(folder)
+    if filepath is None:
+        filepath = folder.parent / (folder.name + '.h5')
+    filepath = pathlib.Path(filepath)
+    if nt_cycle is None:
+        nt_cycle = len(list(folder.glob('position_*.txt')))
+    if nt_cycle == 0:
+        raise ValueError(f'No kinematics files found in {folder}')
+    first = _read_lagrangian_points(folder / 'position_0000000.txt')
+    shape = (nt_cycle,) + first.shape
+    with h5py.File(filepath, 'w') as outfile:
+        outfile.attrs['nt_cycle'] = nt_cycle
+        outfile.attrs['nPts'] = first.shape[0]
+        outfile.attrs['dim'] = first.shape[1]
+        outfile.attrs['source'] = str(folder)
+        if dt is not None:
+            outfile.attrs['dt'] = dt
+        for name in ('position', 'velocity'):
+            dset = outfile.create_dataset(name, shape=shape,
+                                          dtype=numpy.float64,
+                                          chunks=(1,) + first.shape,
+                                          compression=compression,
+                                          compression_opts=compression_opts,
+                                          shuffle=True)
+            for n in range(nt_cycle):
+                data = _read_lagrangian_points(folder /
+                                               f'{name}_{n:0>7}.txt')
+                if data.shape != first.shape:
+                    raise ValueError(f'{name}_{n:0>7}.txt: expected shape '
+                                     f'{first.shape}, found {data.shape}')
+                dset[n] = data
+    return filepath
+
+
+def read_packed_kinematics(filepath, frames=None):
+    """Read the kinematics from a packed HDF5 file.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path or str
+        Path of the HDF5 file.
+    frames : slice or list of ints (optional)
+        Frames to read; default: None (all frames).
+
+    Returns
+    -------
+    position : numpy.ndarray
+        Coordinates of the Lagrangian points, as a 3D array of floats of
+        shape (number of frames, nPts, dim).
+    velocity : numpy.ndarray
+        Velocity of the Lagrangian points (same shape).
+    attrs : dict
+        Metadata of the file.
+
+    """
+    if frames is None:
+        frames = slice(None)
+    with h5py.File(filepath, 'r') as infile:
+        position = infile['position'][frames]
+        velocity = infile['velocity'][frames]
+        attrs = dict(infile.attrs)
+    return position, velocity, attrs
@@ -0,0 +1,212 @@
+"""Partial loading of field solutions stored in HDF5 files."""
+
+import h5py
+import numpy
+
+
+class LazyField(object):
+    """Field solution stored in an HDF5 file, read on demand.
+
+    Slicing the object only reads the requested hyperslab from disk; the
+    full array is never loaded into memory.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path or str
+        Path of the HDF5 file with the field solution.
+    name : str
+        Name of the field dataset.
+    gridlines : tuple or list of numpy.ndarray (optional)
+        Gridlines of the field in the x, y, and z (if 3D) directions;
+        required to extract planes, lines, or boxes by coordinates.
+
+    """
+
+    def __init__(self, filepath, name, gridlines=None):
+        """Open the HDF5 file."""
+        self.filepath = filepath
+        self.name = name
+        self._file = h5py.File(filepath, 'r')
+        self.dataset = self._file[name]
+        self.gridlines = None
+        if gridlines is not None:
+            self.gridlines = [numpy.asarray(x) for x in gridlines]
+            shape = tuple(x.size for x in self.gridlines[::-1])
+            if shape != self.shape:
+                raise ValueError(f'Gridlines shape {shape} does not match '
+                                 f'field shape {self.shape}')
+
+    @property
+    def shape(self):
+        """Return the shape of the field."""
+        return self.dataset.shape
+
+    @property
+    def ndim(self):
+        """Return the number of dimensions of the field."""
+        return self.dataset.ndim
+
+    @property
+    def dtype(self):
+        """Return the data type of the field."""
+        return self.dataset.dtype
+
+    def __enter__(self):
+        """Return the field (context manager)."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the file (context manager)."""
+        self.close()
+
+    def close(self):
+        """Close the HDF5 file."""
+        self._file.close()
+
+    def __getitem__(self, key):
+        """Read a hyperslab of the field."""
+        return self.dataset[key]
+
+    def mean(self, block=16):
+        """Compute the mean value of the field by blocks of planes.
+
+        Parameters
+        ----------
+        block : int (optional)
+            Number of planes (along the slowest axis) read at once;
+            default: 16.
+
+        Returns
+        -------
+        float
+            The mean value.
+
+        """
+        total = 0.0
+        for start in range(0, self.shape[0], block):
+            total += numpy.sum(self.dataset[start:start + block],
+                               dtype=numpy.float64)
+        return total / self.dataset.size
+
+    def _axis(self, direction):
+        """Return the array axis and gridline of a direction."""
+        if self.gridlines is None:
+            raise ValueError('Gridlines are required to locate coordinates')
+        d = 'xyz'.index(direction)
+        return self.ndim - 1 - d, self.gridlines[d]
+
+    def plane(self, direction, value):
+        """Linearly interpolate the field on a plane (or a line in 2D).
+
+        Only the two grid planes bracketing the requested coordinate are
+        read from disk.
+
+        Parameters
+        ----------
+        direction : str
+            Direction normal to the plane; choices are 'x', 'y', and 'z'.
+        value : float
+            Coordinate of the plane in that direction.
+
+        Returns
+        -------
+        numpy.ndarray
+            Field values on the plane.
+
+        """
+        axis, x = self._axis(direction)
+        if value < x[0] or value > x[-1]:
+            raise ValueError(f'{direction}={value} outside the gridline')
+        i = min(max(numpy.searchsorted(x, value, side='right') - 1, 0),
+                x.size - 2)
+        alpha = (value - x[i]) / (x[i + 1] - x[i])
+        index = [slice(None)] * self.ndim
+        index[axis] = slice(i, i + 2)
+        values = self.dataset[tuple(index)]
+        lower = numpy.take(values, 0, axis=axis)
+        upper = numpy.take(values, 1, axis=axis)
+        return (1.0 - alpha) * lower + alpha * upper
+
+    def box(self, limits):
+        """Read the sub-volume of the field covering a box.
+
+        The box is extended to the nearest gridlines enclosing it.
+
+        Parameters
+        ----------
+        limits : tuple or list of tuples of floats
+            Lower and upper limits of the box in the x, y, and z (if 3D)
+            directions.
+
+        Returns
+        -------
+        list of numpy.ndarray
+            Gridlines of the sub-volume.
+        numpy.ndarray
+            Field values in the sub-volume.
+
+        """
+        if len(limits) != self.ndim:
+            raise ValueError('Box does not match dimension of the field')
+        index = [slice(None)] * self.ndim
+        gridlines = []
+        for d, (start, end) in zip('xyz', limits):
+            axis, x = self._axis(d)
+            i = max(numpy.searchsorted(x, start, side='right') - 1, 0)
+            j = min(numpy.searchsorted(x, end, side='left') + 1, x.size)
+            index[axis] = slice(i, j)
+            gridlines.append(x[i:j])
+        return gridlines, self.dataset[tuple(index)]
+
+
+def read_field_plane(filepath, name, gridlines, direction, value):
+    """Read a field from file and interpolate it on a plane.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path or str
+        Path of the HDF5 file with the field solution.
+    name : str
+        Name of the field dataset.
+    gridlines : tuple or list of numpy.ndarray
+        Gridlines of the field in the x, y, and z (if 3D) directions.
+    direction : str
+        Direction normal to the plane; choices are 'x', 'y', and 'z'.
+    value : float
+        Coordinate of the plane in that direction.
+
+    Returns
+    -------
+    numpy.ndarray
+        Field values on the plane.
+
+    """
+    with LazyField(filepath, name, gridlines=gridlines) as field:
+        return field.plane(direction, value)
+
+
+def read_field_box(filepath, name, gridlines, limits):
+    """Read the sub-volume of a field covering a box.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path or str
+        Path of the HDF5 file with the field solution.
+    name : str
+        Name of the field dataset.
+    gridlines : tuple or list of numpy.ndarray
+        Gridlines of the field in the x, y, and z (if 3D) directions.
+    limits : tuple or list of tuples of floats
+        Lower and upper limits of the box in the x, y, and z (if 3D)
+        directions.
+
+    Returns
+    -------
+    list of numpy.ndarray
+        Gridlines of the sub-volume.
+    numpy.ndarray
+        Field values in the sub-volume.
+
+    """
+    with LazyField(filepath, name, gridlines=gridlines) as field:
+        return field.box(limits)
@@ -0,0 +1,228 @@
+"""Helpers to read the history of the forces written by the solver."""
+
+import pathlib
+
+import numpy
+
+
+class ForcesTail(object):
+    """Incremental reader of an ASCII forces file being appended to.
+
+    The reader remembers the byte offset of the last complete line parsed;
+    each refresh only parses the lines appended since then (an incomplete
+    last line is left for the next refresh). Parsed rows are stored in an
+    array that grows by doubling its capacity.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path or str
+        Path of the forces file (e.g., `forces-0.txt`).
+    parse : bool (optional)
+        If True, parse the existing rows at creation; default: True.
+
+    """
+
+    def __init__(self, filepath, parse=True):
+        """Initialize the reader and parse the existing rows."""
+        self.filepath = pathlib.Path(filepath)
+        self._offset = 0
+        self._buffer = None
+        self._size = 0
+        if parse:
+            self.refresh()
+
+    def __len__(self):
+        """Return the number of rows parsed."""
+        return self._size
+
+    def _seed(self, data, offset):
+        """Start from rows already parsed up to a given byte offset."""
+        self.reset()
+        if data.size > 0:
+            self._append(data)
+        self._offset = offset
+
+    def reset(self):
+        """Forget all rows parsed so far."""
+        self._offset = 0
+        self._buffer = None
+        self._size = 0
+
+    def refresh(self):
+        """Parse the rows appended to the file since the last refresh.
+
+        If the file is shorter than the offset (e.g., it was overwritten by
+        a new run), the reader starts over from the beginning of the file.
+
+        Returns
+        -------
+        int
+            Number of new rows.
+
+        """
+        if not self.filepath.is_file():
+            return 0
+        if self.filepath.stat().st_size < self._offset:
+            self.reset()
+        with open(self.filepath, 'rb') as infile:
+            infile.seek(self._offset)
+            chunk = infile.read()
+        end = chunk.rfind(b'\n') + 1
+        if end == 0:
+            return 0
+        self._offset += end
+        lines = chunk[:end].splitlines()
+        if self._buffer is None:
+            ncols = len(lines[0].split())
+        else:
+            ncols = self._buffer.shape[1]
+        values = numpy.array(b' '.join(lines).split(), dtype=numpy.float64)
+        if values.size % ncols != 0:
+            raise ValueError(f'Inconsistent number of columns in '
+                             f'{self.filepath}')
+        rows = values.reshape(-1, ncols)
+        self._append(rows)
+        return rows.shape[0]
+
+    def _append(self, rows):
+        """Append rows to the buffer, growing it if necessary."""
+        n = self._size + rows.shape[0]
+        if self._buffer is None:
+            self._buffer = numpy.empty((max(n, 1024), rows.shape[1]))
+        elif n > self._buffer.shape[0]:
+            capacity = max(n, 2 * self._buffer.shape[0])
+            buffer = numpy.empty((capacity, self._buffer.shape[1]))
+            buffer[:self._size] = self._buffer[:self._size]
+            self._buffer = buffer
+        self._buffer[self._size:n] = rows
+        self._size = n
+
+    @property
+    def data(self):
+        """Return a view of the rows parsed, as a 2D array of floats."""
+        if self._buffer is None:
+            return numpy.empty((0, 0))
+        return self._buffer[:self._size]
+
+    @property
+    def t(self):
+        """Return the time values, as a 1D array of floats."""
+        return self.data[:, 0] if self._size > 0 else numpy.empty(0)
+
+    def unpack(self):
+        """Return the columns of the file (as `petibmpy.read_forces`).
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            Time values and force components, as 1D arrays of floats.
+
+        """
+        return tuple(self.data.T)
+
+
+def get_forces_cache_path(filepath):
+    """Return the path of the sidecar cache of a forces file.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path or str
+        Path of the forces file.
+
+    Returns
+    -------
+    pathlib.Path
+        Path of the cache (`<filename>.cache.npz` in the same directory).
+
+    """
+    filepath = pathlib.Path(filepath)
+    return filepath.parent / (filepath.name + '.cache.npz')
+
+
+def read_forces_binary(filepath):
+    """Read the history of the forces from a binary file.
+
+    The binary file is written with the command-line option
+    `-forces_format binary`: a header with the number of columns (int64)
+    followed by records of float64 values (time value and force
+    components); the ASCII file is not written in this mode. The records are
+    memory-mapped, not parsed; an incomplete last record (e.g., run still in
+    progress) is ignored.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path or str
+        Path of the forces file (e.g., `forces-0.bin`).
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        Time values and force components, as 1D arrays of floats.
+
+    """
+    filepath = pathlib.Path(filepath)
+    with open(filepath, 'rb') as infile:
+        ncols = int(numpy.frombuffer(infile.read(8), dtype='<i8')[0])
+    nrows = (filepath.stat().st_size - 8) // (8 * ncols)
+    if nrows == 0:
+        return tuple(numpy.empty(0) for _ in range(ncols))
+    data = numpy.memmap(filepath, dtype='<f8', mode='r', offset=8,
+                        shape=(nrows, ncols))
+    return tuple(data.T)
+
+
+def read_forces(filepath, cache=True):
+    """Read the history of the forces from an ASCII file.
+
+    Binary files (`.bin` extension) are read with
+    `rodney.read_forces_binary`.
+
+    The parsed values are stored in a sidecar NumPy file, keyed on the size
+    and modification time of the source. Later calls load the sidecar if
+    the source has not changed, or only parse the rows appended since the
+    sidecar was written if the source has grown (and still starts with the
+    same bytes).
+
+    Parameters
+    ----------
+    filepath : pathlib.Path or str
+        Path of the forces file.
+    cache : bool (optional)
+        If True, use and update the sidecar cache; default: True.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        Time values and force components, as 1D arrays of floats.
+
+    """
+    filepath = pathlib.Path(filepath)
+    if filepath.suffix == '.bin':
+        return read_forces_binary(filepath)
+    if not cache:
+        return ForcesTail(filepath).unpack()
+    stat = filepath.stat()
+    with open(filepath, 'rb') as infile:
+        head = numpy.frombuffer(infile.read(1024), dtype=numpy.uint8)
+    cachepath = get_forces_cache_path(filepath)
+    reader = ForcesTail(filepath, parse=False)
+    if cachepath.is_file():
+        try:
+            with numpy.load(cachepath) as data:
+                size, mtime = int(data['size']), int(data['mtime_ns'])
+                if size == stat.st_size and mtime == stat.st_mtime_ns:
+                    return tuple(data['data'].T)
+                cached_head = data['head']
+                if (size <= stat.st_size and
+                        numpy.array_equal(cached_head,
+                                          head[:cached_head.size])):
+                    reader._seed(data['data'], int(data['offset']))
+        except (OSError, ValueError, KeyError):
+            reader.reset()
+    reader.refresh()
+    try:
+        numpy.savez(cachepath, data=reader.data, offset=reader._offset,
+                    size=stat.st_size, mtime_ns=stat.st_mtime_ns, head=head)
+    except OSError:
+        pass  # read-only directory; skip caching
+    return reader.unpack()
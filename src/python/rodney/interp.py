@@ -0,0 +1,153 @@
+"""Batched linear interpolation of gridded fields at scattered points."""
+
+import numpy
+
+
+class LinearInterpolator(object):
+    """Bilinear/trilinear interpolation of a gridded field at many points.
+
+    Cell indices and interpolation weights are computed once for the set of
+    query points; the interpolator can then be applied to any field defined
+    on the same gridlines (e.g., at different time steps) with a single
+    vectorized gather.
+
+    Parameters
+    ----------
+    gridlines : tuple or list of numpy.ndarray
+        Gridlines in the x, y, and z (if 3D) directions.
+    points : tuple or list of numpy.ndarray
+        Coordinates of the query points in the x, y, and z (if 3D)
+        directions; all arrays must have the same size.
+
+    """
+
+    def __init__(self, gridlines, points):
+        """Initialize the interpolator."""
+        self.gridlines = [numpy.asarray(x) for x in gridlines]
+        self.dim = len(self.gridlines)
+        self.shape = tuple(x.size for x in self.gridlines[::-1])
+        self.indices, self.weights = None, None
+        self.update(points)
+
+    def update(self, points):
+        """Compute cell indices and weights for a new set of query points.
+
+        Parameters
+        ----------
+        points : tuple or list of numpy.ndarray
+            Coordinates of the query points in the x, y, and z (if 3D)
+            directions.
+
+        """
+        self.indices, self.weights = get_interpolation_stencil(
+            self.gridlines, points)
+
+    @property
+    def size(self):
+        """Return the number of query points."""
+        return self.indices.shape[0]
+
+    def __call__(self, field):
+        """Interpolate a field at the query points.
+
+        Parameters
+        ----------
+        field : numpy.ndarray
+            Field values on the gridlines, with shape (ny, nx) in 2D
+            or (nz, ny, nx) in 3D (PetIBM ordering).
+
+        Returns
+        -------
+        numpy.ndarray
+            Interpolated values as a 1D array of floats.
+
+        """
+        field = numpy.asarray(field)
+        if field.shape != self.shape:
+            raise ValueError(f'Field shape {field.shape} does not match '
+                             f'gridlines shape {self.shape}')
+        return numpy.einsum('ij,ij->i', field.ravel()[self.indices],
+                            self.weights)
+
+
+def get_interpolation_stencil(gridlines, points):
+    """Compute the linear-interpolation stencil of scattered points.
+
+    Parameters
+    ----------
+    gridlines : tuple or list of numpy.ndarray
+        Gridlines in the x, y, and z (if 3D) directions.
+    points : tuple or list of numpy.ndarray
+        Coordinates of the query points in the x, y, and z (if 3D)
+        directions.
+
+    Returns
+    -------
+    numpy.ndarray
+        Flat indices (in the raveled field) of the 2**dim neighbors
+        of each point, as a 2D array of integers of shape (N, 2**dim).
+    numpy.ndarray
+        Corresponding interpolation weights, as a 2D array of floats
+        of shape (N, 2**dim).
+
+    """
+    dim = len(gridlines)
+    if len(points) != dim:
+        raise ValueError('Number of coordinate arrays does not match '
+                         'number of gridlines')
+    shape = tuple(numpy.size(x) for x in gridlines[::-1])
+    brackets = [_get_bracket(x, xi) for x, xi in zip(gridlines, points)]
+    return _combine_brackets(brackets, shape)
+
+
+def _get_bracket(x, xi):
+    """Return the lower gridline index and relative position of points."""
+    x, xi = numpy.asarray(x), numpy.atleast_1d(xi).astype(float)
+    if x.size < 2:
+        raise ValueError('Gridlines must have at least two points')
+    if numpy.any(xi < x[0]) or numpy.any(xi > x[-1]):
+        raise ValueError('Some points are outside the gridlines')
+    i = numpy.clip(numpy.searchsorted(x, xi, side='right') - 1,
+                   0, x.size - 2)
+    return i, (xi - x[i]) / (x[i + 1] - x[i])
+
+
+def _combine_brackets(brackets, shape):
+    """Combine per-direction brackets into flat indices and weights."""
+    dim = len(brackets)
+    n = brackets[0][0].size
+    indices = numpy.empty((n, 2**dim), dtype=numpy.intp)
+    weights = numpy.empty((n, 2**dim))
+    # Loop over the corners of the cell (bit d set means upper neighbor
+    # in direction d).
+    for corner in range(2**dim):
+        offsets = [(corner >> d) & 1 for d in range(dim)]
+        idx = [i + o for (i, _), o in zip(brackets, offsets)]
+        indices[:, corner] = numpy.ravel_multi_index(idx[::-1], shape)
+        weights[:, corner] = numpy.prod([a if o else 1.0 - a
+                                         for (_, a), o in zip(brackets,
+                                                              offsets)],
+                                        axis=0)
+    return indices, weights
+
+
+def interpolate(field, gridlines, points):
+    """Linearly interpolate a gridded field at scattered points.
+
+    Parameters
+    ----------
+    field : numpy.ndarray
+        Field values, with shape (ny, nx) in 2D or (nz, ny, nx) in 3D.
+    gridlines : tuple or list of numpy.ndarray
+        Gridlines in the x, y, and z (if 3D) directions.
+    points : tuple or list of numpy.ndarray
+        Coordinates of the query points in the x, y, and z (if 3D)
+        directions.
+
+    Returns
+    -------
+    numpy.ndarray
+        Interpolated values as a 1D array of floats.
+
+    """
+    return LinearInterpolator(gridlines, points)(field)
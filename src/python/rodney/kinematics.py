@@ -0,0 +1,204 @@
+"""Vectorized rigid-body kinematics of the decoupled IBPM solvers.
+
+Each function mirrors the prescribed motion of a C++ solver
+(`setCoordinatesBodies` and `setVelocityBodies`) and evaluates it over a
+whole array of time values at once.
+"""
+
+import collections
+
+import numpy
+
+
+Kinematics = collections.namedtuple('Kinematics', ['position', 'velocity',
+                                                   'acceleration'])
+Kinematics.__doc__ = """Position of the center, velocity, and acceleration.
+
+Each attribute is a 2D array of floats of shape (dim, N), where N is the
+number of time values.
+"""
+
+
+def _get_center(body, dim):
+    """Return the initial center of a body as a column array."""
+    center = numpy.zeros((dim, 1))
+    center[:len(body.center), 0] = body.center[:dim]
+    return center
+
+
+def oscillating_cylinder_kinematics(t, body, dim=2):
+    """Kinematics of an inline oscillating cylinder.
+
+    Mirrors `OscillatingCylinderSolver` (and `OscillatingCylindersSolver`
+    for each body): the x-displacement is `-Am sin(2 pi f t)`.
+
+    Parameters
+    ----------
+    t : numpy.ndarray or float
+        Time values.
+    body : rodney.BodyParameters
+        Kinematic parameters of the body.
+    dim : int (optional)
+        Number of dimensions; default: 2.
+
+    Returns
+    -------
+    rodney.Kinematics
+        Position of the center, velocity, and acceleration.
+
+    """
+    t = numpy.atleast_1d(numpy.asarray(t, dtype=float))
+    wt = body.w * t
+    position = numpy.repeat(_get_center(body, dim), t.size, axis=1)
+    velocity = numpy.zeros((dim, t.size))
+    acceleration = numpy.zeros((dim, t.size))
+    position[0] -= body.Am * numpy.sin(wt)
+    velocity[0] = -body.Um * numpy.cos(wt)
+    acceleration[0] = body.Um * body.w * numpy.sin(wt)
+    return Kinematics(position, velocity, acceleration)
+
+
+def oscillating_sphere_kinematics(t, body, dim=3):
+    """Kinematics of an inline oscillating sphere.
+
+    Mirrors `OscillatingSphereSolver`: the x-displacement is
+    `Am sin(2 pi f t)`.
+
+    Parameters
+    ----------
+    t : numpy.ndarray or float
+        Time values.
+    body : rodney.BodyParameters
+        Kinematic parameters of the body.
+    dim : int (optional)
+        Number of dimensions; default: 3.
+
+    Returns
+    -------
+    rodney.Kinematics
+        Position of the center, velocity, and acceleration.
+
+    """
+    t = numpy.atleast_1d(numpy.asarray(t, dtype=float))
+    wt = body.w * t
+    position = numpy.repeat(_get_center(body, dim), t.size, axis=1)
+    velocity = numpy.zeros((dim, t.size))
+    acceleration = numpy.zeros((dim, t.size))
+    position[0] += body.Am * numpy.sin(wt)
+    velocity[0] = body.Um * numpy.cos(wt)
+    acceleration[0] = -body.Um * body.w * numpy.sin(wt)
+    return Kinematics(position, velocity, acceleration)
+
+
+def translating_cylinder_kinematics(t, body, dim=2):
+    """Kinematics of a cylinder translating at constant velocity.
+
+    Mirrors `TranslatingCylinderSolver`: the displacement is
+    `(U0 t, V0 t)`.
+
+    Parameters
+    ----------
+    t : numpy.ndarray or float
+        Time values.
+    body : rodney.BodyParameters
+        Kinematic parameters of the body.
+    dim : int (optional)
+        Number of dimensions; default: 2.
+
+    Returns
+    -------
+    rodney.Kinematics
+        Position of the center, velocity, and acceleration.
+
+    """
+    t = numpy.atleast_1d(numpy.asarray(t, dtype=float))
+    velocity = numpy.zeros((dim, t.size))
+    velocity[0], velocity[1] = body.U0, body.V0
+    position = _get_center(body, dim) + velocity * t
+    acceleration = numpy.zeros((dim, t.size))
+    return Kinematics(position, velocity, acceleration)
+
+
+def _evaluate_fourier_series(t, series):
+    """Evaluate a Fourier series and its first two time derivatives."""
+    velocity = float(series.get('velocity', 0.0))
+    q = velocity * t
+    dq = numpy.full_like(t, velocity)
+    ddq = numpy.zeros_like(t)
+    for mode in series.get('modes', []):
+        A = float(mode['amplitude'])
+        w = 2 * numpy.pi * float(mode['frequency'])
+        arg = w * t + float(mode.get('phase', 0.0))
+        q += A * numpy.sin(arg)
+        dq += A * w * numpy.cos(arg)
+        ddq -= A * w**2 * numpy.sin(arg)
+    return q, dq, ddq
+
+
+def rigid_motion_kinematics(t, body, dim=2):
+    """Kinematics of the center of a body with a prescribed rigid motion.
+
+    Mirrors `RigidMotionSolver`: each component of the displacement of the
+    center is `U t + sum_k A_k sin(2 pi f_k t + phi_k)`; the rotation about
+    the center does not move it.
+
+    Parameters
+    ----------
+    t : numpy.ndarray or float
+        Time values.
+    body : rodney.BodyParameters
+        Kinematic parameters of the body.
+    dim : int (optional)
+        Number of dimensions; default: 2.
+
+    Returns
+    -------
+    rodney.Kinematics
+        Position of the center, velocity, and acceleration.
+
+    """
+    t = numpy.atleast_1d(numpy.asarray(t, dtype=float))
+    position = numpy.repeat(_get_center(body, dim), t.size, axis=1)
+    velocity = numpy.zeros((dim, t.size))
+    acceleration = numpy.zeros((dim, t.size))
+    for d, key in enumerate(('x', 'y', 'z')[:dim]):
+        if key in body.motion:
+            q, dq, ddq = _evaluate_fourier_series(t, body.motion[key])
+            position[d] += q
+            velocity[d], acceleration[d] = dq, ddq
+    return Kinematics(position, velocity, acceleration)
+
+
+KINEMATICS = {'oscillating_cylinder': oscillating_cylinder_kinematics,
+              'oscillating_cylinders': oscillating_cylinder_kinematics,
+              'oscillating_sphere': oscillating_sphere_kinematics,
+              'rigid_motion': rigid_motion_kinematics,
+              'translating_cylinder': translating_cylinder_kinematics}
+
+
+def get_body_kinematics(solver, t, body, **kwargs):
+    """Kinematics of a body for a given solver.
+
+    Parameters
+    ----------
+    solver : str
+        Name of the solver (value of the `-solver` command-line option);
+        choices are 'oscillating_cylinder', 'oscillating_cylinders',
+        'oscillating_sphere', 'rigid_motion', and 'translating_cylinder'.
+    t : numpy.ndarray or float
+        Time values.
+    body : rodney.BodyParameters
+        Kinematic parameters of the body.
+    **kwargs : dict
+        Other keyword arguments passed to the kinematics function.
+
+    Returns
+    -------
+    rodney.Kinematics
+        Position of the center, velocity, and acceleration.
+
+    """
+    if solver not in KINEMATICS:
+        raise ValueError(f'Unknown solver {solver}; '
+                         f'choices are {list(KINEMATICS.keys())}')
+    return KINEMATICS[solver](t, body, **kwargs)
@@ -0,0 +1,434 @@
+"""Parse and compare PETSc performance summaries (`-log_view` output)."""
+
+import collections
+import pathlib
+import re
+
+
+Stage = collections.namedtuple(
+    'Stage', ['time', 'time_pct', 'flop', 'flop_pct', 'messages',
+              'messages_pct', 'message_length', 'message_lengths_pct',
+              'reductions', 'reductions_pct'])
+Stage.__doc__ = """Summary of a log stage (averages over the processes)."""
+
+Event = collections.namedtuple(
+    'Event', ['count', 'count_ratio', 'time', 'time_ratio', 'flop',
+              'flop_ratio', 'messages', 'message_length', 'reductions',
+              'time_pct', 'flop_pct', 'messages_pct', 'message_lengths_pct',
+              'reductions_pct', 'stage_time_pct', 'stage_flop_pct',
+              'stage_messages_pct', 'stage_message_lengths_pct',
+              'stage_reductions_pct', 'mflops'])
+Event.__doc__ = """Summary of a log event within a stage.
+
+`time` and `flop` are the maxima over the processes, `*_ratio` the ratios
+between the maximum and minimum over the processes, `messages` and
+`reductions` are totals, and `*_pct` are percentages of the global (or
+stage) totals.
+"""
+
+Objects = collections.namedtuple(
+    'Objects', ['creations', 'destructions', 'memory'])
+Objects.__doc__ = """Objects of a given type created in a stage (process 0).
+
+`memory` is None if not reported by the PETSc version.
+"""
+
+_TOTALS = collections.OrderedDict([
+    ('Time (sec)', 'time'),
+    ('Objects', 'objects'),
+    ('Flop', 'flop'),
+    ('Flops', 'flop'),
+    ('Flop/sec', 'flop/sec'),
+    ('Flops/sec', 'flop/sec'),
+    ('Memory', 'memory'),
+    ('MPI Messages', 'messages'),
+    ('MPI Msg Count', 'messages'),
+    ('MPI Message Lengths', 'message_lengths'),
+    ('MPI Msg Len (bytes)', 'message_lengths'),
+    ('MPI Reductions', 'reductions')])
+
+_RE_NPROCS = re.compile(r' with (\d+) (?:MPI )?process')
+_RE_VERSION = re.compile(r'Using P[eE][tT][sS][cC] Release Version ([\d.]+)')
+_RE_TOTAL = re.compile(r'^(' +
+                       '|'.join(re.escape(k) for k in _TOTALS.keys()) +
+                       r'):\s+(.*)$')
+_RE_STAGE = re.compile(r'^\s*\d+:\s+(.+?):\s+([-+.\deE%\s]+)$')
+_RE_EVENT_STAGE = re.compile(r'^--- Event Stage \d+: (.+?)\s*$')
+_RE_EVENT = re.compile(r'^(\S+)\s+([-+.\deEinfa\s]+)$')
+_RE_OBJECTS = re.compile(r'^\s*(\S.*?)\s+(\d+)\s+(\d+)'
+                         r'(?:\s+(\d+)\s+[-+.\deE]+)?\s*$')
+
+
+def _to_floats(string):
+    """Convert a string of numbers (with optional % signs) to floats."""
+    return [float(s) for s in string.replace('%', ' ').split()]
+
+
+def _parse_event_values(string):
+    """Convert the columns of an event row to floats.
+
+    The percentages are printed with a width of 3 characters and no
+    separator, so values of 100 are glued to the previous column (e.g.,
+    `100100100100100`); glued values are split here.
+
+    """
+    tokens = string.split()
+    nvalues, npcts = 9, 10
+    if len(tokens) < nvalues + 1:
+        return None
+    values = [float(token) for token in tokens[:nvalues]]
+    tokens = tokens[nvalues:]
+    pcts = []
+    while tokens and len(pcts) < npcts:
+        token = tokens.pop(0)
+        glued = []
+        while len(token) > 3 and token.endswith('100'):
+            glued.insert(0, 100.0)
+            token = token[:-3]
+        pcts += [float(token)] + glued
+    if len(pcts) != npcts or not tokens:
+        return None
+    # additional GPU columns (if any) are ignored
+    return values + pcts + [float(tokens[0])]
+
+
+class PerformanceLog(object):
+    """Content of a PETSc performance summary.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path or str
+        Path of the ASCII file written with `-log_view ascii:<filepath>`.
+
+    Attributes
+    ----------
+    nprocs : int
+        Number of MPI processes.
+    version : str
+        Version of PETSc.
+    totals : dict
+        Global totals ('time', 'flop', 'messages', ...); each value is a
+        list of floats with the maximum, the max/min ratio, the average,
+        and (when reported) the total.
+    stages : collections.OrderedDict
+        Summary of each stage (rodney.Stage), keyed by stage name.
+    events : collections.OrderedDict
+        For each stage, the summary of each event (rodney.Event) as an
+        ordered dictionary keyed by event name.
+    objects : collections.OrderedDict
+        For each stage, the objects created (rodney.Objects) as an ordered
+        dictionary keyed by object type.
+
+    """
+
+    def __init__(self, filepath):
+        """Parse the file."""
+        self.filepath = pathlib.Path(filepath)
+        self.nprocs = 1
+        self.version = None
+        self.totals = {}
+        self.stages = collections.OrderedDict()
+        self.events = collections.OrderedDict()
+        self.objects = collections.OrderedDict()
+        with open(self.filepath, 'r') as infile:
+            self._parse(infile.read().splitlines())
+
+    def _parse(self, lines):
+        """Parse the lines of the performance summary."""
+        section, stage = None, None
+        for line in lines:
+            if section is None:
+                match = _RE_NPROCS.search(line)
+                if match and ' named ' in line:
+                    self.nprocs = int(match.group(1))
+                    continue
+                match = _RE_VERSION.search(line)
+                if match:
+                    self.version = match.group(1)
+                    continue
+                match = _RE_TOTAL.match(line)
+                if match:
+                    key = _TOTALS[match.group(1)]
+                    self.totals[key] = _to_floats(match.group(2))
+                    continue
+            if line.startswith('Summary of Stages:'):
+                section = 'stages'
+                continue
+            if line.startswith('Event ') and 'Count' in line:
+                section = 'events'
+                continue
+            if line.startswith('Object Type'):
+                section = 'objects'
+                continue
+            if line.startswith('Average time') or line.startswith('====='):
+                section, stage = None, None
+                continue
+            match = _RE_EVENT_STAGE.match(line)
+            if match:
+                stage = match.group(1)
+                container = (self.events if section == 'events'
+                             else self.objects)
+                container.setdefault(stage, collections.OrderedDict())
+                continue
+            if section == 'stages':
+                match = _RE_STAGE.match(line)
+                if match:
+                    values = _to_floats(match.group(2))
+                    if len(values) >= len(Stage._fields):
+                        self.stages[match.group(1).strip()] = Stage(
+                            *values[:len(Stage._fields)])
+            elif section == 'events' and stage is not None:
+                match = _RE_EVENT.match(line)
+                if match:
+                    try:
+                        values = _parse_event_values(match.group(2))
+                    except ValueError:
+                        continue
+                    if values is not None:
+                        self.events[stage][match.group(1)] = Event(*values)
+            elif section == 'objects' and stage is not None:
+                match = _RE_OBJECTS.match(line)
+                if match:
+                    memory = match.group(4)
+                    self.objects[stage][match.group(1)] = Objects(
+                        int(match.group(2)), int(match.group(3)),
+                        int(memory) if memory is not None else None)
+
+    @property
+    def time(self):
+        """Return the total wall-clock time (maximum over the processes)."""
+        return self.totals['time'][0]
+
+    def event(self, name, stage=None):
+        """Return the summary of an event.
+
+        Parameters
+        ----------
+        name : str
+            Name of the event.
+        stage : str (optional)
+            Name of the stage; default: None (sum of the counts, times,
+            flop, messages, and reductions over all stages).
+
+        Returns
+        -------
+        rodney.Event
+            Summary of the event (None if the event was never logged).
+
+        """
+        if stage is not None:
+            return self.events.get(stage, {}).get(name)
+        found = [events[name] for events in self.events.values()
+                 if name in events]
+        if not found:
+            return None
+        if len(found) == 1:
+            return found[0]
+        summed = {key: sum(getattr(e, key) for e in found)
+                  for key in ('count', 'time', 'flop', 'messages',
+                              'reductions', 'time_pct', 'flop_pct',
+                              'messages_pct', 'message_lengths_pct',
+                              'reductions_pct')}
+        summed.update(
+            count_ratio=max(e.count_ratio for e in found),
+            time_ratio=max(e.time_ratio for e in found),
+            flop_ratio=max(e.flop_ratio for e in found),
+            message_length=(sum(e.message_length * e.messages
+                                for e in found) /
+                            max(summed['messages'], 1.0)),
+            stage_time_pct=float('nan'), stage_flop_pct=float('nan'),
+            stage_messages_pct=float('nan'),
+            stage_message_lengths_pct=float('nan'),
+            stage_reductions_pct=float('nan'),
+            mflops=(1e-6 * summed['flop'] * self.nprocs / summed['time']
+                    if summed['time'] > 0.0 else 0.0))
+        return Event(**summed)
+
+    def hotspots(self, n=10, stage=None):
+        """Return the events taking the most time.
+
+        Events are nested (e.g., `KSPSolve` includes `MatMult`), so the
+        fractions of the hotspots do not add up to one.
+
+        Parameters
+        ----------
+        n : int (optional)
+            Number of events to return; default: 10 (None for all).
+        stage : str (optional)
+            Name of the stage; default: None (all stages).
+
+        Returns
+        -------
+        list of tuples
+            (stage, event, time, fraction of the total time, max/min time
+            ratio) sorted by decreasing time.
+
+        """
+        stages = [stage] if stage is not None else list(self.events.keys())
+        items = [(s, name, e.time, e.time / self.time, e.time_ratio)
+                 for s in stages for name, e in self.events[s].items()
+                 if e.time > 0.0]
+        items.sort(key=lambda item: item[2], reverse=True)
+        return items[:n]
+
+
+def read_log_view(filepath):
+    """Read a PETSc performance summary.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path or str
+        Path of the file (e.g., `view.log`).
+
+    Returns
+    -------
+    rodney.PerformanceLog
+        Content of the performance summary.
+
+    """
+    return PerformanceLog(filepath)
+
+
+def get_scaling_efficiency(logs, work=None, reference=0):
+    """Return the speed-up and efficiency of runs relative to a reference.
+
+    The efficiency is the ratio of the throughput per process,
+    `work / (nprocs * time)`, to the one of the reference run: with the
+    default unit work, this is the strong-scaling efficiency; with the work
+    set to the problem size (e.g., number of cells or of time steps), this
+    also gives the weak-scaling efficiency.
+
+    Parameters
+    ----------
+    logs : list of rodney.PerformanceLog
+        Performance summaries of the runs.
+    work : list of floats (optional)
+        Amount of work of each run; default: None (same work for all).
+    reference : int (optional)
+        Index of the reference run; default: 0.
+
+    Returns
+    -------
+    speedups : list of floats
+        Throughput of each run relative to the reference.
+    efficiencies : list of floats
+        Parallel efficiency of each run relative to the reference.
+
+    """
+    if work is None:
+        work = [1.0] * len(logs)
+    throughputs = [w / log.time for w, log in zip(work, logs)]
+    ref = reference
+    speedups = [tp / throughputs[ref] for tp in throughputs]
+    efficiencies = [s * logs[ref].nprocs / log.nprocs
+                    for s, log in zip(speedups, logs)]
+    return speedups, efficiencies
+
+
+def compare_logs(logs, labels=None, work=None, reference=0, events=None,
+                 top=10, threshold=0.1):
+    """Return a text report comparing several runs.
+
+    The report lists the total time and scaling efficiency of each run,
+    the time spent in each stage, the time of the main events (hotspots of
+    the reference run, or a given list), and the events that slowed down
+    by more than a threshold relative to the reference run.
+
+    Parameters
+    ----------
+    logs : list of rodney.PerformanceLog
+        Performance summaries of the runs.
+    labels : list of str (optional)
+        Labels of the runs; default: None (name of the parent directory).
+    work : list of floats (optional)
+        Amount of work of each run (see `get_scaling_efficiency`);
+        default: None.
+    reference : int (optional)
+        Index of the reference run; default: 0.
+    events : list of str (optional)
+        Names of the events to compare; default: None (hotspots of the
+        reference run).
+    top : int (optional)
+        Number of hotspots to compare; default: 10.
+    threshold : float (optional)
+        Relative slow-down above which an event is reported as a
+        regression; default: 0.1.
+
+    Returns
+    -------
+    str
+        The report.
+
+    """
+    if labels is None:
+        labels = [log.filepath.parent.name for log in logs]
+    speedups, efficiencies = get_scaling_efficiency(logs, work=work,
+                                                    reference=reference)
+    ref = logs[reference]
+    width = max(12, max(len(label) for label in labels) + 1)
+    lines = []
+
+    def cell(value):
+        return f'{"-" if value is None else f"{value:.4g}":>{width}}'
+
+    def table_header(title):
+        lines.append('')
+        lines.append(f'{title:<24}' +
+                     ''.join(f'{label:>{width}}' for label in labels))
+
+    table_header('Run')
+    rows = [('nprocs', [log.nprocs for log in logs], '{:d}'),
+            ('time (s)', [log.time for log in logs], '{:.4g}'),
+            ('speed-up', speedups, '{:.3f}'),
+            ('efficiency', efficiencies, '{:.3f}')]
+    for name, values, fmt in rows:
+        lines.append(f'{name:<24}' +
+                     ''.join(f'{fmt.format(v):>{width}}' for v in values))
+
+    table_header('Stage time (s)')
+    names = list(ref.stages.keys())
+    for log in logs:
+        names += [s for s in log.stages.keys() if s not in names]
+    for name in names:
+        values = [log.stages[name].time if name in log.stages else None
+                  for log in logs]
+        lines.append(f'{name[:23]:<24}' +
+                     ''.join(cell(v) for v in values))
+
+    if events is None:
+        events = []
+        for _, name, _, _, _ in ref.hotspots(n=None):
+            if name not in events:
+                events.append(name)
+            if len(events) == top:
+                break
+    table_header('Event time (s)')
+    for name in events:
+        values = [log.event(name) for log in logs]
+        lines.append(f'{name[:23]:<24}' +
+                     ''.join(cell(None if e is None else e.time)
+                             for e in values))
+
+    regressions = []
+    for label, log in zip(labels, logs):
+        if log is ref:
+            continue
+        for events_ in log.events.values():
+            for name in events_.keys():
+                e, e_ref = log.event(name), ref.event(name)
+                if e_ref is None or e_ref.time <= 0.0:
+                    continue
+                ratio = e.time / e_ref.time
+                if ratio > 1.0 + threshold and e.time > 0.01 * log.time:
+                    regressions.append((label, name, e_ref.time, e.time,
+                                        ratio))
+    regressions = sorted(set(regressions), key=lambda r: r[-1], reverse=True)
+    lines.append('')
+    lines.append(f'Events slower than {labels[reference]} by more than '
+                 f'{100 * threshold:.0f}% (and above 1% of the run time):')
+    if not regressions:
+        lines.append('  none')
+    for label, name, t_ref, t, ratio in regressions:
+        lines.append(f'  {label}: {name} {t_ref:.4g} s -> {t:.4g} s '
+                     f'(x{ratio:.2f})')
+    return '\n'.join(lines[1:])
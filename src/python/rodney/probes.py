@@ -0,0 +1,227 @@
+"""Streaming reader for PetIBM volume probes stored in HDF5 files."""
+
+import pathlib
+
+import h5py
+import numpy
+
+from .cases import load_case
+from .kinematics import translating_cylinder_kinematics
+
+
+class ProbeStream(object):
+    """Lazy reader of the records of a volume probe.
+
+    The HDF5 file is opened once; the gridlines of the probe are read and
+    the available time records are indexed at creation. Records are only
+    loaded from disk when iterated over.
+
+    Probes attached to a body (key `body` in the probe configuration) move
+    with it: each record stores the gridlines of the co-moving window and
+    the center of the body as attributes (there is no `mesh` group), and
+    the gridlines are returned per record; the centers of the body are
+    available in `centers`.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path or str
+        Path of the HDF5 file of the probe.
+    name : str (optional)
+        Name of the field in the file; default: None (use the only field
+        group stored in the file).
+    time_limits : tuple of floats (optional)
+        Time interval of the records to consider; default: None (all
+        records).
+
+    """
+
+    def __init__(self, filepath, name=None, time_limits=None):
+        """Open the file and index the time records."""
+        self.filepath = filepath
+        self._file = h5py.File(filepath, 'r')
+        self.moving = 'mesh' not in self._file
+        self.coords = None
+        if not self.moving:
+            mesh = self._file['mesh']
+            self.coords = tuple(mesh[direction][:] for direction in 'xyz'
+                                if direction in mesh)
+        if name is None:
+            names = [key for key in self._file.keys() if key != 'mesh']
+            if len(names) != 1:
+                raise ValueError(f'Several fields in {filepath}; '
+                                 f'please provide a name among {names}')
+            name = names[0]
+        self.name = name
+        group = self._file[name]
+        keys = list(group.keys())
+        times = numpy.array([float(key) for key in keys])
+        order = numpy.argsort(times)
+        times, keys = times[order], [keys[i] for i in order]
+        if time_limits is not None:
+            tstart, tend = time_limits
+            eps = 1e-8 * max(1.0, abs(tstart), abs(tend))
+            mask = (times >= tstart - eps) & (times <= tend + eps)
+            times, keys = times[mask], [k for k, m in zip(keys, mask) if m]
+        self.times = times
+        self._keys = keys
+        self.centers = None
+        if self.moving:
+            self.centers = numpy.array([group[key].attrs['center']
+                                        for key in keys])
+
+    def __len__(self):
+        """Return the number of time records."""
+        return self.times.size
+
+    def __enter__(self):
+        """Return the stream (context manager)."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the file (context manager)."""
+        self.close()
+
+    def close(self):
+        """Close the HDF5 file."""
+        self._file.close()
+
+    def _coords(self, key):
+        """Return the gridlines of a record."""
+        if not self.moving:
+            return self.coords
+        attrs = self._file[self.name][key].attrs
+        return tuple(attrs[direction] for direction in 'xyz'
+                     if direction in attrs)
+
+    def _index(self, time, atol=1e-6):
+        """Return the index of the record closest to a given time."""
+        i = numpy.argmin(numpy.abs(self.times - time))
+        if abs(self.times[i] - time) > atol * max(1.0, abs(time)):
+            raise ValueError(f'No record at t={time} in {self.filepath}')
+        return i
+
+    def read(self, time):
+        """Read the record at a given time.
+
+        Parameters
+        ----------
+        time : float
+            Time value of the record.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            Gridlines of the probe.
+        numpy.ndarray
+            Field values of the record.
+
+        """
+        key = self._keys[self._index(time)]
+        return self._coords(key), self._file[self.name][key][:]
+
+    def __iter__(self):
+        """Yield (time, coords, values) for each record."""
+        group = self._file[self.name]
+        for time, key in zip(self.times, self._keys):
+            yield time, self._coords(key), group[key][:]
+
+    def chunks(self, size):
+        """Yield records by blocks.
+
+        Parameters
+        ----------
+        size : int
+            Maximum number of records in a block.
+
+        Yields
+        ------
+        numpy.ndarray
+            Time values of the block, as a 1D array of floats.
+        tuple of numpy.ndarray
+            Gridlines of the probe (stacked along the first axis for a
+            probe attached to a body).
+        numpy.ndarray
+            Field values, stacked along the first axis.
+
+        """
+        group = self._file[self.name]
+        for start in range(0, len(self), size):
+            keys = self._keys[start:start + size]
+            values = numpy.stack([group[key][:] for key in keys])
+            coords = self.coords
+            if self.moving:
+                coords = tuple(numpy.stack(x) for x in
+                               zip(*(self._coords(key) for key in keys)))
+            yield self.times[start:start + size], coords, values
+
+
+def get_recirculation_length_history(simudir, name='u', time_limits=None,
+                                     R=0.5, buffer=0.01):
+    """Compute the history of the recirculation length behind a cylinder.
+
+    The recirculation length is the distance between the rear of the
+    cylinder and the point on the wake centerline where the streamwise
+    velocity in the frame of the cylinder (`u - U0`) stops pointing towards
+    the cylinder. The wake lies on the side opposite to the motion (given
+    by the sign of `U0`; downstream is +x for a cylinder at rest). The
+    x-velocity is read from the volume probe `probe-<name>.h5` in the
+    output folder; with a probe attached to the body, the centers are read
+    from the probe, otherwise they follow the translating-cylinder
+    kinematics. A ValueError is raised if the velocity does not change sign
+    inside the window of the probe.
+
+    Parameters
+    ----------
+    simudir : pathlib.Path or str
+        Directory of the simulation.
+    name : str (optional)
+        Name of the x-velocity field in the probe; default: 'u'.
+    time_limits : tuple of floats (optional)
+        Time interval to consider; default: None (all records).
+    R : float (optional)
+        Radius of the cylinder; default: 0.5.
+    buffer : float (optional)
+        Distance from the rear of the cylinder ignored in the search;
+        default: 0.01.
+
+    Returns
+    -------
+    numpy.ndarray
+        Time values.
+    numpy.ndarray
+        Recirculation lengths.
+
+    """
+    simudir = pathlib.Path(simudir)
+    body = load_case(simudir).bodies[0]
+    # Downstream direction: opposite to the motion of the cylinder.
+    sign = -1.0 if body.U0 > 0.0 else 1.0
+    filepath = simudir / 'output' / f'probe-{name}.h5'
+    with ProbeStream(filepath, name, time_limits=time_limits) as probe:
+        times = probe.times
+        lengths = numpy.empty_like(times)
+        centers = probe.centers
+        if centers is None:
+            centers = translating_cylinder_kinematics(times, body).position.T
+        for i, (_, (x, y), u) in enumerate(probe):
+            xc, yc = centers[i][:2]  # center of the cylinder
+            # Interpolate the x-velocity along the horizontal line y=yc.
+            j = numpy.clip(numpy.searchsorted(y, yc) - 1, 0, y.size - 2)
+            alpha = (yc - y[j]) / (y[j + 1] - y[j])
+            u_yc = (1 - alpha) * u[j] + alpha * u[j + 1] - body.U0
+            # Downstream distance from the center and streamwise velocity
+            # in the frame of the cylinder (sorted downstream).
+            xs, us = sign * (x - xc), sign * u_yc
+            if sign < 0.0:
+                xs, us = xs[::-1], us[::-1]
+            # End of the recirculation zone: last point with a reversed
+            # flow behind the cylinder.
+            idx = numpy.where((us <= 0.0) & (xs > R + buffer))[0]
+            if idx.size == 0 or idx[-1] + 1 >= xs.size:
+                raise ValueError(f'No sign change of the x-velocity inside '
+                                 f'the window of the probe at t={times[i]}; '
+                                 'the window may be too small.')
+            idx = idx[-1]
+            xp = numpy.interp(0.0, us[idx:idx + 2], xs[idx:idx + 2])
+            lengths[i] = xp - R
+    return times, lengths
@@ -0,0 +1,220 @@
+"""Storage options and compression of the HDF5 snapshots."""
+
+import math
+import os
+import pathlib
+
+import h5py
+import numpy
+import yaml
+
+from .cases import load_case
+
+
+def get_dataset_options(output, name, shape, lossless=False):
+    """Return the HDF5 storage options of a field dataset.
+
+    The options come from the block `parameters.output` of the YAML
+    configuration, e.g.:
+
+        parameters:
+          output:
+            chunks: plane  # 'auto', 'plane', None, or a list of sizes
+            compression: gzip  # 'gzip', 'lzf', or None
+            compression_opts: 4
+            shuffle: true
+            fields:
+              p: {dtype: float32}
+              wz: {dtype: float32, tolerance: 1.0e-5}
+
+    'plane' chunks hold one z-plane of a 3D field (the whole field in 2D),
+    matching the access pattern of the plane extraction. With a
+    `tolerance`, the values are stored with the scale-offset filter of
+    HDF5, keeping ceil(-log10(tolerance)) decimal digits. The data type and
+    tolerance are ignored for lossless datasets (restart files).
+
+    Parameters
+    ----------
+    output : dict
+        Content of the block `parameters.output` (may be None or empty).
+    name : str
+        Name of the field.
+    shape : tuple of ints
+        Shape of the dataset.
+    lossless : bool (optional)
+        If True, store the values in double precision; default: False.
+
+    Returns
+    -------
+    dict
+        Keyword arguments of `h5py.Group.create_dataset`.
+
+    """
+    output = output or {}
+    options = {'dtype': numpy.dtype('float64')}
+    chunks = output.get('chunks', 'auto')
+    if chunks == 'auto':
+        options['chunks'] = True
+    elif chunks == 'plane':
+        options['chunks'] = ((1,) + tuple(shape[1:]) if len(shape) == 3
+                             else tuple(shape))
+    elif chunks is not None:
+        options['chunks'] = tuple(min(int(c), n)
+                                  for c, n in zip(chunks, shape))
+    compression = output.get('compression', 'gzip')
+    if compression is not None:
+        options['compression'] = compression
+        if compression == 'gzip':
+            options['compression_opts'] = int(output.get('compression_opts',
+                                                         4))
+        options['shuffle'] = bool(output.get('shuffle', True))
+    field = (output.get('fields') or {}).get(name) or {}
+    if not lossless:
+        options['dtype'] = numpy.dtype(field.get('dtype', 'float64'))
+        if 'tolerance' in field:
+            digits = math.ceil(-math.log10(float(field['tolerance'])))
+            options['scaleoffset'] = max(digits, 0)
+    return options
+
+
+def read_region_info(folder):
+    """Read the description of an output region.
+
+    Output regions are subsampled boxes of the fields written at their own
+    frequency, listed in the block `parameters.output.regions` of the
+    configuration, e.g.:
+
+        parameters:
+          output:
+            regions:
+              - name: wake
+                fields: [u, v, p]  # default: all fields
+                box: [[0.5, 4.0], [-1.0, 1.0]]
+                stride: [2, 2]  # or a single int; default: 1
+                nsave: 10  # default: parameters.nsave
+
+    The solver writes the file `region.yaml` in the folder of the region
+    with the stride and, for each field, the global index of the first
+    point and the number of subsampled points in each direction; the
+    subsampled fields are written in HDF5 files named after the time-step
+    index (e.g., `0000100.h5`), with the layout of the snapshots.
+
+    Parameters
+    ----------
+    folder : pathlib.Path or str
+        Folder of the output region (e.g., `output/regions/wake`).
+
+    Returns
+    -------
+    dict
+        Description of the region.
+
+    """
+    with open(pathlib.Path(folder) / 'region.yaml', 'r') as infile:
+        return yaml.safe_load(infile)
+
+
+def get_region_gridlines(gridlines, info, name):
+    """Return the gridlines of a field in an output region.
+
+    Parameters
+    ----------
+    gridlines : tuple or list of numpy.ndarray
+        Gridlines of the field on the whole domain in the x, y, and z (if
+        3D) directions.
+    info : dict
+        Description of the region (see `rodney.read_region_info`).
+    name : str
+        Name of the field.
+
+    Returns
+    -------
+    list of numpy.ndarray
+        Subsampled gridlines of the field in the region.
+
+    """
+    field = info['fields'][name]
+    return [numpy.asarray(x)[i:i + n * s:s]
+            for x, i, n, s in zip(gridlines, field['start'],
+                                  field['count'], info['stride'])]
+
+
+def compress_snapshot(filepath, output=None, outpath=None, lossless=False):
+    """Rewrite an HDF5 snapshot with chunked, compressed datasets.
+
+    Floating-point arrays are stored with the options returned by
+    `rodney.get_dataset_options`; other datasets and the attributes are
+    copied as they are.
+
+    Parameters
+    ----------
+    filepath : pathlib.Path or str
+        Path of the HDF5 snapshot.
+    output : dict (optional)
+        Storage options (block `parameters.output` of the configuration);
+        default: None (chunked and gzip-compressed, double precision).
+    outpath : pathlib.Path or str (optional)
+        Path of the new file; default: None (replace the snapshot).
+    lossless : bool (optional)
+        If True, keep all values in double precision (e.g., restart
+        files); default: False.
+
+    Returns
+    -------
+    pathlib.Path
+        Path of the new file.
+
+    """
+    filepath = pathlib.Path(filepath)
+    target = pathlib.Path(outpath) if outpath is not None else filepath
+    tmppath = target.parent / (target.name + '.tmp')
+    with h5py.File(filepath, 'r') as infile, \
+            h5py.File(tmppath, 'w') as outfile:
+        outfile.attrs.update(infile.attrs)
+
+        def copy(name, obj):
+            if isinstance(obj, h5py.Group):
+                outfile.require_group(name).attrs.update(obj.attrs)
+            elif obj.ndim > 0 and obj.dtype.kind == 'f':
+                dset = outfile.create_dataset(
+                    name, data=obj[...],
+                    **get_dataset_options(output, name.split('/')[-1],
+                                          obj.shape, lossless=lossless))
+                dset.attrs.update(obj.attrs)
+            else:
+                infile.copy(obj, outfile, name=name)
+
+        infile.visititems(copy)
+    os.replace(tmppath, target)
+    return target
+
+
+def compress_snapshots(simudir, folder='solution'):
+    """Compress the HDF5 snapshots of a simulation.
+
+    The storage options are read from the block `parameters.output` of the
+    configuration; snapshots at restart time steps (multiples of
+    `nrestart`) stay lossless. The solver already applies the options
+    (gzip only) to the snapshots it writes; use this function for older
+    simulations, other filters, or lossy restart snapshots.
+
+    Parameters
+    ----------
+    simudir : pathlib.Path or str
+        Directory of the simulation.
+    folder : str (optional)
+        Name of the folder with the snapshots; default: 'solution'.
+
+    Returns
+    -------
+    list of pathlib.Path
+        Paths of the snapshots.
+
+    """
+    case = load_case(simudir)
+    filepaths = sorted((pathlib.Path(simudir) / folder).glob('[0-9]*.h5'))
+    for filepath in filepaths:
+        ite = int(filepath.stem)
+        lossless = case.nrestart > 0 and ite % case.nrestart == 0
+        compress_snapshot(filepath, output=case.output, lossless=lossless)
+    return filepaths
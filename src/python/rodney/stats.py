@@ -0,0 +1,168 @@
+"""Streaming statistics of force-coefficient histories."""
+
+import math
+
+import numpy
+
+
+class RunningStats(object):
+    """Running count, mean, variance, and extrema of a signal.
+
+    Values can be added one block at a time; blocks are merged with the
+    parallel variant of Welford's algorithm, so the history never needs to
+    be stored.
+
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values):
+        """Add values to the statistics.
+
+        Parameters
+        ----------
+        values : numpy.ndarray or float
+            New values of the signal.
+
+        """
+        values = numpy.atleast_1d(numpy.asarray(values, dtype=float))
+        n = values.size
+        if n == 0:
+            return
+        mean = float(values.mean())
+        m2 = float(numpy.sum((values - mean)**2))
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2 + delta**2 * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def variance(self):
+        """Return the (population) variance of the signal."""
+        return self._m2 / self.count if self.count > 0 else math.nan
+
+    @property
+    def std(self):
+        """Return the standard deviation of the signal."""
+        return math.sqrt(self.variance)
+
+    @property
+    def rms(self):
+        """Return the root-mean-square value of the signal."""
+        return math.sqrt(self.variance + self.mean**2)
+
+
+class ForceCoefficientStats(object):
+    """Streaming summary of the drag and lift coefficients.
+
+    Rows are added as they are appended to the forces file (e.g., with
+    `rodney.ForcesTail`); the summary includes the mean drag and lift
+    coefficients, the RMS of the lift coefficient, the local extrema of the
+    lift coefficient, and the shedding frequency estimated from the upward
+    crossings of the lift coefficient through its running mean.
+
+    Parameters
+    ----------
+    time_limits : tuple of floats (optional)
+        Time interval over which to accumulate statistics; default: None
+        (all rows).
+
+    """
+
+    def __init__(self, time_limits=None):
+        """Initialize the accumulator."""
+        self.time_limits = time_limits
+        self.cd = RunningStats()
+        self.cl = RunningStats()
+        self.minima = []  # list of (time, cl) of the local minima
+        self.maxima = []  # list of (time, cl) of the local maxima
+        self.crossings = []  # times of upward crossings of the mean
+        self._last = None  # last (time, cl) processed
+        self._slope = 0  # sign of the last non-zero increment of cl
+
+    def update(self, t, cd, cl):
+        """Add rows to the statistics.
+
+        Parameters
+        ----------
+        t : numpy.ndarray
+            Time values, as a 1D array of floats.
+        cd : numpy.ndarray
+            Drag coefficient, as a 1D array of floats.
+        cl : numpy.ndarray
+            Lift coefficient, as a 1D array of floats.
+
+        """
+        t, cd, cl = (numpy.atleast_1d(numpy.asarray(a, dtype=float))
+                     for a in (t, cd, cl))
+        if self.time_limits is not None:
+            mask = ((t >= self.time_limits[0]) &
+                    (t <= self.time_limits[1]))
+            t, cd, cl = t[mask], cd[mask], cl[mask]
+        if t.size == 0:
+            return
+        self.cd.update(cd)
+        self.cl.update(cl)
+        level = self.cl.mean
+        for ti, cli in zip(t.tolist(), cl.tolist()):
+            if self._last is not None:
+                tp, clp = self._last
+                slope = (cli > clp) - (cli < clp)
+                if slope != 0:
+                    if self._slope > 0 and slope < 0:
+                        self.maxima.append((tp, clp))
+                    elif self._slope < 0 and slope > 0:
+                        self.minima.append((tp, clp))
+                    self._slope = slope
+                if clp < level <= cli:
+                    alpha = (level - clp) / (cli - clp)
+                    self.crossings.append(tp + alpha * (ti - tp))
+            self._last = (ti, cli)
+
+    @property
+    def period(self):
+        """Return the mean period between upward crossings of the mean."""
+        if len(self.crossings) < 2:
+            return math.nan
+        return ((self.crossings[-1] - self.crossings[0]) /
+                (len(self.crossings) - 1))
+
+    @property
+    def frequency(self):
+        """Return the shedding frequency."""
+        return 1.0 / self.period
+
+    def strouhal(self, D=1.0, U=1.0):
+        """Return the Strouhal number.
+
+        Parameters
+        ----------
+        D : float (optional)
+            Characteristic length; default: 1.0.
+        U : float (optional)
+            Characteristic velocity; default: 1.0.
+
+        Returns
+        -------
+        float
+            The Strouhal number.
+
+        """
+        return self.frequency * D / U
+
+    def summary(self):
+        """Return a dictionary with the main statistics."""
+        return {'<CD>': self.cd.mean, '<CL>': self.cl.mean,
+                'rms(CL)': self.cl.rms,
+                'min(CL)': self.minima[-1][1] if self.minima else math.nan,
+                'max(CL)': self.maxima[-1][1] if self.maxima else math.nan,
+                'St': self.strouhal()}
@@ -0,0 +1,260 @@
+"""Reusable interpolation stencils for rigidly moving marker sets."""
+
+import collections
+import hashlib
+import pathlib
+
+import numpy
+
+from .interp import _combine_brackets, _get_bracket
+
+
+class InterpolationStencil(object):
+    """Linear-interpolation stencil of a marker set on fixed gridlines.
+
+    The stencil stores, for each direction, the lower gridline index and
+    the relative position of the markers; a rigid translation of the marker
+    set only recomputes the directions in which the displacement changed.
+    Applying the stencil to a field is a sparse matrix-vector product.
+    Stencils may be shared through a cache, so their arrays are read-only.
+
+    Parameters
+    ----------
+    gridlines : tuple or list of numpy.ndarray
+        Gridlines in the x, y, and z (if 3D) directions.
+    points : tuple or list of numpy.ndarray
+        Coordinates of the markers in their reference position.
+    displacement : tuple or list of floats (optional)
+        Initial displacement of the markers; default: no displacement.
+    brackets : list of tuples of numpy.ndarray (optional)
+        Precomputed lower indices and relative positions of the markers
+        (in their reference position) in each direction; default: None.
+
+    """
+
+    def __init__(self, gridlines, points, displacement=None, brackets=None):
+        """Initialize the stencil."""
+        self.gridlines = [numpy.asarray(x) for x in gridlines]
+        self.dim = len(self.gridlines)
+        if len(points) != self.dim:
+            raise ValueError('Number of coordinate arrays does not match '
+                             'number of gridlines')
+        self.shape = tuple(x.size for x in self.gridlines[::-1])
+        self.points = [_freeze(numpy.atleast_1d(xi).astype(float))
+                       for xi in points]
+        self.displacement = None
+        self.brackets = [None] * self.dim
+        self.indices, self.weights = None, None
+        self._matrix = None
+        if brackets is not None:
+            self.brackets = [(_freeze(lower), _freeze(alpha))
+                             for lower, alpha in brackets]
+            self.displacement = (0.0,) * self.dim
+            self._combine()
+        if displacement is None:
+            displacement = (0.0,) * self.dim
+        self.translate(displacement)
+
+    @property
+    def size(self):
+        """Return the number of markers."""
+        return self.points[0].size
+
+    def translate(self, displacement):
+        """Rigidly translate the markers from their reference position.
+
+        Parameters
+        ----------
+        displacement : tuple or list of floats
+            Displacement in the x, y, and z (if 3D) directions.
+
+        """
+        if len(displacement) != self.dim:
+            raise ValueError('Displacement does not match dimension')
+        displacement = tuple(float(d) for d in displacement)
+        if displacement == self.displacement:
+            return
+        for d, (x, xi, dx) in enumerate(zip(self.gridlines, self.points,
+                                            displacement)):
+            if self.displacement is None or self.displacement[d] != dx:
+                self.brackets[d] = tuple(_freeze(a)
+                                         for a in _get_bracket(x, xi + dx))
+        self.displacement = displacement
+        self._combine()
+
+    def _combine(self):
+        """Combine the brackets into read-only indices and weights."""
+        indices, weights = _combine_brackets(self.brackets, self.shape)
+        self.indices, self.weights = _freeze(indices), _freeze(weights)
+        self._matrix = None
+
+    def to_sparse(self):
+        """Return the stencil as a SciPy CSR matrix of shape (N, field size).
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            The interpolation matrix.
+
+        """
+        if self._matrix is None:
+            from scipy import sparse
+            n, m = self.indices.shape
+            indptr = numpy.arange(0, n * m + 1, m)
+            self._matrix = sparse.csr_matrix(
+                (self.weights.ravel(), self.indices.ravel(), indptr),
+                shape=(n, int(numpy.prod(self.shape))))
+        return self._matrix
+
+    def __call__(self, field):
+        """Interpolate a field at the current marker positions.
+
+        Parameters
+        ----------
+        field : numpy.ndarray
+            Field values, with shape (ny, nx) in 2D or (nz, ny, nx) in 3D.
+
+        Returns
+        -------
+        numpy.ndarray
+            Interpolated values as a 1D array of floats.
+
+        """
+        field = numpy.asarray(field)
+        if field.shape != self.shape:
+            raise ValueError(f'Field shape {field.shape} does not match '
+                             f'gridlines shape {self.shape}')
+        return numpy.einsum('ij,ij->i', field.ravel()[self.indices],
+                            self.weights)
+
+
+class StencilCache(object):
+    """Least-recently-used cache of interpolation stencils.
+
+    Stencils are keyed by the gridlines and the reference coordinates of the
+    markers. When a cache directory is provided, the indices and weights of
+    the reference stencil are also stored on disk (as NumPy `.npz` files)
+    and reloaded by later sessions.
+
+    Parameters
+    ----------
+    maxsize : int (optional)
+        Maximum number of stencils kept in memory; default: 16.
+    cachedir : pathlib.Path or str (optional)
+        Directory used to store stencils on disk; default: None (memory
+        only).
+
+    """
+
+    def __init__(self, maxsize=16, cachedir=None):
+        """Initialize the cache."""
+        self.maxsize = maxsize
+        self.cachedir = None
+        if cachedir is not None:
+            self.cachedir = pathlib.Path(cachedir)
+            self.cachedir.mkdir(parents=True, exist_ok=True)
+        self._stencils = collections.OrderedDict()
+
+    def __len__(self):
+        """Return the number of stencils stored in memory."""
+        return len(self._stencils)
+
+    def clear(self):
+        """Remove all stencils stored in memory."""
+        self._stencils.clear()
+
+    def get(self, gridlines, points, displacement=None):
+        """Return a stencil, creating it if not already cached.
+
+        Parameters
+        ----------
+        gridlines : tuple or list of numpy.ndarray
+            Gridlines in the x, y, and z (if 3D) directions.
+        points : tuple or list of numpy.ndarray
+            Coordinates of the markers in their reference position.
+        displacement : tuple or list of floats (optional)
+            Displacement to apply to the markers; default: None (keep the
+            current displacement of a cached stencil, or no displacement for
+            a new one).
+
+        Returns
+        -------
+        rodney.InterpolationStencil
+            The interpolation stencil.
+
+        """
+        key = _get_key(gridlines, points)
+        stencil = self._stencils.get(key)
+        if stencil is None:
+            stencil = self._load(key, gridlines, points)
+            self._stencils[key] = stencil
+            while len(self._stencils) > self.maxsize:
+                self._stencils.popitem(last=False)
+        self._stencils.move_to_end(key)
+        if displacement is not None:
+            stencil.translate(displacement)
+        return stencil
+
+    def _load(self, key, gridlines, points):
+        """Load a stencil from disk or compute it."""
+        dim = len(gridlines)
+        filepath = None
+        if self.cachedir is not None:
+            filepath = self.cachedir / f'stencil-{key}.npz'
+        if filepath is not None and filepath.is_file():
+            with numpy.load(filepath) as data:
+                brackets = [(data[f'lower{d}'], data[f'alpha{d}'])
+                            for d in range(dim)]
+            return InterpolationStencil(gridlines, points,
+                                        brackets=brackets)
+        stencil = InterpolationStencil(gridlines, points)
+        if filepath is not None:
+            arrays = {}
+            for d, (lower, alpha) in enumerate(stencil.brackets):
+                arrays[f'lower{d}'], arrays[f'alpha{d}'] = lower, alpha
+            numpy.savez(filepath, **arrays)
+        return stencil
+
+
+def _freeze(array):
+    """Make an array read-only and return it."""
+    array.flags.writeable = False
+    return array
+
+
+def _get_key(gridlines, points):
+    """Return a hash identifying gridlines and marker coordinates."""
+    sha = hashlib.sha1()
+    for array in list(gridlines) + list(points):
+        array = numpy.ascontiguousarray(array, dtype=numpy.float64)
+        sha.update(str(array.shape).encode())
+        sha.update(array.tobytes())
+    return sha.hexdigest()
+
+
+_default_cache = StencilCache()
+
+
+def get_stencil(gridlines, points, displacement=None, cache=None):
+    """Return a cached interpolation stencil for a marker set.
+
+    Parameters
+    ----------
+    gridlines : tuple or list of numpy.ndarray
+        Gridlines in the x, y, and z (if 3D) directions.
+    points : tuple or list of numpy.ndarray
+        Coordinates of the markers in their reference position.
+    displacement : tuple or list of floats (optional)
+        Displacement to apply to the markers; default: None.
+    cache : rodney.StencilCache (optional)
+        Cache to use; default: None (module-level in-memory cache).
+
+    Returns
+    -------
+    rodney.InterpolationStencil
+        The interpolation stencil.
+
+    """
+    if cache is None:
+        cache = _default_cache
+    return cache.get(gridlines, points, displacement=displacement)
@@ -0,0 +1,8 @@
+"""Configuration of the tests of the rodney package."""
+
+import pathlib
+import sys
+
+
+# The package is not installed; import it from the source tree.
+sys.path.insert(0, str(pathlib.Path(__file__).absolute().parents[1]))
@@ -0,0 +1,77 @@
+"""Tests of the readers of the forces files."""
+
+import numpy
+
+import rodney
+
+
+def _rows(start, stop):
+    """Return rows of time values and force components."""
+    t = 0.1 * numpy.arange(start, stop)
+    return numpy.column_stack([t, numpy.sin(t), numpy.cos(t)])
+
+
+def _append(filepath, rows, partial=''):
+    """Append rows (and an incomplete line) to an ASCII forces file."""
+    with open(filepath, 'a') as outfile:
+        for row in rows:
+            outfile.write('\t'.join(f'{value:.10e}' for value in row) + '\n')
+        outfile.write(partial)
+
+
+def test_forces_tail_incremental(tmp_path):
+    filepath = tmp_path / 'forces-0.txt'
+    _append(filepath, _rows(0, 5), partial='5.0000000000e-01\t')
+    reader = rodney.ForcesTail(filepath)
+    assert len(reader) == 5
+    assert numpy.allclose(reader.data, _rows(0, 5))
+    # the incomplete line is parsed once completed
+    _append(filepath, [], partial='4.7942553860e-01\t8.7758256189e-01\n')
+    _append(filepath, _rows(6, 3000))
+    assert reader.refresh() == 2995
+    assert numpy.allclose(reader.data, _rows(0, 3000))
+    t, fx, fy = reader.unpack()
+    assert numpy.allclose(reader.t, t)
+
+
+def test_forces_tail_overwritten_file(tmp_path):
+    filepath = tmp_path / 'forces-0.txt'
+    _append(filepath, _rows(0, 10))
+    reader = rodney.ForcesTail(filepath)
+    filepath.unlink()
+    _append(filepath, _rows(20, 23))
+    assert reader.refresh() == 3
+    assert numpy.allclose(reader.data, _rows(20, 23))
+
+
+def test_read_forces_cache(tmp_path):
+    filepath = tmp_path / 'forces-0.txt'
+    _append(filepath, _rows(0, 10))
+    t, fx, fy = rodney.read_forces(filepath)
+    assert rodney.get_forces_cache_path(filepath).is_file()
+    assert numpy.allclose(numpy.column_stack([t, fx, fy]), _rows(0, 10))
+    # rows appended after the cache was written are parsed
+    _append(filepath, _rows(10, 15))
+    data = numpy.column_stack(rodney.read_forces(filepath))
+    assert numpy.allclose(data, _rows(0, 15))
+    no_cache = numpy.column_stack(rodney.read_forces(filepath, cache=False))
+    assert numpy.array_equal(data, no_cache)
+
+
+def test_read_forces_binary(tmp_path):
+    filepath = tmp_path / 'forces-0.bin'
+    rows = _rows(0, 7)
+    with open(filepath, 'wb') as outfile:
+        outfile.write(numpy.array([3], dtype='<i8').tobytes())
+        outfile.write(rows.astype('<f8').tobytes())
+        # incomplete last record (run in progress)
+        outfile.write(numpy.array([0.7], dtype='<f8').tobytes())
+    t, fx, fy = rodney.read_forces(filepath)
+    assert numpy.array_equal(numpy.column_stack([t, fx, fy]), rows)
+
+
+def test_read_forces_binary_empty(tmp_path):
+    filepath = tmp_path / 'forces-0.bin'
+    filepath.write_bytes(numpy.array([3], dtype='<i8').tobytes())
+    data = rodney.read_forces_binary(filepath)
+    assert len(data) == 3 and all(column.size == 0 for column in data)
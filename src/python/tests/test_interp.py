@@ -0,0 +1,51 @@
+"""Tests of the batched linear interpolation."""
+
+import numpy
+import pytest
+
+import rodney
+
+
+def _linear(*coords):
+    """Return a linear function of the coordinates."""
+    return sum((d + 1.0) * x for d, x in enumerate(coords)) + 0.5
+
+
+def test_interpolate_linear_field_2d():
+    x = numpy.linspace(0.0, 1.0, num=6)
+    y = numpy.linspace(-1.0, 1.0, num=9) ** 3
+    field = _linear(*numpy.meshgrid(x, y))
+    points = (numpy.array([0.0, 0.33, 1.0]), numpy.array([-1.0, 0.2, 1.0]))
+    values = rodney.interpolate(field, (x, y), points)
+    assert numpy.allclose(values, _linear(*points))
+
+
+def test_interpolator_linear_field_3d():
+    x = numpy.linspace(0.0, 1.0, num=5)
+    y = numpy.linspace(0.0, 2.0, num=7)
+    z = numpy.linspace(-1.0, 0.0, num=4)
+    Z, Y, X = numpy.meshgrid(z, y, x, indexing='ij')
+    field = _linear(X, Y, Z)
+    rng = numpy.random.default_rng(1)
+    points = (rng.uniform(0.0, 1.0, 20), rng.uniform(0.0, 2.0, 20),
+              rng.uniform(-1.0, 0.0, 20))
+    interpolator = rodney.LinearInterpolator((x, y, z), points)
+    assert interpolator.size == 20
+    assert numpy.allclose(interpolator(field), _linear(*points))
+    # same stencil applied to another field on the same gridlines
+    assert numpy.allclose(interpolator(2.0 * field), 2.0 * _linear(*points))
+
+
+def test_interpolate_errors():
+    x = numpy.linspace(0.0, 1.0, num=3)
+    inside, outside = numpy.array([0.5]), numpy.array([1.5])
+    field = numpy.zeros((3, 3))
+    with pytest.raises(ValueError, match='outside'):
+        rodney.interpolate(field, (x, x), (outside, inside))
+    with pytest.raises(ValueError, match='Number of coordinate'):
+        rodney.interpolate(field, (x, x), (inside,))
+    with pytest.raises(ValueError, match='does not match'):
+        rodney.interpolate(numpy.zeros((2, 3)), (x, x), (inside, inside))
+    with pytest.raises(ValueError, match='at least two'):
+        rodney.interpolate(numpy.zeros((1, 3)), (x, x[:1]),
+                           (inside, x[:1]))
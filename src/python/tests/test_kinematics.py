@@ -0,0 +1,64 @@
+"""Tests of the vectorized body kinematics."""
+
+import math
+
+import numpy
+import pytest
+
+import rodney
+
+
+BODIES = {
+    'oscillating_cylinder': {'D': 1.0, 'KC': 5.0, 'f': 0.2,
+                             'center': [1.0, -0.5]},
+    'oscillating_sphere': {'Am': 0.3, 'f': 0.5, 'center': [0.0, 0.0, 2.0]},
+    'translating_cylinder': {'U0': -1.0, 'V0': 0.25, 'center': [3.0, 0.0]},
+    'rigid_motion': {'center': [0.0, 1.0],
+                     'x': {'velocity': 0.5,
+                           'modes': [{'amplitude': 0.2, 'frequency': 1.5,
+                                      'phase': 0.3}]},
+                     'y': {'modes': [{'amplitude': 0.1,
+                                      'frequency': 0.5}]}},
+}
+
+
+@pytest.mark.parametrize('solver', sorted(BODIES))
+def test_derivatives(solver):
+    body = rodney.get_body_parameters(BODIES[solver])
+    dim = len(body.center)
+    t = numpy.linspace(0.0, 2.0, num=2001)
+    kin = rodney.get_body_kinematics(solver, t, body, dim=dim)
+    assert kin.position.shape == (dim, t.size)
+    # velocity and acceleration are the time derivatives
+    dt = t[1] - t[0]
+    assert numpy.allclose(numpy.gradient(kin.position, dt, axis=1)[:, 1:-1],
+                          kin.velocity[:, 1:-1], atol=1e-4)
+    assert numpy.allclose(numpy.gradient(kin.velocity, dt, axis=1)[:, 1:-1],
+                          kin.acceleration[:, 1:-1], atol=1e-4)
+
+
+def test_oscillating_cylinder_amplitude():
+    body = rodney.get_body_parameters(BODIES['oscillating_cylinder'])
+    kin = rodney.oscillating_cylinder_kinematics(0.25 * body.T, body)
+    assert numpy.isclose(body.Am, 5.0 / (2 * math.pi))
+    assert numpy.allclose(kin.position[:, 0], [1.0 - body.Am, -0.5])
+    assert numpy.allclose(kin.velocity[:, 0], 0.0)
+
+
+def test_translating_cylinder_scalar_time():
+    body = rodney.get_body_parameters(BODIES['translating_cylinder'])
+    kin = rodney.translating_cylinder_kinematics(2.0, body)
+    assert numpy.allclose(kin.position[:, 0], [1.0, 0.5])
+    assert numpy.allclose(kin.velocity[:, 0], [-1.0, 0.25])
+
+
+def test_rigid_motion_initial_position():
+    body = rodney.get_body_parameters(BODIES['rigid_motion'])
+    kin = rodney.rigid_motion_kinematics(0.0, body)
+    assert numpy.allclose(kin.position[:, 0], [0.2 * math.sin(0.3), 1.0])
+
+
+def test_unknown_solver():
+    body = rodney.get_body_parameters({})
+    with pytest.raises(ValueError):
+        rodney.get_body_kinematics('flapping_wing', 0.0, body)
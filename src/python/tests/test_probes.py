@@ -0,0 +1,115 @@
+"""Tests of the readers and post-processing of the volume probes."""
+
+import h5py
+import numpy
+import pytest
+import yaml
+
+import rodney
+
+
+def _write_probe(filepath, times, name='p'):
+    """Write a probe at rest with the values `t + x + 10 y`."""
+    x = numpy.linspace(0.0, 1.0, num=5)
+    y = numpy.linspace(0.0, 2.0, num=3)
+    with h5py.File(filepath, 'w') as outfile:
+        outfile['mesh/x'], outfile['mesh/y'] = x, y
+        X, Y = numpy.meshgrid(x, y)
+        # records are not stored in chronological order
+        for t in times[::-1]:
+            outfile[f'{name}/{t:.6f}'] = t + X + 10.0 * Y
+    return x, y
+
+
+def test_probe_stream(tmp_path):
+    filepath = tmp_path / 'probe-p.h5'
+    times = [0.0, 0.25, 0.5, 0.75, 1.0]
+    x, y = _write_probe(filepath, times)
+    with rodney.ProbeStream(filepath) as probe:
+        assert probe.name == 'p' and not probe.moving
+        assert probe.centers is None
+        assert numpy.allclose(probe.times, times)
+        for t, (xp, yp), values in probe:
+            assert numpy.array_equal(xp, x) and numpy.array_equal(yp, y)
+            assert numpy.allclose(values[:, 0], t + 10.0 * y)
+        (xp, yp), values = probe.read(0.5)
+        assert numpy.isclose(values[0, 0], 0.5)
+        with pytest.raises(ValueError):
+            probe.read(0.6)
+        sizes = [values.shape[0] for _, _, values in probe.chunks(2)]
+        assert sizes == [2, 2, 1]
+
+
+def test_probe_stream_time_limits(tmp_path):
+    filepath = tmp_path / 'probe-p.h5'
+    _write_probe(filepath, [0.0, 0.25, 0.5, 0.75, 1.0])
+    with rodney.ProbeStream(filepath, 'p', time_limits=(0.25, 0.75)) as probe:
+        assert len(probe) == 3
+        assert numpy.allclose([t for t, _, _ in probe], [0.25, 0.5, 0.75])
+
+
+def test_probe_stream_several_fields(tmp_path):
+    filepath = tmp_path / 'probe.h5'
+    _write_probe(filepath, [0.0])
+    with h5py.File(filepath, 'a') as outfile:
+        outfile['u/0.000000'] = numpy.zeros((3, 5))
+    with pytest.raises(ValueError):
+        rodney.ProbeStream(filepath)
+    with rodney.ProbeStream(filepath, 'u') as probe:
+        assert probe.name == 'u'
+
+
+def test_probe_stream_attached(tmp_path):
+    filepath = tmp_path / 'probe-u.h5'
+    times = [0.0, 0.5, 1.0]
+    with h5py.File(filepath, 'w') as outfile:
+        for t in times:
+            dset = outfile.create_dataset(f'u/{t:.6f}',
+                                          data=numpy.zeros((2, 3)))
+            dset.attrs['center'] = [-t, 0.0]
+            dset.attrs['x'] = numpy.array([-0.5, 0.0, 0.5]) - t
+            dset.attrs['y'] = numpy.array([-0.5, 0.5])
+    with rodney.ProbeStream(filepath) as probe:
+        assert probe.moving
+        assert numpy.allclose(probe.centers[:, 0], [0.0, -0.5, -1.0])
+        (x, y), _ = probe.read(1.0)
+        assert numpy.allclose(x, [-1.5, -1.0, -0.5])
+        _, (x, y), values = next(probe.chunks(3))
+        assert x.shape == (3, 3) and values.shape == (3, 2, 3)
+
+
+def _write_case(simudir, U0, times, R=0.5, L=1.2):
+    """Write a translating cylinder with a wake of known length."""
+    config = {'bodies': [{'name': 'cylinder',
+                          'kinematics': {'U0': U0, 'V0': 0.0,
+                                         'center': [0.0, 0.0]}}]}
+    with open(simudir / 'config.yaml', 'w') as outfile:
+        yaml.safe_dump(config, outfile)
+    x = numpy.linspace(-4.0, 4.0, num=161)
+    y = numpy.linspace(-1.0, 1.0, num=21)
+    sign = -1.0 if U0 > 0.0 else 1.0
+    (simudir / 'output').mkdir()
+    with h5py.File(simudir / 'output' / 'probe-u.h5', 'w') as outfile:
+        outfile['mesh/x'], outfile['mesh/y'] = x, y
+        for t in times:
+            # streamwise velocity in the frame of the cylinder, negative
+            # in the recirculation zone
+            xs = sign * (x - U0 * t)
+            ws = xs - (R + L)
+            u = numpy.tile(U0 + sign * ws, (y.size, 1))
+            outfile[f'u/{t:.6f}'] = u
+
+
+@pytest.mark.parametrize('U0', [-1.0, 1.0])
+def test_recirculation_length(tmp_path, U0):
+    times = [0.0, 0.5, 1.0]
+    _write_case(tmp_path, U0, times)
+    t, lengths = rodney.get_recirculation_length_history(tmp_path)
+    assert numpy.allclose(t, times)
+    assert numpy.allclose(lengths, 1.2)
+
+
+def test_recirculation_length_outside_window(tmp_path):
+    _write_case(tmp_path, -1.0, [0.0], L=4.0)
+    with pytest.raises(ValueError):
+        rodney.get_recirculation_length_history(tmp_path)
@@ -0,0 +1,68 @@
+"""Tests of the cached interpolation stencils."""
+
+import numpy
+import pytest
+
+import rodney
+
+
+def _grid():
+    x = numpy.linspace(0.0, 1.0, num=11)
+    y = numpy.linspace(-1.0, 1.0, num=21) ** 3
+    X, Y = numpy.meshgrid(x, y)
+    return (x, y), 2.0 * X - 3.0 * Y + 1.0
+
+
+def test_stencil_linear_field():
+    gridlines, field = _grid()
+    points = (numpy.array([0.15, 0.5, 0.72]), numpy.array([-0.3, 0.0, 0.4]))
+    stencil = rodney.InterpolationStencil(gridlines, points)
+    expected = 2.0 * points[0] - 3.0 * points[1] + 1.0
+    assert numpy.allclose(stencil(field), expected)
+    stencil.translate((0.1, -0.2))
+    expected = 2.0 * (points[0] + 0.1) - 3.0 * (points[1] - 0.2) + 1.0
+    assert numpy.allclose(stencil(field), expected)
+
+
+def test_stencil_matches_interpolate():
+    gridlines, field = _grid()
+    rng = numpy.random.default_rng(0)
+    points = (rng.uniform(0.0, 0.8, 50), rng.uniform(-0.8, 0.5, 50))
+    stencil = rodney.InterpolationStencil(gridlines, points,
+                                          displacement=(0.1, 0.2))
+    moved = (points[0] + 0.1, points[1] + 0.2)
+    assert numpy.allclose(stencil(field),
+                          rodney.interpolate(field, gridlines, moved))
+
+
+def test_cache_returns_read_only_arrays():
+    gridlines, field = _grid()
+    points = (numpy.array([0.25]), numpy.array([0.1]))
+    cache = rodney.StencilCache(maxsize=2)
+    stencil = cache.get(gridlines, points)
+    for array in (stencil.indices, stencil.weights, *stencil.points,
+                  *stencil.brackets[0]):
+        with pytest.raises(ValueError):
+            array[...] = 0
+    assert cache.get(gridlines, points) is stencil
+    assert numpy.allclose(stencil(field), 2.0 * 0.25 - 3.0 * 0.1 + 1.0)
+
+
+def test_cache_lru_and_disk(tmp_path):
+    gridlines, field = _grid()
+    cache = rodney.StencilCache(maxsize=2, cachedir=tmp_path)
+    sets = [(numpy.array([0.1 * i]), numpy.array([0.0])) for i in range(3)]
+    for points in sets:
+        cache.get(gridlines, points)
+    assert len(cache) == 2
+    assert len(list(tmp_path.glob('stencil-*.npz'))) == 3
+    other = rodney.StencilCache(cachedir=tmp_path)
+    stencil = other.get(gridlines, sets[0], displacement=(0.5, 0.0))
+    assert not stencil.weights.flags.writeable
+    assert numpy.allclose(stencil(field), 2.0 * 0.5 + 1.0)
+
+
+def test_single_point_gridline():
+    with pytest.raises(ValueError):
+        rodney.InterpolationStencil((numpy.array([0.0]),),
+                                    (numpy.array([0.0]),))
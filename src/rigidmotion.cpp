@@ -0,0 +1,186 @@
+/**
+ * \file rigidmotion.cpp
+ * \brief Implementation of the class RigidMotionSolver.
+ * \copyright Copyright (c) 2019-2020, Olivier Mesnard. All rights reserved.
+ * \license BSD 3-Clause License.
+ */
+
+#include <algorithm>
+
+#include "rigidmotion.h"
+
+void FourierSeries::evaluate(const PetscReal &t,
+                             PetscReal &q, PetscReal &dq) const
+{
+    q = velocity * t;
+    dq = velocity;
+    for (std::size_t k = 0; k < amplitudes.size(); ++k)
+    {
+        PetscReal w = 2.0 * PETSC_PI * frequencies[k];
+        q += amplitudes[k] * PetscSinReal(w * t + phases[k]);
+        dq += amplitudes[k] * w * PetscCosReal(w * t + phases[k]);
+    }
+}  // FourierSeries::evaluate
+
+RigidMotionSolver::RigidMotionSolver(
+    const MPI_Comm &world, const YAML::Node & node)
+{
+    init(world, node);
+}  // RigidMotionSolver::RigidMotionSolver
+
+RigidMotionSolver::~RigidMotionSolver()
+{
+    PetscErrorCode ierr;
+    PetscBool finalized;
+
+    PetscFunctionBeginUser;
+
+    ierr = PetscFinalized(&finalized); CHKERRV(ierr);
+    if (finalized) return;
+
+    ierr = destroy(); CHKERRV(ierr);
+}  // RigidMotionSolver::~RigidMotionSolver
+
+PetscErrorCode RigidMotionSolver::init(const MPI_Comm &world,
+                                       const YAML::Node &node)
+{
+    PetscErrorCode ierr;
+    const char *keys[3] = {"x", "y", "z"};
+
+    PetscFunctionBeginUser;
+
+    ierr = LietAl2016Solver::init(world, node); CHKERRQ(ierr);
+
+    ierr = PetscLogStagePush(stageInitialize); CHKERRQ(ierr);
+
+    const YAML::Node &config_bodies = node["bodies"];
+    PetscInt nBodies = config_bodies.size();
+    params.resize(nBodies);
+    for (std::size_t i = 0; i < nBodies; ++i)
+    {
+        if (!config_bodies[i]["kinematics"])
+            SETERRQ1(comm, PETSC_ERR_ARG_WRONG,
+                     "Body %D has no kinematics for the rigid motion",
+                     (PetscInt)i);
+        const YAML::Node config_body = config_bodies[i]["kinematics"];
+        // the center defaults to the origin (extra coordinates are ignored)
+        const YAML::Node center = config_body["center"];
+        std::size_t ncoords = center ? std::min(center.size(),
+                                                (std::size_t)3) : 0;
+        for (std::size_t d = 0; d < ncoords; ++d)
+            params[i].center[d] = center[d].as<PetscReal>();
+        for (PetscInt d = 0; d < 3; ++d)
+        {
+            ierr = parseSeries(config_body[keys[d]],
+                               params[i].translation[d]); CHKERRQ(ierr);
+        }
+        ierr = parseSeries(config_body["theta"],
+                           params[i].rotation); CHKERRQ(ierr);
+    }
+
+    ierr = PetscLogStagePop(); CHKERRQ(ierr);
+
+    PetscFunctionReturn(0);
+}  // RigidMotionSolver::init
+
+PetscErrorCode RigidMotionSolver::parseSeries(const YAML::Node &node,
+                                              FourierSeries &series)
+{
+    PetscFunctionBeginUser;
+
+    // a missing degree of freedom stays at rest
+    if (!node)
+        PetscFunctionReturn(0);
+
+    series.velocity = node["velocity"].as<PetscReal>(0.0);
+    const YAML::Node &modes = node["modes"];
+    for (std::size_t k = 0; k < modes.size(); ++k)
+    {
+        if (!modes[k]["amplitude"] || !modes[k]["frequency"])
+            SETERRQ(comm, PETSC_ERR_ARG_WRONG,
+                    "Each Fourier mode of the rigid motion requires an "
+                    "amplitude and a frequency");
+        series.amplitudes.push_back(modes[k]["amplitude"].as<PetscReal>());
+        series.frequencies.push_back(modes[k]["frequency"].as<PetscReal>());
+        series.phases.push_back(modes[k]["phase"].as<PetscReal>(0.0));
+    }
+
+    PetscFunctionReturn(0);
+}  // RigidMotionSolver::parseSeries
+
+PetscErrorCode RigidMotionSolver::setCoordinatesBodies(const PetscReal &ti)
+{
+    PetscReal d[3], u[3], theta, omega;
+
+    PetscFunctionBeginUser;
+
+    for (size_t i = 0; i < bodies->nBodies; ++i)
+    {
+        petibm::type::SingleBody &body = bodies->bodies[i];
+        petibm::type::RealVec2D &coords = body->coords;
+        petibm::type::RealVec2D &coords0 = body->coords0;
+        const PetscReal *c0 = params[i].center;
+
+        // evaluate the motion once per body
+        for (PetscInt k = 0; k < 3; ++k)
+            params[i].translation[k].evaluate(ti, d[k], u[k]);
+        params[i].rotation.evaluate(ti, theta, omega);
+        PetscReal cos_t = PetscCosReal(theta), sin_t = PetscSinReal(theta);
+
+        // rotate about the initial center, then translate
+        // (locally owned points only)
+        for (PetscInt k = body->bgPt; k < body->edPt; ++k)
+        {
+            PetscReal x = coords0[k][0] - c0[0], y = coords0[k][1] - c0[1];
+            coords[k][0] = c0[0] + d[0] + cos_t * x - sin_t * y;
+            coords[k][1] = c0[1] + d[1] + sin_t * x + cos_t * y;
+            if (body->dim == 3)
+                coords[k][2] = coords0[k][2] + d[2];
+        }
+    }
+
+    PetscFunctionReturn(0);
+} // RigidMotionSolver::setCoordinatesBodies
+
+PetscErrorCode RigidMotionSolver::setVelocityBodies(const PetscReal &ti)
+{
+    PetscErrorCode ierr;
+    PetscInt nBodies = bodies->nBodies;
+    std::vector<Vec> unPacked(nBodies);
+    PetscReal **UB_arr;
+    PetscReal d[3], u[3], theta, omega;
+
+    PetscFunctionBeginUser;
+
+    ierr = DMCompositeGetAccessArray(
+        bodies->dmPack, UB, nBodies, nullptr, unPacked.data()); CHKERRQ(ierr);
+    for (size_t i = 0; i < nBodies; ++i)
+    {
+        petibm::type::SingleBody &body = bodies->bodies[i];
+        petibm::type::RealVec2D &coords0 = body->coords0;
+        const PetscReal *c0 = params[i].center;
+
+        for (PetscInt k = 0; k < 3; ++k)
+            params[i].translation[k].evaluate(ti, d[k], u[k]);
+        params[i].rotation.evaluate(ti, theta, omega);
+        PetscReal cos_t = PetscCosReal(theta), sin_t = PetscSinReal(theta);
+
+        // velocity of the center plus the rotation about the center
+        ierr = DMDAVecGetArrayDOF(
+            body->da, unPacked[i], &UB_arr); CHKERRQ(ierr);
+        for (PetscInt k = body->bgPt; k < body->edPt; ++k)
+        {
+            PetscReal x = coords0[k][0] - c0[0], y = coords0[k][1] - c0[1];
+            UB_arr[k][0] = u[0] - omega * (sin_t * x + cos_t * y);
+            UB_arr[k][1] = u[1] + omega * (cos_t * x - sin_t * y);
+            if (body->dim == 3)
+                UB_arr[k][2] = u[2];
+        }
+        ierr = DMDAVecRestoreArrayDOF(
+            body->da, unPacked[i], &UB_arr); CHKERRQ(ierr);
+    }
+    ierr = DMCompositeRestoreAccessArray(
+        bodies->dmPack, UB, nBodies, nullptr, unPacked.data()); CHKERRQ(ierr);
+
+    PetscFunctionReturn(0);
+} // RigidMotionSolver::setVelocityBodies
@@ -0,0 +1,70 @@
+/**
+ * \file rigidmotion.h
+ * \brief Definition of the class RigidMotionSolver.
+ * \copyright Copyright (c) 2019-2020, Olivier Mesnard. All rights reserved.
+ * \license BSD 3-Clause License.
+ */
+
+#pragma once
+
+#include "lietal2016.h"
+
+/**
+ * \brief Fourier series of a rigid-body degree of freedom.
+ *
+ * q(t) = U t + sum_k A_k sin(2 pi f_k t + phi_k)
+ */
+struct FourierSeries
+{
+    PetscReal velocity = 0.0;  // constant rate U (linear drift)
+    std::vector<PetscReal> amplitudes;
+    std::vector<PetscReal> frequencies;
+    std::vector<PetscReal> phases;
+    void evaluate(const PetscReal &t, PetscReal &q, PetscReal &dq) const;
+};  // FourierSeries
+
+struct RigidMotion
+{
+    PetscReal center[3] = {0.0, 0.0, 0.0};  // initial center of rotation
+    FourierSeries translation[3];  // displacement of the center
+    FourierSeries rotation;  // angle about the z-axis through the center
+};  // RigidMotion
+
+/**
+ * \brief Solver for bodies with a rigid motion prescribed in the config.
+ *
+ * The motion of each body is read from the node `bodies[i].kinematics`:
+ * the initial center of rotation (`center`), the displacement of the
+ * center (`x`, `y`, and `z`), and the angle of rotation about the z-axis
+ * through the center (`theta`), each given as a Fourier series, e.g.:
+ *
+ *     kinematics:
+ *       center: [0.0, 0.0]
+ *       x:
+ *         velocity: 0.0
+ *         modes:
+ *           - {amplitude: -0.7958, frequency: 0.2, phase: 0.0}
+ *
+ * A missing degree of freedom stays at rest.
+ */
+class RigidMotionSolver : public LietAl2016Solver
+{
+public:
+    RigidMotionSolver() = default;
+    RigidMotionSolver(const MPI_Comm &world, const YAML::Node &node);
+    ~RigidMotionSolver();
+    using LietAl2016Solver::destroy;
+    using LietAl2016Solver::advance;
+    using LietAl2016Solver::write;
+    using LietAl2016Solver::ioInitialData;
+    using LietAl2016Solver::finished;
+    PetscErrorCode init(const MPI_Comm &world, const YAML::Node &node);
+
+protected:
+    std::vector<RigidMotion> params;
+    PetscErrorCode parseSeries(const YAML::Node &node,
+                               FourierSeries &series);
+    PetscErrorCode setCoordinatesBodies(const PetscReal &ti);
+    PetscErrorCode setVelocityBodies(const PetscReal &ti);
+
+};  // RigidMotionSolver
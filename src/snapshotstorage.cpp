@@ -0,0 +1,122 @@
+/**
+ * \file snapshotstorage.cpp
+ * \brief Implementation of the class SnapshotStorage.
+ * \copyright Copyright (c) 2019-2020, Olivier Mesnard. All rights reserved.
+ * \license BSD 3-Clause License.
+ */
+
+#include <algorithm>
+#include <cmath>
+
+#include "snapshotstorage.h"
+
+bool SnapshotStorage::parse(const YAML::Node &node, std::string &error)
+{
+    // datasets are only chunked and compressed if a storage option is given
+    // (the block may only hold output regions)
+    active = false;
+    if (!node)
+        return true;
+    for (const char *key : {"chunks", "compression", "compression_opts",
+                            "shuffle", "fields"})
+        active = active || node[key];
+
+    const YAML::Node config_chunks = node["chunks"];
+    if (config_chunks && config_chunks.IsNull())
+        chunks = "none";
+    else if (config_chunks && config_chunks.IsSequence())
+    {
+        chunks = "list";
+        chunkSizes = config_chunks.as<std::vector<hsize_t>>();
+    }
+    else if (config_chunks)
+        chunks = config_chunks.as<std::string>();
+    if (chunks != "auto" && chunks != "plane" && chunks != "none" &&
+        chunks != "list")
+    {
+        error = "Unknown value " + chunks + " for the output chunks; "
+                "accepted values are: auto, plane, null, or a list.";
+        return false;
+    }
+
+    const YAML::Node compression = node["compression"];
+    gzip = !(compression && compression.IsNull());
+    if (gzip && compression &&
+        compression.as<std::string>() != "gzip")
+    {
+        error = "The solver only writes gzip-compressed snapshots.";
+        return false;
+    }
+    level = node["compression_opts"].as<unsigned int>(4);
+    shuffle = node["shuffle"].as<bool>(true);
+
+    const YAML::Node config_fields = node["fields"];
+    for (const char *name : {"u", "v", "w", "p"})
+    {
+        dtypes[name] = "float64";
+        if (!config_fields || !config_fields[name])
+            continue;
+        const YAML::Node field = config_fields[name];
+        dtypes[name] = field["dtype"].as<std::string>("float64");
+        if (dtypes[name] != "float64" && dtypes[name] != "float32")
+        {
+            error = "Unknown data type " + dtypes[name] + " for an output "
+                    "field; accepted values are: float64 and float32.";
+            return false;
+        }
+        if (field["tolerance"])
+        {
+            double tolerance = field["tolerance"].as<double>();
+            digits[name] = std::max(
+                (int)std::ceil(-std::log10(tolerance)), 0);
+        }
+    }
+
+    return true;
+}  // SnapshotStorage::parse
+
+std::string SnapshotStorage::dtype(const std::string &name) const
+{
+    auto it = dtypes.find(name);
+    return (it != dtypes.end()) ? it->second : "float64";
+}  // SnapshotStorage::dtype
+
+hid_t SnapshotStorage::createProperties(const std::string &name, int ndims,
+                                        const hsize_t *dims) const
+{
+    hid_t dcpl = H5Pcreate(H5P_DATASET_CREATE);
+    std::vector<hsize_t> chunk(dims, dims + ndims);
+
+    // without storage options, datasets are contiguous (as written by PETSc)
+    if (!active)
+        return dcpl;
+
+    // plane chunks hold one z-plane of a 3D field (whole field in 2D)
+    if (chunks == "auto" || chunks == "plane")
+    {
+        if (ndims == 3)
+            chunk[0] = 1;
+    }
+    else if (chunks == "list")
+    {
+        for (int d = 0; d < ndims && d < (int)chunkSizes.size(); ++d)
+            chunk[d] = std::max(std::min(chunkSizes[d], dims[d]),
+                                (hsize_t)1);
+    }
+
+    // filters require chunked storage
+    bool filtered = gzip || digits.count(name) > 0;
+    if (chunks != "none" || filtered)
+    {
+        for (int d = 0; d < ndims; ++d)
+            chunk[d] = std::max(chunk[d], (hsize_t)1);
+        H5Pset_chunk(dcpl, ndims, chunk.data());
+    }
+    if (digits.count(name) > 0)
+        H5Pset_scaleoffset(dcpl, H5Z_SO_FLOAT_DSCALE, digits.at(name));
+    if (gzip && shuffle)
+        H5Pset_shuffle(dcpl);
+    if (gzip)
+        H5Pset_deflate(dcpl, level);
+    return dcpl;
+}  // SnapshotStorage::createProperties
@@ -0,0 +1,59 @@
+/**
+ * \file snapshotstorage.h
+ * \brief Definition of the class SnapshotStorage.
+ * \copyright Copyright (c) 2019-2020, Olivier Mesnard. All rights reserved.
+ * \license BSD 3-Clause License.
+ */
+
+#pragma once
+
+#include <map>
+#include <string>
+#include <vector>
+
+#include <hdf5.h>
+#include <yaml-cpp/yaml.h>
+
+/**
+ * \brief Storage options of the HDF5 snapshots written by the solver.
+ *
+ * The options are read from the block `parameters.output` of the
+ * configuration, with the keys of `rodney.get_dataset_options`, e.g.:
+ *
+ *     parameters:
+ *       output:
+ *         chunks: plane  # auto, plane, null, or a list of sizes
+ *         compression: gzip  # gzip or null
+ *         compression_opts: 4
+ *         shuffle: true
+ *         fields:
+ *           p: {dtype: float32, tolerance: 1.0e-5}
+ *
+ * With a storage option, the snapshots (except the restart files, written
+ * by PETSc) are gathered on process 0, which creates the datasets with
+ * these options when it first writes the file. In the solver, `auto`
+ * chunks are plane chunks and gzip is the only filter; the other filters
+ * of h5py are applied offline by `rodney.compress_snapshots`.
+ * The class does no PETSc or MPI calls.
+ */
+class SnapshotStorage
+{
+public:
+    SnapshotStorage() = default;
+    bool parse(const YAML::Node &node, std::string &error);
+    bool enabled() const { return active; }
+    std::string dtype(const std::string &name) const;
+    hid_t createProperties(const std::string &name, int ndims,
+                           const hsize_t *dims) const;
+
+protected:
+    bool active = false;  // true if a storage option is given
+    std::string chunks = "auto";  // auto, plane, none, or list
+    std::vector<hsize_t> chunkSizes;  // chunk sizes (list)
+    bool gzip = true;
+    unsigned int level = 4;  // gzip compression level
+    bool shuffle = true;
+    std::map<std::string, std::string> dtypes;  // field -> data type
+    std::map<std::string, int> digits;  // field -> scale-offset digits
+
+};  // SnapshotStorage
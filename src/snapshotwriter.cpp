@@ -0,0 +1,149 @@
+/**
+ * \file snapshotwriter.cpp
+ * \brief Implementation of the class SnapshotWriter.
+ * \copyright Copyright (c) 2019-2020, Olivier Mesnard. All rights reserved.
+ * \license BSD 3-Clause License.
+ */
+
+#include <cstdio>
+
+#include "hdf5lock.h"
+#include "snapshotwriter.h"
+
+// write the time value as an attribute of an HDF5 object
+static bool writeTime(hid_t obj, const double &t)
+{
+    hid_t space = H5Screate(H5S_SCALAR);
+    hid_t attr = H5Acreate2(obj, "time", H5T_NATIVE_DOUBLE, space,
+                            H5P_DEFAULT, H5P_DEFAULT);
+    bool success = (attr >= 0 &&
+                    H5Awrite(attr, H5T_NATIVE_DOUBLE, &t) >= 0);
+    if (attr >= 0)
+        H5Aclose(attr);
+    H5Sclose(space);
+    return success;
+}  // writeTime
+
+SnapshotWriter::~SnapshotWriter()
+{
+    stop();
+}  // SnapshotWriter::~SnapshotWriter
+
+void SnapshotWriter::setStorage(const SnapshotStorage &storage)
+{
+    this->storage = storage;
+}  // SnapshotWriter::setStorage
+
+void SnapshotWriter::start(const std::size_t &depth)
+{
+    // the thread is shared by all outputs; start it once
+    if (worker.joinable())
+        return;
+    this->depth = (depth > 0) ? depth : 1;
+    done = false;
+    success = true;
+    worker = std::thread(&SnapshotWriter::run, this);
+}  // SnapshotWriter::start
+
+bool SnapshotWriter::push(Snapshot &&snapshot)
+{
+    std::unique_lock<std::mutex> lock(mutex);
+    // wait for a free slot in the queue
+    cv.wait(lock, [this] { return queue.size() < depth; });
+    queue.push_back(std::move(snapshot));
+    cv.notify_all();
+    return success;
+}  // SnapshotWriter::push
+
+bool SnapshotWriter::flush()
+{
+    std::unique_lock<std::mutex> lock(mutex);
+    cv.wait(lock, [this] { return queue.empty() && !busy; });
+    return success;
+}  // SnapshotWriter::flush
+
+bool SnapshotWriter::stop()
+{
+    if (!worker.joinable())
+        return success;
+    {
+        std::lock_guard<std::mutex> lock(mutex);
+        done = true;
+    }
+    cv.notify_all();
+    worker.join();
+    return success;
+}  // SnapshotWriter::stop
+
+void SnapshotWriter::run()
+{
+    while (true)
+    {
+        Snapshot snapshot;
+        {
+            std::unique_lock<std::mutex> lock(mutex);
+            cv.wait(lock, [this] { return !queue.empty() || done; });
+            // write the remaining snapshots before terminating
+            if (queue.empty())
+                return;
+            snapshot = std::move(queue.front());
+            queue.pop_front();
+            busy = true;
+        }
+        cv.notify_all();
+        bool written = write(snapshot);
+        {
+            std::lock_guard<std::mutex> lock(mutex);
+            success = success && written;
+            busy = false;
+        }
+        cv.notify_all();
+    }
+}  // SnapshotWriter::run
+
+bool SnapshotWriter::write(const Snapshot &snapshot) const
+{
+    // the HDF5 library may not be thread-safe
+    HDF5Lock lock;
+
+    // the file is written under a temporary name and renamed once complete,
+    // so that an interrupted run never leaves a truncated snapshot
+    std::string tmppath = snapshot.filepath + ".tmp";
+    hid_t file = H5Fcreate(tmppath.c_str(), H5F_ACC_TRUNC, H5P_DEFAULT,
+                           H5P_DEFAULT);
+    if (file < 0)
+        return false;
+    bool pressure = false;
+    for (const SnapshotField &field : snapshot.fields)
+        pressure = pressure || field.name == "p";
+    bool success = pressure || writeTime(file, snapshot.t);
+    for (const SnapshotField &field : snapshot.fields)
+    {
+        if (!success)
+            break;
+        int ndims = field.dims.size();
+        hid_t ftype = (storage.dtype(field.name) == "float32") ?
+                      H5T_IEEE_F32LE : H5T_IEEE_F64LE;
+        hid_t space = H5Screate_simple(ndims, field.dims.data(), nullptr);
+        hid_t dcpl = storage.createProperties(field.name, ndims,
+                                              field.dims.data());
+        hid_t dset = H5Dcreate2(file, field.name.c_str(), ftype, space,
+                                H5P_DEFAULT, dcpl, H5P_DEFAULT);
+        success = (dset >= 0 &&
+                   H5Dwrite(dset, H5T_NATIVE_DOUBLE, H5S_ALL, H5S_ALL,
+                            H5P_DEFAULT, field.values.data()) >= 0);
+        if (success && field.name == "p")
+            success = writeTime(dset, snapshot.t);
+        if (dset >= 0)
+            H5Dclose(dset);
+        H5Pclose(dcpl);
+        H5Sclose(space);
+    }
+    success = (H5Fclose(file) >= 0) && success;
+    if (!success)
+    {
+        std::remove(tmppath.c_str());
+        return false;
+    }
+    return std::rename(tmppath.c_str(), snapshot.filepath.c_str()) == 0;
+}  // SnapshotWriter::write
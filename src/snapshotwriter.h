@@ -0,0 +1,76 @@
+/**
+ * \file snapshotwriter.h
+ * \brief Definition of the class SnapshotWriter.
+ * \copyright Copyright (c) 2019-2020, Olivier Mesnard. All rights reserved.
+ * \license BSD 3-Clause License.
+ */
+
+#pragma once
+
+#include <condition_variable>
+#include <deque>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <vector>
+
+#include <hdf5.h>
+
+#include "snapshotstorage.h"
+
+/**
+ * \brief Field of a snapshot gathered on a process.
+ */
+struct SnapshotField
+{
+    std::string name;  // name of the dataset ("u", "v", "w", or "p")
+    std::vector<hsize_t> dims;  // shape of the dataset ((z,) y, x)
+    std::vector<double> values;  // values of the field (x varies fastest)
+};  // SnapshotField
+
+/**
+ * \brief Copy of the fields to write in an HDF5 file.
+ */
+struct Snapshot
+{
+    std::string filepath;  // path of the HDF5 file
+    double t;  // time value
+    std::vector<SnapshotField> fields;
+};  // Snapshot
+
+/**
+ * \brief Writer of HDF5 snapshots on a background thread.
+ *
+ * The solver gathers the fields on process 0, which pushes a copy in a
+ * bounded queue and proceeds with the time integration; a dedicated thread
+ * writes the snapshots in HDF5 files with the same layout as the ones
+ * written by PETSc (the time value is an attribute of the pressure
+ * dataset, or of the root group if the file has no pressure), with the
+ * storage options of the solver. The background thread does no PETSc or
+ * MPI calls.
+ */
+class SnapshotWriter
+{
+public:
+    SnapshotWriter() = default;
+    ~SnapshotWriter();
+    void setStorage(const SnapshotStorage &storage);
+    void start(const std::size_t &depth);
+    bool push(Snapshot &&snapshot);
+    bool write(const Snapshot &snapshot) const;
+    bool flush();
+    bool stop();
+
+protected:
+    SnapshotStorage storage;  // storage options of the datasets
+    std::size_t depth = 1;  // maximum number of snapshots in the queue
+    std::deque<Snapshot> queue;
+    std::mutex mutex;
+    std::condition_variable cv;
+    std::thread worker;
+    bool busy = false;  // true while the thread writes a snapshot
+    bool done = false;  // true when the thread has to terminate
+    bool success = true;  // false if a snapshot could not be written
+    void run();
+
+};  // SnapshotWriter
@@ -56,7 +56,8 @@ PetscErrorCode TranslatingCylinderSolver::setCoordinatesBodies(
 
     PetscFunctionBeginUser;
 
-    for (PetscInt k = 0; k < body->nPts; k++)
+    // update the locally owned points only
+    for (PetscInt k = body->bgPt; k < body->edPt; k++)
     {
         coords[k][0] = coords0[k][0] + U0 * ti;
         coords[k][1] = coords0[k][1] + V0 * ti;